@@ -15,12 +15,84 @@ class Settings:
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     
+    # Stateless Auth Settings (trust identity claims in the JWT instead of loading the user)
+    STATELESS_AUTH: bool = os.getenv("STATELESS_AUTH", "false").lower() in ("1", "true", "yes")
+    TOKEN_VERSION_TTL_SECONDS: float = float(os.getenv("TOKEN_VERSION_TTL_SECONDS", "30"))
+    
+    # Verified Token Cache Settings (entries never outlive the token's exp claim)
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+    TOKEN_CACHE_TTL_SECONDS: float = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    
+    # Authenticated User Cache Settings (USER_CACHE_MAX_SIZE=0 disables the cache)
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+    
     # CORS Settings
     CORS_ORIGINS: List[str] = os.getenv("CORS_ORIGINS", "*").split(",")
     
     # Database Settings (if needed for future expansion)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     
+    # Async Data Path Settings
+    DB_EXECUTOR_MAX_WORKERS: int = int(
+        os.getenv("DB_EXECUTOR_MAX_WORKERS", os.getenv("DB_POOL_MAX_SIZE", "10"))
+    )
+    
+    # Password Hashing Settings
+    BCRYPT_WORKERS: int = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+    BCRYPT_MAX_PENDING: int = int(os.getenv("BCRYPT_MAX_PENDING", "64"))
+    
+    # Pagination Settings
+    NOTES_PAGE_DEFAULT_LIMIT: int = int(os.getenv("NOTES_PAGE_DEFAULT_LIMIT", "50"))
+    NOTES_PAGE_MAX_LIMIT: int = int(os.getenv("NOTES_PAGE_MAX_LIMIT", "200"))
+    NOTE_SNIPPET_LENGTH: int = int(os.getenv("NOTE_SNIPPET_LENGTH", "200"))
+    
+    # Bulk Operation Settings
+    BULK_MAX_NOTES: int = int(os.getenv("BULK_MAX_NOTES", "500"))
+    BATCH_MAX_IDS: int = int(os.getenv("BATCH_MAX_IDS", "500"))
+    
+    # Batch Endpoint Settings
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_MAX_BODY_BYTES: int = int(os.getenv("BATCH_MAX_BODY_BYTES", str(1024 * 1024)))
+    
+    # Note Body Compression Settings (NOTE_COMPRESSION: none, zlib or lzma).
+    # Off by default: compressed bodies are only searchable in their plain prefix
+    NOTE_COMPRESSION: str = os.getenv("NOTE_COMPRESSION", "none")
+    NOTE_COMPRESSION_MIN_BYTES: int = int(os.getenv("NOTE_COMPRESSION_MIN_BYTES", "8192"))
+    NOTE_COMPRESSION_PREFIX_CHARS: int = int(os.getenv("NOTE_COMPRESSION_PREFIX_CHARS", "2000"))
+    
+    # Patch Settings
+    PATCH_MAX_EDITS: int = int(os.getenv("PATCH_MAX_EDITS", "1000"))
+    
+    # Export Settings
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+    
+    # Import Settings
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    IMPORT_BATCH_MAX_BYTES: int = int(os.getenv("IMPORT_BATCH_MAX_BYTES", str(8 * 1024 * 1024)))
+    IMPORT_MAX_LINE_BYTES: int = int(os.getenv("IMPORT_MAX_LINE_BYTES", str(16 * 1024 * 1024)))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "100"))
+    
+    # Delta Sync Settings
+    SYNC_MAX_CHANGES: int = int(os.getenv("SYNC_MAX_CHANGES", "500"))
+    SYNC_SETTLE_MS: int = int(os.getenv("SYNC_SETTLE_MS", "1000"))
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+    SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS: float = float(os.getenv("SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS", "3600"))
+    
+    # Note Response Cache Settings
+    NOTE_CACHE_MAX_BYTES: int = int(os.getenv("NOTE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    NOTE_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("NOTE_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+    NOTE_CACHE_TTL_SECONDS: float = float(os.getenv("NOTE_CACHE_TTL_SECONDS", "30"))
+    
+    # Search Settings
+    SEARCH_BACKEND: str = os.getenv("SEARCH_BACKEND", "mysql")
+    SEARCH_MAX_RESULTS: int = int(os.getenv("SEARCH_MAX_RESULTS", "1000"))
+    
+    # Push Notification Settings
+    NOTIFY_BUFFER_SIZE: int = int(os.getenv("NOTIFY_BUFFER_SIZE", "64"))
+    NOTIFY_MAX_CONNECTIONS: int = int(os.getenv("NOTIFY_MAX_CONNECTIONS", "10000"))
+    NOTIFY_KEEPALIVE_SECONDS: float = float(os.getenv("NOTIFY_KEEPALIVE_SECONDS", "15"))
+    
     # API Settings
     API_TITLE: str = "Notes API"
     API_DESCRIPTION: str = "A simple FastAPI application for managing notes."
@@ -1,3 +1,4 @@
 from .connection import DatabaseManager
+from .pool import ConnectionPool, PoolTimeoutError
 
-__all__ = ['DatabaseManager']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'ConnectionPool', 'PoolTimeoutError']
\ No newline at end of file
@@ -1,14 +1,23 @@
 """Database connection module with class-based approach for MySQL operations."""
 
 import pymysql
+from pymysql.constants import CLIENT
 from pymysql.cursors import DictCursor
 from contextlib import contextmanager
+from contextvars import ContextVar, Token
 import os
 from dotenv import load_dotenv
 from typing import Optional
+import threading
+
+from .pool import ConnectionPool
 
 load_dotenv()
 
+# Connection shared by every get_connection() call in the current context
+# while a caller-managed transaction is open (see bind_connection)
+_bound_connection: ContextVar = ContextVar('bound_connection', default=None)
+
 
 class DatabaseManager:
     """
@@ -37,15 +46,53 @@ class DatabaseManager:
             'password': os.getenv('DB_PASSWORD', ''),
             'database': os.getenv('DB_NAME', 'notes_db'),
             'charset': 'utf8mb4',
-            'cursorclass': DictCursor
+            'cursorclass': DictCursor,
+            # Report matched rather than changed rows so ownership-scoped
+            # UPDATEs can tell "no such row" from "no change"
+            'client_flag': CLIENT.FOUND_ROWS
         }
+        self.pool_config = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 3600)),
+            'checkout_timeout': float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', 10)),
+            'ping_interval': float(os.getenv('DB_POOL_PING_INTERVAL', 0))
+        }
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+        # Whether notes.note_id is BINARY(16) rather than a pre-migration VARCHAR(36);
+        # read from the schema by initialize_database
+        self.binary_note_ids = True
         self._initialized = True
     
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool, created on first use so the database can be created beforehand."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(self.config, **self.pool_config)
+        return self._pool
+    
+    def get_pool_stats(self) -> dict:
+        """Return connection pool statistics (in use, idle, waiters, wait times)."""
+        if self._pool is None:
+            return {'size': 0, 'in_use': 0, 'idle': 0, 'waiters': 0}
+        return self._pool.stats()
+    
+    def close_pool(self) -> None:
+        """Close all pooled connections."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+    
     @contextmanager
     def get_connection(self):
         """
         Context manager for database connections.
-        Automatically handles connection, commit, rollback, and close operations.
+        Checks a connection out of the pool and automatically handles commit,
+        rollback, and returning the connection to the pool.
         
         Usage:
             db = DatabaseManager()
@@ -54,18 +101,46 @@ class DatabaseManager:
                     cursor.execute("SELECT * FROM users")
                     results = cursor.fetchall()
         """
-        conn = None
+        bound = _bound_connection.get()
+        if bound is not None:
+            # Part of a caller-managed transaction: no commit, rollback or release here
+            yield bound
+            return
+        
+        pool = self.pool
+        conn = pool.acquire()
+        discard = False
         try:
-            conn = pymysql.connect(**self.config)
             yield conn
             conn.commit()
         except Exception as e:
-            if conn:
+            try:
                 conn.rollback()
+            except Exception:
+                discard = True
+            if isinstance(e, (pymysql.err.OperationalError, pymysql.err.InterfaceError)):
+                discard = True
             raise e
         finally:
-            if conn:
-                conn.close()
+            pool.release(conn, discard=discard)
+    
+    def bind_connection(self, conn) -> Token:
+        """
+        Route every get_connection() call in the current context to conn.
+        
+        Used to run several repository calls in one transaction. The caller
+        owns the connection: it must commit or roll back, unbind the
+        connection with the returned token, and release it to the pool.
+        """
+        return _bound_connection.set(conn)
+    
+    def unbind_connection(self, token: Token) -> None:
+        """Undo a previous bind_connection()."""
+        _bound_connection.reset(token)
+    
+    def has_bound_connection(self) -> bool:
+        """Check whether the current context runs inside a caller-managed transaction."""
+        return _bound_connection.get() is not None
     
     def initialize_database(self):
         """Initialize the database and create necessary tables."""
@@ -89,31 +164,147 @@ class DatabaseManager:
                             user_name VARCHAR(255) NOT NULL,
                             user_email VARCHAR(255) UNIQUE NOT NULL,
                             password_hash VARCHAR(255) NOT NULL,
+                            token_version INT NOT NULL DEFAULT 0,
                             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
                         )
                     """)
                     
-                    # Notes table
+                    # Notes table; note_id holds the 16 bytes of a time-ordered UUID
                     cursor.execute("""
                         CREATE TABLE IF NOT EXISTS notes (
-                            note_id VARCHAR(36) PRIMARY KEY,
+                            note_id BINARY(16) PRIMARY KEY,
                             user_id VARCHAR(36) NOT NULL,
                             note_title VARCHAR(255) NOT NULL,
-                            note_content TEXT,
                             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                            updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+                            version INT NOT NULL DEFAULT 1,
+                            FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                            INDEX idx_user_id (user_id),
+                            INDEX idx_user_created (user_id, created_at, note_id),
+                            INDEX idx_user_updated (user_id, updated_at, note_id),
+                            INDEX idx_user_title (user_id, note_title, note_id),
+                            FULLTEXT INDEX idx_title_fulltext (note_title)
+                        )
+                    """)
+                    
+                    # Note bodies, kept apart so metadata scans stay narrow. The key
+                    # follows notes.note_id, which stays VARCHAR(36) until migrate.py binary-ids
+                    cursor.execute(f"""
+                        CREATE TABLE IF NOT EXISTS note_bodies (
+                            note_id {self._column_type(cursor, 'notes', 'note_id')} PRIMARY KEY,
+                            note_content MEDIUMTEXT,
+                            compressed_content MEDIUMBLOB,
+                            FOREIGN KEY (note_id) REFERENCES notes(note_id) ON DELETE CASCADE,
+                            FULLTEXT INDEX idx_body_fulltext (note_content)
+                        )
+                    """)
+                    
+                    # Deleted notes, kept so delta sync can report deletions; keyed like notes
+                    cursor.execute(f"""
+                        CREATE TABLE IF NOT EXISTS note_tombstones (
+                            note_id {self._column_type(cursor, 'notes', 'note_id')} PRIMARY KEY,
+                            user_id VARCHAR(36) NOT NULL,
+                            deleted_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6),
                             FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-                            INDEX idx_user_id (user_id)
+                            INDEX idx_user_deleted (user_id, deleted_at, note_id)
                         )
                     """)
                     
+                    # Columns added after the initial schema
+                    self._ensure_column(
+                        cursor, 'users', 'token_version',
+                        "INT NOT NULL DEFAULT 0 AFTER password_hash"
+                    )
+                    self._ensure_column(
+                        cursor, 'notes', 'version', "INT NOT NULL DEFAULT 1 AFTER updated_at"
+                    )
+                    
+                    self._ensure_column_precision(
+                        cursor, 'notes', 'updated_at', 6,
+                        "TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"
+                    )
+                    
+                    # Indexes added after the initial schema
+                    self._ensure_index(
+                        cursor, 'notes', 'idx_user_created', "(user_id, created_at, note_id)"
+                    )
+                    self._ensure_index(
+                        cursor, 'notes', 'idx_user_updated', "(user_id, updated_at, note_id)"
+                    )
+                    self._ensure_index(
+                        cursor, 'notes', 'idx_user_title', "(user_id, note_title, note_id)"
+                    )
+                    self._ensure_index(
+                        cursor, 'notes', 'idx_title_fulltext', "(note_title)", kind="FULLTEXT INDEX"
+                    )
+                    
+                    self.binary_note_ids = self._column_type(cursor, 'notes', 'note_id').startswith('binary')
+                    if not self.binary_note_ids:
+                        print("notes.note_id is still VARCHAR(36); see migrate.py binary-ids")
+                    
                     print("Database tables created successfully")
                     
         except Exception as e:
             print(f"Database initialization error: {e}")
             raise
     
+    def _ensure_column(self, cursor, table: str, column: str, definition: str) -> None:
+        """Add a column to an existing table if it is missing."""
+        cursor.execute(
+            """
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+            """,
+            (table, column)
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            print(f"Added column {table}.{column}")
+    
+    def _column_type(self, cursor, table: str, column: str) -> str:
+        """Return the full SQL type of an existing column, e.g. 'varchar(36)'."""
+        cursor.execute(
+            """
+            SELECT column_type AS column_type FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+            """,
+            (table, column)
+        )
+        return cursor.fetchone()['column_type']
+    
+    def _ensure_column_precision(
+        self, cursor, table: str, column: str, precision: int, definition: str
+    ) -> None:
+        """Widen a temporal column to the given fractional-second precision if needed."""
+        cursor.execute(
+            """
+            SELECT datetime_precision AS datetime_precision FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+            """,
+            (table, column)
+        )
+        result = cursor.fetchone()
+        if result is not None and (result['datetime_precision'] or 0) < precision:
+            cursor.execute(f"ALTER TABLE {table} MODIFY COLUMN {column} {definition}")
+            print(f"Changed {table}.{column} to {definition}")
+    
+    def _ensure_index(
+        self, cursor, table: str, index: str, columns: str, kind: str = "INDEX"
+    ) -> None:
+        """Create an index on an existing table if it is missing."""
+        cursor.execute(
+            """
+            SELECT 1 FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+            LIMIT 1
+            """,
+            (table, index)
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(f"CREATE {kind} {index} ON {table} {columns}")
+            print(f"Created index {table}.{index}")
+    
     def test_connection(self) -> bool:
         """Test the database connection."""
         try:
@@ -0,0 +1,79 @@
+"""Bounded executor that lets async route handlers await blocking database calls."""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class DatabaseExecutor:
+    """
+    Runs blocking repository calls on a dedicated thread pool.
+
+    The event loop never executes pymysql I/O itself; it only awaits the
+    result. At most max_workers calls run at once and the rest wait on a
+    semaphore, so a slow query occupies a single worker instead of
+    stalling every in-flight request on the loop.
+    """
+
+    def __init__(self, max_workers: int = 10):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self._completed = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the executor and await its result.
+
+        Context variables of the calling task are propagated to the worker
+        thread.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+
+        acquired = False
+        with self._lock:
+            self._waiting += 1
+        try:
+            async with self._get_semaphore():
+                with self._lock:
+                    self._waiting -= 1
+                    self._in_flight += 1
+                acquired = True
+                try:
+                    return await loop.run_in_executor(self._executor, call)
+                finally:
+                    with self._lock:
+                        self._in_flight -= 1
+                        self._completed += 1
+        finally:
+            if not acquired:
+                with self._lock:
+                    self._waiting -= 1
+
+    def stats(self) -> dict:
+        """Return a snapshot of executor usage counters."""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'in_flight': self._in_flight,
+                'waiting': self._waiting,
+                'completed': self._completed,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once queued calls have finished."""
+        self._executor.shutdown(wait=True)
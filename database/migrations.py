@@ -0,0 +1,263 @@
+"""
+Online data migrations.
+
+Each step works in short batches in primary-key order so the API keeps
+serving while it runs; they are driven by migrate.py.
+"""
+
+from typing import List, Optional, Tuple
+
+from .connection import DatabaseManager
+
+# Columns that held note bodies in the notes table before they moved to note_bodies
+_LEGACY_BODY_COLUMNS = ("note_content", "compressed_content")
+_BODY_SYNC_TRIGGERS = ("notes_body_sync_insert", "notes_body_sync_update")
+
+
+def legacy_body_columns(db: DatabaseManager) -> List[str]:
+    """Return which body columns are still present on the notes table."""
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT column_name AS column_name FROM information_schema.columns
+                WHERE table_schema = DATABASE() AND table_name = 'notes'
+                """
+            )
+            present = {row['column_name'] for row in cursor.fetchall()}
+    return [column for column in _LEGACY_BODY_COLUMNS if column in present]
+
+
+def install_body_sync_triggers(db: DatabaseManager, columns: List[str]) -> None:
+    """
+    Mirror body writes made through the legacy notes columns into note_bodies.
+
+    Keeps note_bodies current for a previous application version that is
+    still serving while the rows are copied. Only changes to the legacy
+    columns fire, so writers that use note_bodies directly are never
+    overwritten.
+    """
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{column}" for column in columns)
+    assignments = ", ".join(f"{column} = VALUES({column})" for column in columns)
+    upsert = (
+        f"INSERT INTO note_bodies (note_id, {column_list}) VALUES (NEW.note_id, {new_values}) "
+        f"ON DUPLICATE KEY UPDATE {assignments}"
+    )
+    inserted = " OR ".join(f"NEW.{column} IS NOT NULL" for column in columns)
+    changed = " OR ".join(f"NOT (NEW.{column} <=> OLD.{column})" for column in columns)
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            for trigger in _BODY_SYNC_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(
+                f"CREATE TRIGGER notes_body_sync_insert AFTER INSERT ON notes FOR EACH ROW "
+                f"IF {inserted} THEN {upsert}; END IF"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER notes_body_sync_update AFTER UPDATE ON notes FOR EACH ROW "
+                f"IF {changed} THEN {upsert}; END IF"
+            )
+
+
+def copy_note_bodies(
+    db: DatabaseManager, columns: List[str], after: str, limit: int
+) -> Tuple[Optional[str], int]:
+    """
+    Copy one batch of legacy bodies into note_bodies, in note_id order.
+
+    Bodies already present (mirrored by the triggers or written by the new
+    code) are kept. Returns the last note_id of the batch, or None when
+    there are no more rows, and the number of bodies copied.
+    """
+    column_list = ", ".join(columns)
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT note_id FROM notes WHERE note_id > %s ORDER BY note_id LIMIT %s",
+                (after, limit)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return None, 0
+            last = rows[-1]['note_id']
+            cursor.execute(
+                f"""
+                INSERT IGNORE INTO note_bodies (note_id, {column_list})
+                SELECT note_id, {column_list} FROM notes
+                WHERE note_id > %s AND note_id <= %s
+                """,
+                (after, last)
+            )
+            return last, cursor.rowcount
+
+
+def count_notes_without_body(db: DatabaseManager) -> int:
+    """Count notes that have no note_bodies row."""
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT COUNT(*) AS missing FROM notes
+                LEFT JOIN note_bodies ON note_bodies.note_id = notes.note_id
+                WHERE note_bodies.note_id IS NULL
+                """
+            )
+            return cursor.fetchone()['missing']
+
+
+def drop_legacy_body_columns(db: DatabaseManager, columns: List[str]) -> None:
+    """Remove the sync triggers and the body columns and FULLTEXT index from notes."""
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            for trigger in _BODY_SYNC_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            cursor.execute(
+                """
+                SELECT 1 FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND table_name = 'notes'
+                  AND index_name = 'idx_note_fulltext'
+                LIMIT 1
+                """
+            )
+            changes = ["DROP INDEX idx_note_fulltext"] if cursor.fetchone() else []
+            changes.extend(f"DROP COLUMN {column}" for column in columns)
+            if changes:
+                cursor.execute(f"ALTER TABLE notes {', '.join(changes)}, ALGORITHM=INPLACE, LOCK=NONE")
+
+
+# Tables keyed by note_id, and the secondary indexes that end in note_id
+_NOTE_ID_TABLES = {
+    "notes": {
+        "idx_user_created": "(user_id, created_at, note_id)",
+        "idx_user_updated": "(user_id, updated_at, note_id)",
+        "idx_user_title": "(user_id, note_title, note_id)",
+    },
+    "note_bodies": {},
+    "note_tombstones": {
+        "idx_user_deleted": "(user_id, deleted_at, note_id)",
+    },
+}
+_BINARY_ID = "UNHEX(REPLACE(note_id, '-', ''))"
+
+
+def text_id_tables(db: DatabaseManager) -> List[str]:
+    """Return the tables whose note_id column still holds UUID strings."""
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT table_name AS table_name FROM information_schema.columns
+                WHERE table_schema = DATABASE() AND column_name = 'note_id'
+                  AND data_type <> 'binary'
+                """
+            )
+            present = {row['table_name'] for row in cursor.fetchall()}
+    return [table for table in _NOTE_ID_TABLES if table in present]
+
+
+def add_binary_id_columns(db: DatabaseManager, tables: List[str]) -> None:
+    """
+    Add a note_id_bin shadow column to each table and keep it filled on insert.
+
+    note_id never changes after insert, so a BEFORE INSERT trigger is enough
+    to cover rows written while the backfill runs.
+    """
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            for table in tables:
+                cursor.execute(
+                    """
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_schema = DATABASE() AND table_name = %s AND column_name = 'note_id_bin'
+                    """,
+                    (table,)
+                )
+                if cursor.fetchone() is None:
+                    cursor.execute(
+                        f"ALTER TABLE {table} ADD COLUMN note_id_bin BINARY(16) NULL, "
+                        f"ALGORITHM=INPLACE, LOCK=NONE"
+                    )
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_binary_id")
+                cursor.execute(
+                    f"CREATE TRIGGER {table}_binary_id BEFORE INSERT ON {table} FOR EACH ROW "
+                    f"SET NEW.note_id_bin = UNHEX(REPLACE(NEW.note_id, '-', ''))"
+                )
+
+
+def fill_binary_ids(db: DatabaseManager, table: str, after: str, limit: int) -> Tuple[Optional[str], int]:
+    """
+    Fill note_id_bin for one batch of rows, in note_id order.
+
+    Returns the last note_id of the batch, or None when there are no more
+    rows, and the number of rows changed.
+    """
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"SELECT note_id FROM {table} WHERE note_id > %s ORDER BY note_id LIMIT %s",
+                (after, limit)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return None, 0
+            last = rows[-1]['note_id']
+            cursor.execute(
+                f"""
+                UPDATE {table} SET note_id_bin = {_BINARY_ID}
+                WHERE note_id > %s AND note_id <= %s AND note_id_bin IS NULL
+                """,
+                (after, last)
+            )
+            return last, cursor.rowcount
+
+
+def count_missing_binary_ids(db: DatabaseManager, table: str) -> int:
+    """Count rows whose note_id_bin is unset or does not match note_id."""
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT COUNT(*) AS missing FROM {table}
+                WHERE note_id_bin IS NULL OR NOT (note_id_bin <=> {_BINARY_ID})
+                """
+            )
+            return cursor.fetchone()['missing']
+
+
+def swap_binary_ids(db: DatabaseManager, tables: List[str]) -> None:
+    """
+    Replace the string note_id columns by their note_id_bin shadows.
+
+    Rebuilds each table, so it runs while no application version is writing.
+    The note_bodies foreign key is dropped first and restored at the end.
+    """
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT constraint_name AS constraint_name FROM information_schema.key_column_usage
+                WHERE table_schema = DATABASE() AND table_name = 'note_bodies'
+                  AND column_name = 'note_id' AND referenced_table_name = 'notes'
+                """
+            )
+            for row in cursor.fetchall():
+                cursor.execute(f"ALTER TABLE note_bodies DROP FOREIGN KEY {row['constraint_name']}")
+
+            for table in tables:
+                indexes = _NOTE_ID_TABLES[table]
+                cursor.execute(f"DROP TRIGGER IF EXISTS {table}_binary_id")
+                cursor.execute(
+                    f"ALTER TABLE {table} DROP PRIMARY KEY, "
+                    + "".join(f"DROP INDEX {index}, " for index in indexes)
+                    + "DROP COLUMN note_id"
+                )
+                cursor.execute(
+                    f"ALTER TABLE {table} CHANGE COLUMN note_id_bin note_id BINARY(16) NOT NULL FIRST, "
+                    f"ADD PRIMARY KEY (note_id)"
+                    + "".join(f", ADD INDEX {index} {columns}" for index, columns in indexes.items())
+                )
+
+            cursor.execute(
+                "ALTER TABLE note_bodies ADD FOREIGN KEY (note_id) REFERENCES notes(note_id) ON DELETE CASCADE"
+            )
@@ -0,0 +1,246 @@
+"""Bounded, thread-safe MySQL connection pool used by DatabaseManager."""
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import pymysql
+
+# Timestamps are written and filtered as naive UTC, so every session reads and
+# writes TIMESTAMP columns in UTC regardless of the server's time_zone
+_SESSION_INIT_COMMAND = "SET time_zone = '+00:00'"
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out before the timeout expired."""
+
+
+class _PoolEntry:
+    """A pooled connection together with its bookkeeping timestamps."""
+
+    __slots__ = ('conn', 'created_at', 'last_used')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    Fixed-capacity pool of pymysql connections.
+
+    Connections are created lazily up to max_size, recycled once they exceed
+    max_lifetime seconds, and pinged before an idle connection is handed out
+    again. Callers that cannot get a connection within checkout_timeout
+    seconds receive a PoolTimeoutError instead of blocking forever. Every
+    connection runs its session in UTC unless connect_args sets its own
+    init_command.
+    """
+
+    def __init__(
+        self,
+        connect_args: dict,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_lifetime: float = 3600.0,
+        checkout_timeout: float = 10.0,
+        ping_interval: float = 0.0
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.connect_args = connect_args
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._waiters = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        self._fill_to_min_size()
+
+    def _fill_to_min_size(self) -> None:
+        """Open connections until the pool holds at least min_size of them."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                entry = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+
+    def _open(self) -> _PoolEntry:
+        conn = pymysql.connect(**{'init_command': _SESSION_INIT_COMMAND, **self.connect_args})
+        with self._cond:
+            self._created += 1
+        return _PoolEntry(conn)
+
+    def _close_entry(self, entry: _PoolEntry) -> None:
+        try:
+            entry.conn.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, entry: _PoolEntry, now: float) -> bool:
+        return self.max_lifetime > 0 and now - entry.created_at >= self.max_lifetime
+
+    def _is_alive(self, entry: _PoolEntry, now: float) -> bool:
+        if now - entry.last_used < self.ping_interval:
+            return True
+        try:
+            entry.conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Check a connection out of the pool.
+
+        Args:
+            timeout: Seconds to wait for a free connection (defaults to checkout_timeout)
+
+        Returns:
+            An open pymysql connection that must be handed back with release()
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            entry = None
+            create = False
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout:.1f}s waiting for a database connection"
+                        )
+                    self._waiters += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiters -= 1
+                    if self._closed:
+                        raise RuntimeError("Connection pool is closed")
+
+                if self._idle:
+                    entry = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    entry = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            else:
+                now = time.monotonic()
+                if self._is_expired(entry, now) or not self._is_alive(entry, now):
+                    self._discard(entry)
+                    continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(entry.conn)] = entry
+                self._checkouts += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            return entry.conn
+
+    def release(self, conn, discard: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Args:
+            conn: Connection previously obtained from acquire()
+            discard: Close the connection instead of reusing it (e.g. after a network error)
+        """
+        with self._cond:
+            entry = self._in_use.pop(id(conn), None)
+        if entry is None:
+            return
+
+        entry.last_used = time.monotonic()
+        if discard or self._closed or self._is_expired(entry, entry.last_used):
+            self._discard(entry)
+            if not self._closed:
+                try:
+                    self._fill_to_min_size()
+                except Exception:
+                    pass
+            return
+
+        with self._cond:
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def _discard(self, entry: _PoolEntry) -> None:
+        self._close_entry(entry)
+        with self._cond:
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+
+    def close(self) -> None:
+        """Close all idle connections; in-use connections are closed when released."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_entry(entry)
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool usage counters."""
+        with self._cond:
+            checkouts = self._checkouts
+            return {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'waiters': self._waiters,
+                'checkouts': checkouts,
+                'timeouts': self._timeouts,
+                'connections_created': self._created,
+                'connections_discarded': self._discarded,
+                'total_wait_ms': round(self._total_wait * 1000, 3),
+                'avg_wait_ms': round(self._total_wait * 1000 / checkouts, 3) if checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3),
+            }
@@ -1,14 +1,26 @@
 """App dependency setup."""
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from config import settings
+from database.executor import DatabaseExecutor
 from models import User
 from services.auth_service import AuthService
 from services.user_service import UserService
 from services.note_service import NoteService
+from services.async_user_service import AsyncUserService
+from services.async_note_service import AsyncNoteService
+from services.password_hasher import PasswordHasher
+from services.token_version_store import TokenVersionStore
+from services.cache import ByteSizeCache, TTLCache
+from services.change_notifier import ChangeNotifier
 from repositories.user_repository import UserRepository
 from repositories.note_repository import NoteRepository
+from repositories.note_codec import NoteContentCodec
+from repositories.note_search_repository import (
+    InMemoryNoteSearchRepository, MySQLNoteSearchRepository, NoteSearchRepository
+)
 
 
 # Security
@@ -16,12 +28,49 @@ security = HTTPBearer()
 
 # Repository instances
 user_repository = UserRepository()
-note_repository = NoteRepository()
+note_content_codec = NoteContentCodec(
+    algorithm=settings.NOTE_COMPRESSION,
+    min_bytes=settings.NOTE_COMPRESSION_MIN_BYTES,
+    prefix_chars=max(settings.NOTE_COMPRESSION_PREFIX_CHARS, settings.NOTE_SNIPPET_LENGTH)
+)
+note_repository = NoteRepository(note_content_codec)
+if settings.SEARCH_BACKEND == "memory":
+    note_search_repository: NoteSearchRepository = InMemoryNoteSearchRepository(
+        loader=note_repository.get_by_user_id
+    )
+else:
+    note_search_repository = MySQLNoteSearchRepository(note_content_codec)
 
 # Service instances
 auth_service = AuthService()
-user_service = UserService(user_repository, auth_service)
-note_service = NoteService(note_repository)
+token_version_store = TokenVersionStore(
+    user_repository,
+    ttl_seconds=settings.TOKEN_VERSION_TTL_SECONDS
+)
+user_cache = TTLCache(
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+user_service = UserService(user_repository, auth_service, token_version_store, user_cache)
+change_notifier = ChangeNotifier(
+    buffer_size=settings.NOTIFY_BUFFER_SIZE,
+    max_connections=settings.NOTIFY_MAX_CONNECTIONS
+)
+note_cache = ByteSizeCache(
+    max_bytes=settings.NOTE_CACHE_MAX_BYTES,
+    ttl_seconds=settings.NOTE_CACHE_TTL_SECONDS,
+    max_entry_bytes=settings.NOTE_CACHE_MAX_ENTRY_BYTES
+)
+note_service = NoteService(note_repository, change_notifier, note_search_repository, note_cache)
+
+# Async data path: blocking repository work runs on a bounded executor
+db_executor = DatabaseExecutor(max_workers=settings.DB_EXECUTOR_MAX_WORKERS)
+password_hasher = PasswordHasher(
+    max_workers=settings.BCRYPT_WORKERS,
+    max_pending=settings.BCRYPT_MAX_PENDING
+)
+async_user_service = AsyncUserService(user_service, db_executor, password_hasher)
+async_note_service = AsyncNoteService(note_service, db_executor)
 
 
 def get_auth_service() -> AuthService:
@@ -39,22 +88,46 @@ def get_note_service() -> NoteService:
     return note_service
 
 
+def get_change_notifier() -> ChangeNotifier:
+    """Dependency to get the change notifier."""
+    return change_notifier
+
+
 def get_user_repository() -> UserRepository:
     """Dependency to get the user repository."""
     return user_repository
 
 
+def get_async_user_service() -> AsyncUserService:
+    """Dependency to get the async user service."""
+    return async_user_service
+
+
+def get_async_note_service() -> AsyncNoteService:
+    """Dependency to get the async note service."""
+    return async_note_service
+
+
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     auth_service: AuthService = Depends(get_auth_service),
-    user_repo: UserRepository = Depends(get_user_repository)
+    user_service: AsyncUserService = Depends(get_async_user_service)
 ) -> User:
     """
     Dependency to get the current authenticated user from JWT token.
     
     This function extracts the JWT token from the request header,
     validates it, and returns the authenticated user.
+    
+    In stateless mode the user is built from the token claims and only the
+    (cached) token version is checked, so no user row is loaded.
+    Sub-requests of a /batch call reuse the user resolved for the batch.
     """
+    batch_user = getattr(request.state, "batch_user", None)
+    if batch_user is not None:
+        return batch_user
+    
     token = credentials.credentials
     payload = auth_service.decode_jwt_token(token)
     
@@ -66,7 +139,27 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = user_repo.get_by_email(user_email)
+    token_version = payload.get("ver")
+    if auth_service.stateless_auth and "uid" in payload and token_version is not None:
+        current_version = await user_service.get_token_version(payload["uid"])
+        if current_version is None:
+            raise HTTPException(
+                status_code=401,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        _check_token_version(token_version, current_version)
+        return User.model_construct(
+            user_id=payload["uid"],
+            user_name=payload.get("name", ""),
+            user_email=user_email,
+            password="",
+            token_version=token_version,
+            created_on=None,
+            last_update=None
+        )
+    
+    user = await user_service.get_user_by_email(user_email)
     if user is None:
         raise HTTPException(
             status_code=401,
@@ -74,4 +167,17 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return user
\ No newline at end of file
+    if token_version is not None:
+        _check_token_version(token_version, user.token_version)
+    
+    return user
+
+
+def _check_token_version(token_version: int, current_version: int) -> None:
+    """Reject tokens issued before the user's last revocation."""
+    if token_version != current_version:
+        raise HTTPException(
+            status_code=401,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
\ No newline at end of file
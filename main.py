@@ -1,20 +1,37 @@
 """Main FastAPI application file for the Notes API."""
 
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 import uvicorn
-from database import DatabaseManager
-from routers import auth, notes, health
+from database import DatabaseManager, PoolTimeoutError
+from routers import auth, batch, notes, health
 from config import settings
+from dependencies import db_executor, note_service, password_hasher
 
 load_dotenv()
 
+
+async def prune_tombstones_periodically(interval: float):
+    """Drop expired deletion records every interval seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await db_executor.run(note_service.prune_tombstones)
+            if removed:
+                print(f"Pruned {removed} expired tombstones")
+        except Exception as e:
+            print(f"Tombstone pruning failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events."""
     print("Starting Notes API...")
+    prune_task = None
     try:
         # Initialize the database manager
         db = DatabaseManager()
@@ -28,12 +45,26 @@ async def lifespan(app: FastAPI):
         else:
             raise Exception("Database connection test failed")
         
+        # Drop deletion records that sync clients can no longer ask for, now and periodically
+        note_service.prune_tombstones()
+        if settings.SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS > 0:
+            prune_task = asyncio.create_task(
+                prune_tombstones_periodically(settings.SYNC_TOMBSTONE_PRUNE_INTERVAL_SECONDS)
+            )
+        
         yield
     except Exception as e:
         print(f"Database initialization failed: {e}")
         raise
     finally:
         print("Shutting down Notes API...")
+        if prune_task is not None:
+            prune_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await prune_task
+        password_hasher.shutdown()
+        db_executor.shutdown()
+        DatabaseManager().close_pool()
 
 
 # Create the FastAPI application
@@ -51,14 +82,27 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """Report database pool exhaustion as a retryable 503 instead of a 500."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
+
 # Include routers
 app.include_router(health.router)
 app.include_router(auth.router)
 app.include_router(notes.router)
+app.include_router(batch.router)
 
 
 # Development server entry point
@@ -0,0 +1,171 @@
+"""
+Online data migrations for the notes database.
+
+Each command walks the notes table in primary-key order, one short
+transaction per batch, so the API keeps serving while it runs and an
+interrupted run can be resumed with --after.
+
+Usage:
+    python migrate.py split-bodies [--batch-size 500] [--pause 0.05] [--after <note_id>]
+    python migrate.py split-bodies --finish
+    python migrate.py compress [--batch-size 500] [--pause 0.05] [--after <note_id>]
+    python migrate.py binary-ids [--batch-size 500] [--pause 0.05]
+    python migrate.py binary-ids --finish
+
+Upgrading a database from the original schema (bodies in notes,
+VARCHAR(36) note IDs), in this order:
+
+1. python migrate.py split-bodies, while the previous version still
+   serves (triggers mirror its body writes into note_bodies)
+2. deploy this version; it keeps reading and writing VARCHAR(36) IDs
+   until step 5
+3. python migrate.py split-bodies --finish, to drop the old columns
+4. python migrate.py binary-ids, while this version serves (a trigger
+   fills the new column for inserted rows)
+5. maintenance window: stop the API, run python migrate.py binary-ids
+   --finish, which rebuilds the three note tables, and start the API
+   again; every worker picks up the BINARY(16) IDs when it starts
+"""
+
+import argparse
+import time
+
+from database import DatabaseManager, migrations
+from dependencies import note_content_codec, note_repository
+
+
+def split_bodies(args: argparse.Namespace) -> None:
+    """Copy note bodies from the notes table into note_bodies."""
+    db = DatabaseManager()
+    columns = migrations.legacy_body_columns(db)
+    if not columns:
+        print("notes has no body columns left; nothing to do")
+        return
+    if not args.finish:
+        migrations.install_body_sync_triggers(db, columns)
+        print(f"Mirroring writes to notes.({', '.join(columns)}) into note_bodies")
+
+    copied = 0
+    after = args.after
+    start = time.perf_counter()
+    while True:
+        last, count = migrations.copy_note_bodies(db, columns, after, args.batch_size)
+        if last is None:
+            break
+        copied += count
+        after = last
+        print(f"  {copied} bodies copied (last {after})")
+        if args.pause:
+            time.sleep(args.pause)
+    print(f"Copied {copied} bodies in {time.perf_counter() - start:.1f}s")
+
+    if args.finish:
+        missing = migrations.count_notes_without_body(db)
+        if missing:
+            raise SystemExit(f"{missing} notes still have no body row; not dropping the old columns")
+        migrations.drop_legacy_body_columns(db, columns)
+        print(f"Dropped notes.({', '.join(columns)}) and the sync triggers")
+    else:
+        print("Deploy the new version, then run: python migrate.py split-bodies --finish")
+
+
+def compress(args: argparse.Namespace) -> None:
+    """Store existing note bodies with the configured NOTE_COMPRESSION codec."""
+    totals = {'scanned': 0, 'rewritten': 0, 'bytes_before': 0, 'bytes_after': 0}
+    after = args.after
+    start = time.perf_counter()
+    while True:
+        last, stats = note_repository.recode_bodies(after, args.batch_size)
+        if last is None:
+            break
+        for key, value in stats.items():
+            totals[key] += value
+        after = last
+        print(f"  {totals['scanned']} rows scanned, {totals['rewritten']} rewritten (last {after})")
+        if args.pause:
+            time.sleep(args.pause)
+
+    elapsed = time.perf_counter() - start
+    saved = totals['bytes_before'] - totals['bytes_after']
+    ratio = totals['bytes_after'] / totals['bytes_before'] if totals['bytes_before'] else 1.0
+    print(f"Codec {note_content_codec.algorithm}: {totals['rewritten']} of {totals['scanned']} rows "
+          f"rewritten in {elapsed:.1f}s")
+    print(f"Body bytes {totals['bytes_before']} -> {totals['bytes_after']} "
+          f"({saved} saved, {ratio:.0%} of original)")
+
+
+def binary_ids(args: argparse.Namespace) -> None:
+    """Fill BINARY(16) copies of the note IDs, then swap them in with --finish."""
+    db = DatabaseManager()
+    if migrations.legacy_body_columns(db):
+        raise SystemExit("notes still has body columns; run split-bodies --finish first")
+    tables = migrations.text_id_tables(db)
+    if not tables:
+        print("note IDs are already stored as BINARY(16); nothing to do")
+        return
+    migrations.add_binary_id_columns(db, tables)
+
+    start = time.perf_counter()
+    for table in tables:
+        filled = 0
+        after = ""
+        while True:
+            last, count = migrations.fill_binary_ids(db, table, after, args.batch_size)
+            if last is None:
+                break
+            filled += count
+            after = last
+            print(f"  {table}: {filled} ids converted (last {after})")
+            if args.pause:
+                time.sleep(args.pause)
+    print(f"Converted ids in {', '.join(tables)} in {time.perf_counter() - start:.1f}s")
+
+    if args.finish:
+        for table in tables:
+            missing = migrations.count_missing_binary_ids(db, table)
+            if missing:
+                raise SystemExit(f"{missing} rows in {table} have no valid binary id; not swapping")
+        migrations.swap_binary_ids(db, tables)
+        print(f"note_id is now BINARY(16) in {', '.join(tables)}")
+    else:
+        print("Stop the API, run: python migrate.py binary-ids --finish, then start the API again")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    split_parser = commands.add_parser("split-bodies", help=split_bodies.__doc__)
+    split_parser.add_argument("--batch-size", type=int, default=500)
+    split_parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    split_parser.add_argument("--after", default="", help="resume after this note_id")
+    split_parser.add_argument(
+        "--finish", action="store_true", help="copy any stragglers, then drop the old columns and triggers"
+    )
+    split_parser.set_defaults(handler=split_bodies)
+
+    compress_parser = commands.add_parser("compress", help=compress.__doc__)
+    compress_parser.add_argument("--batch-size", type=int, default=500)
+    compress_parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    compress_parser.add_argument("--after", default="", help="resume after this note_id")
+    compress_parser.set_defaults(handler=compress)
+
+    binary_parser = commands.add_parser("binary-ids", help=binary_ids.__doc__)
+    binary_parser.add_argument("--batch-size", type=int, default=500)
+    binary_parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    binary_parser.add_argument(
+        "--finish", action="store_true", help="convert any stragglers, then rebuild the tables on the new ids"
+    )
+    binary_parser.set_defaults(handler=binary_ids)
+
+    args = parser.parse_args()
+    db = DatabaseManager()
+    db.initialize_database()
+    try:
+        args.handler(args)
+    finally:
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional, Union
+import os
+import time
 import uuid
 
 
@@ -9,6 +11,7 @@ class User(BaseModel):
     user_name: str
     user_email: EmailStr
     password: str
+    token_version: int = 0
     created_on: Optional[datetime] = None
     last_update: Optional[datetime] = None
 
@@ -39,6 +42,7 @@ class Note(BaseModel):
     user_id: str
     created_on: Optional[datetime] = None
     last_update: Optional[datetime] = None
+    version: int = 1
 
 
 class NoteCreate(BaseModel):
@@ -49,6 +53,20 @@ class NoteCreate(BaseModel):
 class NoteUpdate(BaseModel):
     note_title: Optional[str] = None
     note_content: Optional[str] = None
+    version: Optional[int] = None
+
+
+class NoteEdit(BaseModel):
+    op: Literal["insert", "delete"]
+    pos: int = Field(ge=0)
+    text: str = ""
+    length: int = Field(default=0, ge=0)
+
+
+class NotePatch(BaseModel):
+    version: int
+    note_title: Optional[str] = None
+    edits: List[NoteEdit] = []
 
 
 class NoteResponse(BaseModel):
@@ -58,6 +76,119 @@ class NoteResponse(BaseModel):
     user_id: str
     created_on: datetime
     last_update: datetime
+    version: int = 1
+
+
+class NoteSummary(BaseModel):
+    note_id: str
+    note_title: str
+    note_snippet: str
+    user_id: str
+    created_on: datetime
+    last_update: datetime
+
+
+class NoteListQuery(BaseModel):
+    sort: Literal["created_at", "updated_at", "title"] = "created_at"
+    direction: Literal["asc", "desc"] = "desc"
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    updated_from: Optional[datetime] = None
+    updated_to: Optional[datetime] = None
+
+
+class NotePage(BaseModel):
+    notes: List[Union[NoteResponse, NoteSummary]]
+    next_cursor: Optional[str] = None
+
+
+class NoteChanges(BaseModel):
+    changed: List[NoteResponse]
+    deleted: List[str]
+    next_token: str
+    has_more: bool
+
+
+class NoteSearchHit(BaseModel):
+    note_id: str
+    note_title: str
+    note_snippet: str
+    score: float
+    user_id: str
+    created_on: datetime
+    last_update: datetime
+
+
+class NoteSearchPage(BaseModel):
+    results: List[NoteSearchHit]
+    next_cursor: Optional[str] = None
+
+
+class BulkNoteResult(BaseModel):
+    index: int
+    status: Literal["created", "invalid"]
+    note: Optional[NoteResponse] = None
+    error: Optional[str] = None
+
+
+class BulkNoteResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkNoteResult]
+
+
+class NoteImportError(BaseModel):
+    line: int
+    error: str
+
+
+class NoteImportResult(BaseModel):
+    lines: int
+    imported: int
+    failed: int
+    batches: int
+    last_committed_line: int
+    errors: List[NoteImportError]
+    errors_truncated: bool
+    complete: bool
+    seconds: float
+    rows_per_second: float
+
+
+class NoteIdList(BaseModel):
+    note_ids: List[str]
+
+
+class BatchNoteResult(BaseModel):
+    note_id: str
+    status: Literal["found", "deleted", "not_found", "forbidden"]
+    note: Optional[NoteResponse] = None
+
+
+class BatchNoteResponse(BaseModel):
+    results: List[BatchNoteResult]
+
+
+class BatchOperation(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str
+    body: Optional[Any] = None
+    headers: Optional[Dict[str, str]] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchOperation]
+    atomic: bool = False
+
+
+class BatchOperationResult(BaseModel):
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    results: List[BatchOperationResult]
+    committed: bool
 
 
 class Token(BaseModel):
@@ -70,4 +201,13 @@ class TokenData(BaseModel):
 
 
 def generate_id():
-    return str(uuid.uuid4())
\ No newline at end of file
+    """
+    Time-ordered UUID (version 7 layout): 48 bits of Unix milliseconds, then random bits.
+    
+    New IDs sort after older ones, so primary-key inserts append to the
+    B-tree instead of splitting random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return str(uuid.UUID(int=value))
\ No newline at end of file
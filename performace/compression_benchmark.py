@@ -0,0 +1,107 @@
+"""
+Note body compression benchmark.
+
+Builds a synthetic corpus of note bodies (pasted logs, meeting transcripts
+and prose, mostly small with a long tail of large ones) and runs it through
+NoteContentCodec with each algorithm and level. Reports the storage the
+two body columns would take and the CPU time spent encoding on write and
+decoding on read.
+
+Runs without MySQL or a server:
+    python compression_benchmark.py [--notes 2000] [--min-bytes 8192]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories.note_codec import NoteContentCodec
+
+WORDS = ("the meeting action item deploy rollback latency customer ticket review agreed next "
+         "week database index query cache worker timeout retry error budget release").split()
+SPEAKERS = ["Alice", "Bob", "Carol", "Dan"]
+CONFIGURATIONS = [("none", None), ("zlib", 1), ("zlib", 6), ("zlib", 9), ("lzma", 0), ("lzma", 1), ("lzma", 6)]
+
+
+def log_body(rng: random.Random, size: int) -> str:
+    lines = []
+    while sum(map(len, lines)) < size:
+        lines.append(
+            f"2026-03-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:"
+            f"{rng.randint(0, 59):02d}Z {rng.choice(['INFO', 'WARN', 'ERROR'])} "
+            f"worker-{rng.randint(1, 8)} request_id={rng.getrandbits(64):016x} "
+            f"path=/notes/{rng.getrandbits(32):08x} status={rng.choice([200, 200, 304, 404, 500])} "
+            f"duration_ms={rng.randint(1, 900)}\n"
+        )
+    return "".join(lines)
+
+
+def transcript_body(rng: random.Random, size: int) -> str:
+    lines = []
+    while sum(map(len, lines)) < size:
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 30)))
+        lines.append(f"[{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}] {rng.choice(SPEAKERS)}: {words}.\n")
+    return "".join(lines)
+
+
+def prose_body(rng: random.Random, size: int) -> str:
+    words = []
+    while sum(map(len, words)) + len(words) < size:
+        words.append(rng.choice(WORDS))
+    return " ".join(words)
+
+
+def build_corpus(count: int, rng: random.Random) -> List[str]:
+    kinds = [log_body, transcript_body, prose_body]
+    # Log-normal sizes: median around 2KB, a tail into the hundreds of KB
+    sizes = [min(int(rng.lognormvariate(7.6, 1.6)), 2 * 1024 * 1024) for _ in range(count)]
+    return [rng.choice(kinds)(rng, size) for size in sizes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure storage and CPU cost of note body compression")
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--min-bytes", type=int, default=8192, help="compression threshold")
+    parser.add_argument("--prefix-chars", type=int, default=2000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.notes, random.Random(42))
+    raw_bytes = sum(len(body.encode("utf-8")) for body in corpus)
+    large = sum(1 for body in corpus if len(body.encode("utf-8")) >= args.min_bytes)
+
+    print("\n" + "=" * 70)
+    print("  NOTE BODY COMPRESSION BENCHMARK")
+    print("=" * 70)
+    print(f"{args.notes} notes, {raw_bytes / 1024 / 1024:.1f}MB of text, "
+          f"{large} at or above {args.min_bytes} bytes\n")
+    print(f"  {'codec':<10} {'stored MB':>10} {'saved':>7} {'encode ms':>10} {'decode ms':>10} "
+          f"{'enc MB/s':>9} {'dec MB/s':>9}")
+
+    for algorithm, level in CONFIGURATIONS:
+        codec = NoteContentCodec(algorithm, args.min_bytes, args.prefix_chars, level)
+        start = time.perf_counter()
+        stored = [codec.encode(body) for body in corpus]
+        encode_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for content, compressed in stored:
+            codec.decode(content, compressed)
+        decode_seconds = time.perf_counter() - start
+
+        stored_bytes = sum(len(content.encode("utf-8")) + len(compressed or b"") for content, compressed in stored)
+        label = algorithm if level is None else f"{algorithm}-{level}"
+        print(f"  {label:<10} {stored_bytes / 1024 / 1024:10.2f} {1 - stored_bytes / raw_bytes:7.0%} "
+              f"{encode_seconds * 1000:10.1f} {decode_seconds * 1000:10.1f} "
+              f"{raw_bytes / 1024 / 1024 / max(encode_seconds, 1e-9):9.0f} "
+              f"{raw_bytes / 1024 / 1024 / max(decode_seconds, 1e-9):9.0f}")
+
+    print("\nEncode time is paid per write of a large note, decode time per read of its full content;")
+    print("summaries, snippets and metadata queries never decode.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Write contention benchmark for optimistic concurrency on PUT /notes/{id}.
+
+Many writers append a unique marker line to the same note. In "versioned"
+mode each writer sends the version it read and retries on 409 Conflict;
+in "last-write-wins" mode it sends no version. Afterwards the final note is
+checked for every marker, so lost updates show up as missing markers.
+
+Needs the server running:
+    uvicorn main:app --port 8000
+    python contention_benchmark.py --writers 16 --edits 20
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from typing import Dict, List
+
+import requests
+
+from performance_test import BASE_URL, setup_test_user
+
+
+def writer(session: requests.Session, note_url: str, name: str, edits: int,
+           versioned: bool, results: Dict, lock: threading.Lock):
+    conflicts = 0
+    latencies: List[float] = []
+    errors = 0
+    for edit in range(edits):
+        marker = f"{name}-{edit}"
+        start = time.perf_counter()
+        while True:
+            note = session.get(note_url, timeout=30).json()
+            body = {"note_content": f"{note['note_content']}\n{marker}"}
+            if versioned:
+                body["version"] = note["version"]
+            response = session.put(note_url, json=body, timeout=30)
+            if response.status_code == 409:
+                conflicts += 1
+                continue
+            if response.status_code != 200:
+                errors += 1
+            break
+        latencies.append((time.perf_counter() - start) * 1000)
+    with lock:
+        results["conflicts"] += conflicts
+        results["errors"] += errors
+        results["latencies"].extend(latencies)
+
+
+def run_mode(headers: Dict, writers: int, edits: int, versioned: bool) -> Dict:
+    note = requests.post(
+        f"{BASE_URL}/notes/", headers=headers,
+        json={"note_title": "contention", "note_content": "start"}, timeout=30
+    ).json()
+    note_url = f"{BASE_URL}/notes/{note['note_id']}"
+    results = {"conflicts": 0, "errors": 0, "latencies": []}
+    lock = threading.Lock()
+
+    sessions = []
+    for _ in range(writers):
+        session = requests.Session()
+        session.headers.update(headers)
+        sessions.append(session)
+    threads = [
+        threading.Thread(target=writer, args=(sessions[i], note_url, f"w{i}", edits, versioned, results, lock))
+        for i in range(writers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    final = requests.get(note_url, headers=headers, timeout=30).json()
+    lines = set(final["note_content"].split("\n"))
+    expected = {f"w{i}-{edit}" for i in range(writers) for edit in range(edits)}
+    requests.delete(note_url, headers=headers, timeout=30)
+
+    ordered = sorted(results["latencies"]) or [0.0]
+    return {
+        "edits": writers * edits,
+        "conflicts": results["conflicts"],
+        "errors": results["errors"],
+        "lost": len(expected - lines),
+        "final_version": final.get("version"),
+        "edits_per_sec": writers * edits / elapsed,
+        "avg_ms": statistics.mean(ordered),
+        "p99_ms": ordered[int(len(ordered) * 0.99)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--edits", type=int, default=20, help="edits per writer")
+    args = parser.parse_args()
+
+    token = setup_test_user()
+    headers = {"Authorization": f"Bearer {token}"}
+
+    print("\n" + "=" * 70)
+    print("  WRITE CONTENTION ON ONE NOTE")
+    print("=" * 70)
+    print(f"{args.writers} writers x {args.edits} edits\n")
+
+    outcomes = {
+        "versioned": run_mode(headers, args.writers, args.edits, versioned=True),
+        "last-write-wins": run_mode(headers, args.writers, args.edits, versioned=False),
+    }
+    for label, stats in outcomes.items():
+        print(f"  {label:<16} {stats['edits_per_sec']:7.1f} edits/s  avg {stats['avg_ms']:7.1f}ms  "
+              f"p99 {stats['p99_ms']:7.1f}ms  conflicts {stats['conflicts']:5d}  "
+              f"lost {stats['lost']:4d}  errors {stats['errors']}  version {stats['final_version']}")
+
+    versioned = outcomes["versioned"]
+    print(f"\nRetries per edit (versioned): {versioned['conflicts'] / versioned['edits']:.2f}")
+    sys.exit(0 if versioned["lost"] == 0 and versioned["errors"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Event-loop isolation benchmark for the async data path.
+
+Simulates a worker serving a steady stream of fast requests while a single
+query is artificially slowed. Each simulated request does a blocking
+"query" (time.sleep) either inline on the event loop, as the original
+handlers did, or through DatabaseExecutor. With the executor, p99 of the
+fast requests should stay flat while the slow query is in flight.
+
+Runs without MySQL or a server:
+    python event_loop_benchmark.py
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.executor import DatabaseExecutor
+
+FAST_QUERY_SECONDS = 0.002
+SLOW_QUERY_SECONDS = 1.0
+REQUESTS = 400
+REQUEST_INTERVAL_SECONDS = 0.005
+EXECUTOR_WORKERS = 10
+FLAT_TOLERANCE = 3.0
+
+
+def blocking_query(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def handle_request(mode: str, executor: DatabaseExecutor, seconds: float) -> float:
+    start = time.perf_counter()
+    if mode == "inline":
+        blocking_query(seconds)
+    else:
+        await executor.run(blocking_query, seconds)
+    return (time.perf_counter() - start) * 1000
+
+
+async def run_scenario(mode: str, with_slow_query: bool) -> List[float]:
+    executor = DatabaseExecutor(max_workers=EXECUTOR_WORKERS)
+    tasks = []
+
+    async def timed(arrival: float):
+        # Open-loop load: latency is measured from the scheduled arrival time,
+        # so requests that arrive while the loop is blocked are charged for it
+        await handle_request(mode, executor, FAST_QUERY_SECONDS)
+        return (time.perf_counter() - arrival) * 1000
+
+    slow_task = None
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        arrival = start + i * REQUEST_INTERVAL_SECONDS
+        delay = arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if with_slow_query and i == REQUESTS // 4:
+            slow_task = asyncio.create_task(handle_request(mode, executor, SLOW_QUERY_SECONDS))
+        tasks.append(asyncio.create_task(timed(arrival)))
+
+    latencies = await asyncio.gather(*tasks)
+    if slow_task:
+        await slow_task
+    executor.shutdown()
+    return list(latencies)
+
+
+def summarize(latencies: List[float]) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        'requests': len(ordered),
+        'avg_ms': statistics.mean(ordered),
+        'p50_ms': ordered[int(len(ordered) * 0.50)],
+        'p99_ms': ordered[int(len(ordered) * 0.99)],
+        'max_ms': ordered[-1],
+    }
+
+
+def print_row(label: str, stats: Dict):
+    print(f"  {label:<28} avg {stats['avg_ms']:8.2f}  p50 {stats['p50_ms']:8.2f}  "
+          f"p99 {stats['p99_ms']:8.2f}  max {stats['max_ms']:8.2f}")
+
+
+def main():
+    print("\n" + "=" * 70)
+    print("  EVENT LOOP ISOLATION BENCHMARK")
+    print("=" * 70)
+    print(f"Fast query: {FAST_QUERY_SECONDS * 1000:.0f}ms, slow query: {SLOW_QUERY_SECONDS * 1000:.0f}ms, "
+          f"{REQUESTS} requests every {REQUEST_INTERVAL_SECONDS * 1000:.0f}ms\n")
+
+    results = {}
+    for mode in ("inline", "executor"):
+        baseline = summarize(asyncio.run(run_scenario(mode, with_slow_query=False)))
+        slowed = summarize(asyncio.run(run_scenario(mode, with_slow_query=True)))
+        results[mode] = (baseline, slowed)
+        print(f"{mode}:")
+        print_row("baseline", baseline)
+        print_row("one query slowed", slowed)
+        print()
+
+    baseline, slowed = results["executor"]
+    ratio = slowed['p99_ms'] / baseline['p99_ms'] if baseline['p99_ms'] else 0
+    verdict = "FLAT" if ratio <= FLAT_TOLERANCE else "DEGRADED"
+    print(f"Executor p99 with a slowed query: {ratio:.2f}x baseline -> {verdict}")
+    sys.exit(0 if verdict == "FLAT" else 1)
+
+
+if __name__ == "__main__":
+    main()
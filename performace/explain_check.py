@@ -0,0 +1,159 @@
+"""
+EXPLAIN check for GET /notes sorting and filtering, and for GET /notes/search.
+
+Compiles every supported combination of sort field, direction, date filters,
+projection and keyset cursor through NoteRepository.build_list_query and runs
+EXPLAIN on it. Fails if any plan does a filesort, a full table scan, reads
+notes through an index other than the one for its sort field, or joins
+note_bodies other than by primary key. Search queries, compiled through
+MySQLNoteSearchRepository.build_search_query, must read notes and
+note_bodies through their FULLTEXT indexes and never scan either table.
+
+Needs MySQL (configured through the usual DB_* environment variables):
+    python explain_check.py [--seed 2000]
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+from models import NoteListQuery, generate_id
+from repositories.note_ids import to_db_id
+from repositories.note_repository import NoteRepository, _NOTE_COLUMNS, _SORT_COLUMNS, _SUMMARY_COLUMNS
+from repositories.note_search_repository import MySQLNoteSearchRepository
+
+FILTER_SETS = [
+    {},
+    {"created_from": True},
+    {"created_to": True},
+    {"created_from": True, "created_to": True},
+    {"updated_from": True, "updated_to": True},
+    {"created_from": True, "updated_to": True},
+]
+SEARCH_TERMS = ["title", "content", "title content", "000500", "missing"]
+SEARCH_INDEXES = {"notes": "idx_title_fulltext", "note_bodies": "idx_body_fulltext"}
+
+
+def seed_user(db: DatabaseManager, count: int) -> str:
+    user_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO users (user_id, user_name, user_email, password_hash) VALUES (%s, %s, %s, %s)",
+                (user_id, "explain check", f"explain-{user_id}@example.com", "x")
+            )
+            note_ids = [to_db_id(generate_id()) for _ in range(count)]
+            cursor.executemany(
+                """
+                INSERT INTO notes (note_id, user_id, note_title, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                [
+                    (note_id, user_id, f"title {i:06d}",
+                     now - timedelta(minutes=i), now - timedelta(minutes=i // 2))
+                    for i, note_id in enumerate(note_ids)
+                ]
+            )
+            cursor.executemany(
+                "INSERT INTO note_bodies (note_id, note_content) VALUES (%s, %s)",
+                [(note_id, "content " * 20) for note_id in note_ids]
+            )
+            cursor.execute("ANALYZE TABLE notes, note_bodies")
+            cursor.fetchall()
+    return user_id
+
+
+def remove_user(db: DatabaseManager, user_id: str):
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assert GET /notes list queries are index-driven")
+    parser.add_argument("--seed", type=int, default=2000, help="notes to create for the check user")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    db.initialize_database()
+    repository = NoteRepository()
+    search_repository = MySQLNoteSearchRepository()
+    user_id = seed_user(db, args.seed)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    sample_values = {"created_at": now, "updated_at": now, "title": "title 000500"}
+
+    failures = []
+    checked = 0
+    try:
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                combinations = itertools.product(
+                    _SORT_COLUMNS, ("asc", "desc"), FILTER_SETS, (False, True), (None, 50), (False, True)
+                )
+                for sort, direction, filters, summary, limit, with_cursor in combinations:
+                    query = NoteListQuery(
+                        sort=sort,
+                        direction=direction,
+                        **{field: now - timedelta(days=1) if field.endswith("from") else now
+                           for field in filters}
+                    )
+                    after = (sample_values[sort], generate_id()) if with_cursor else None
+                    columns, column_params = (_SUMMARY_COLUMNS, (200,)) if summary else (_NOTE_COLUMNS, ())
+                    sql, params = repository.build_list_query(
+                        user_id, query, columns, limit, after, column_params
+                    )
+                    cursor.execute("EXPLAIN " + sql, params)
+                    plan = cursor.fetchall()
+                    checked += 1
+
+                    for row in plan:
+                        expected_index = _SORT_COLUMNS[sort][1] if row.get("table") == "notes" else "PRIMARY"
+                        extra = row.get("Extra") or ""
+                        problems = []
+                        if "filesort" in extra:
+                            problems.append("filesort")
+                        if row.get("type") == "ALL":
+                            problems.append("full scan")
+                        if row.get("key") != expected_index:
+                            problems.append(f"uses {row.get('key')} instead of {expected_index}")
+                        if problems:
+                            label = (f"sort={sort} {direction} filters={sorted(filters)} "
+                                     f"summary={summary} limit={limit} cursor={with_cursor}")
+                            failures.append(f"{label}: {', '.join(problems)} ({extra})")
+
+                for terms in SEARCH_TERMS:
+                    sql, params = search_repository.build_search_query(user_id, terms, 20)
+                    cursor.execute("EXPLAIN " + sql, params)
+                    plan = cursor.fetchall()
+                    checked += 1
+
+                    problems = []
+                    for table, index in SEARCH_INDEXES.items():
+                        if not any(row.get("table") == table and row.get("key") == index for row in plan):
+                            problems.append(f"{table} not read through {index}")
+                    for row in plan:
+                        if row.get("table") in SEARCH_INDEXES and row.get("type") == "ALL":
+                            problems.append(f"full scan of {row['table']}")
+                    if problems:
+                        failures.append(f"search {terms!r}: {', '.join(problems)}")
+    finally:
+        remove_user(db, user_id)
+        db.close_pool()
+
+    print(f"Checked {checked} query shapes")
+    for failure in failures:
+        print(f"  FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("All list and search queries are index-driven")
+
+
+if __name__ == "__main__":
+    main()
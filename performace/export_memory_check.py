@@ -0,0 +1,131 @@
+"""
+Memory check for GET /notes/export.
+
+Seeds two users, one with --small notes and one with --large notes, and
+consumes NoteService.export_notes for each under tracemalloc (with and
+without gzip). The export reads through a server-side cursor, so its peak
+allocation must stay flat: the check fails if the large account peaks at
+more than --tolerance times the small one. For contrast it also reports the
+peak of loading the large account with get_user_notes, which builds the
+whole list first.
+
+Needs MySQL (configured through the usual DB_* environment variables):
+    python export_memory_check.py [--small 1000] [--large 50000] [--body-bytes 2000]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+from dependencies import note_service
+from models import User, generate_id
+from repositories.note_ids import to_db_id
+
+INSERT_BATCH = 1000
+
+
+def seed_user(db: DatabaseManager, count: int, body_bytes: int) -> User:
+    user_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    body = ("export memory check " * (body_bytes // 20 + 1))[:body_bytes]
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO users (user_id, user_name, user_email, password_hash) VALUES (%s, %s, %s, %s)",
+                (user_id, "export check", f"export-{user_id}@example.com", "x")
+            )
+    for start in range(0, count, INSERT_BATCH):
+        note_ids = [to_db_id(generate_id()) for _ in range(min(INSERT_BATCH, count - start))]
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(
+                    "INSERT INTO notes (note_id, user_id, note_title, created_at) VALUES (%s, %s, %s, %s)",
+                    [
+                        (note_id, user_id, f"title {start + i}", now - timedelta(seconds=count - start - i))
+                        for i, note_id in enumerate(note_ids)
+                    ]
+                )
+                cursor.executemany(
+                    "INSERT INTO note_bodies (note_id, note_content) VALUES (%s, %s)",
+                    [(note_id, body) for note_id in note_ids]
+                )
+    return User(
+        user_id=user_id, user_name="export check", user_email=f"export-{user_id}@example.com", password="x"
+    )
+
+
+def remove_user(db: DatabaseManager, user: User):
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM users WHERE user_id = %s", (user.user_id,))
+
+
+def peak_of(run: Callable[[], int]):
+    """Run and return (result, peak traced bytes above the starting point)."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        result = run()
+        return result, tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def export_size(user: User, gzip: bool) -> int:
+    return sum(len(chunk) for chunk in note_service.export_notes(user, gzip))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that GET /notes/export memory does not grow with the account")
+    parser.add_argument("--small", type=int, default=1000)
+    parser.add_argument("--large", type=int, default=50000)
+    parser.add_argument("--body-bytes", type=int, default=2000)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed large/small peak ratio")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    db.initialize_database()
+    print(f"Seeding {args.small} and {args.large} notes with {args.body_bytes}-byte bodies...")
+    small = seed_user(db, args.small, args.body_bytes)
+    large = seed_user(db, args.large, args.body_bytes)
+
+    failures = []
+    try:
+        print("\n" + "=" * 70)
+        print("  EXPORT MEMORY CHECK")
+        print("=" * 70)
+        for gzip in (False, True):
+            label = "ndjson.gz" if gzip else "ndjson"
+            peaks = {}
+            for name, user, count in (("small", small, args.small), ("large", large, args.large)):
+                size, peaks[name] = peak_of(lambda: export_size(user, gzip))
+                print(f"  export {label:<10} {count:>8} notes  {size / 1024 / 1024:9.1f}MB sent  "
+                      f"peak {peaks[name] / 1024 / 1024:7.2f}MB")
+            ratio = peaks["large"] / max(peaks["small"], 1)
+            if ratio > args.tolerance:
+                failures.append(f"{label}: peak grew {ratio:.1f}x from {args.small} to {args.large} notes")
+
+        _, list_peak = peak_of(lambda: len(note_service.get_user_notes(large)))
+        print(f"  get_user_notes    {args.large:>8} notes  (full list)       peak {list_peak / 1024 / 1024:7.2f}MB")
+    finally:
+        remove_user(db, small)
+        remove_user(db, large)
+        db.close_pool()
+
+    for failure in failures:
+        print(f"  FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print("Export memory stays flat with the number of notes")
+
+
+if __name__ == "__main__":
+    main()
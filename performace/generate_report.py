@@ -3,6 +3,18 @@ import sys
 from datetime import datetime
 import os
 
+TEST_NAMES = {
+    'health_endpoint': 'Health Endpoint Performance',
+    'user_signup': 'User Signup Performance',
+    'user_signin': 'User Signin Performance',
+    'concurrent_signin': 'Concurrent Signin Performance',
+    'notes_create': 'Notes Creation Performance',
+    'notes_bulk_create': 'Bulk Notes Creation Performance',
+    'notes_read': 'Notes Read Performance',
+    'notes_pagination': 'Notes Pagination Performance',
+    'concurrent_requests': 'Concurrent Requests Performance'
+}
+
 def load_results(filename):
     with open(filename, 'r') as f:
         return json.load(f)
@@ -224,7 +236,7 @@ def generate_html_report(results, output_file):
 """
     
     # Calculate overall statistics
-    all_tests = ['health_endpoint', 'user_signup', 'user_signin', 'notes_create', 'notes_read', 'concurrent_requests']
+    all_tests = [test for test in TEST_NAMES if test in results]
     total_requests = sum(results.get(test, {}).get('total_requests', 0) for test in all_tests)
     total_successful = sum(results.get(test, {}).get('successful_requests', 0) for test in all_tests)
     avg_response_times = [results.get(test, {}).get('avg_response_time', 0) for test in all_tests if results.get(test, {}).get('avg_response_time', 0) > 0]
@@ -254,14 +266,7 @@ def generate_html_report(results, output_file):
 """
     
     # Test sections
-    test_names = {
-        'health_endpoint': 'Health Endpoint Performance',
-        'user_signup': 'User Signup Performance',
-        'user_signin': 'User Signin Performance',
-        'notes_create': 'Notes Creation Performance',
-        'notes_read': 'Notes Read Performance',
-        'concurrent_requests': 'Concurrent Requests Performance'
-    }
+    test_names = TEST_NAMES
     
     for test_key, test_name in test_names.items():
         if test_key not in results:
@@ -396,7 +401,7 @@ def generate_markdown_report(results, output_file):
 """
     
     # Calculate overall statistics
-    all_tests = ['health_endpoint', 'user_signup', 'user_signin', 'notes_create', 'notes_read', 'concurrent_requests']
+    all_tests = [test for test in TEST_NAMES if test in results]
     total_requests = sum(results.get(test, {}).get('total_requests', 0) for test in all_tests)
     total_successful = sum(results.get(test, {}).get('successful_requests', 0) for test in all_tests)
     avg_response_times = [results.get(test, {}).get('avg_response_time', 0) for test in all_tests if results.get(test, {}).get('avg_response_time', 0) > 0]
@@ -416,14 +421,7 @@ def generate_markdown_report(results, output_file):
 """
     
     # Test sections
-    test_names = {
-        'health_endpoint': 'Health Endpoint Performance',
-        'user_signup': 'User Signup Performance',
-        'user_signin': 'User Signin Performance',
-        'notes_create': 'Notes Creation Performance',
-        'notes_read': 'Notes Read Performance',
-        'concurrent_requests': 'Concurrent Requests Performance'
-    }
+    test_names = TEST_NAMES
     
     for test_key, test_name in test_names.items():
         if test_key not in results:
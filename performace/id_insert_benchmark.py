@@ -0,0 +1,133 @@
+"""
+Note ID insert benchmark: random VARCHAR(36) UUIDv4 keys vs. time-ordered BINARY(16) UUIDv7 keys.
+
+Inserts --rows rows into two temporary tables shaped like notes (primary
+key plus the (user_id, created_at, note_id) secondary index) in batched
+multi-row INSERTs. Random v4 keys land all over the clustered index, so
+once it outgrows the buffer pool most inserts read and split a page; v7
+keys only ever append to the right-most page. Prints rows/s for every
+--report-every rows, so the decay of the v4 table is visible, and the final
+data and index sizes.
+
+Needs MySQL (configured through the usual DB_* environment variables). The
+default of 20 million rows per layout takes a while and several GB of disk:
+    python id_insert_benchmark.py [--rows 20000000] [--batch-size 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+from models import generate_id
+
+LAYOUTS = {
+    "varchar-v4": ("VARCHAR(36)", lambda: str(uuid.uuid4())),
+    "binary-v7": ("BINARY(16)", lambda: uuid.UUID(generate_id()).bytes),
+}
+USERS = 1000
+
+
+def create_table(db: DatabaseManager, table: str, id_type: str):
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(f"""
+                CREATE TABLE {table} (
+                    note_id {id_type} PRIMARY KEY,
+                    user_id VARCHAR(36) NOT NULL,
+                    note_title VARCHAR(255) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_user_created (user_id, created_at, note_id)
+                )
+            """)
+
+
+def table_size(db: DatabaseManager, table: str):
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"ANALYZE TABLE {table}")
+            cursor.fetchall()
+            cursor.execute(
+                """
+                SELECT data_length AS data_length, index_length AS index_length
+                FROM information_schema.tables
+                WHERE table_schema = DATABASE() AND table_name = %s
+                """,
+                (table,)
+            )
+            result = cursor.fetchone()
+            return result['data_length'], result['index_length']
+
+
+def run(db: DatabaseManager, label: str, args: argparse.Namespace):
+    id_type, new_id = LAYOUTS[label]
+    table = f"bench_ids_{label.replace('-', '_')}"
+    create_table(db, table, id_type)
+    rng = random.Random(42)
+    users = [str(uuid.uuid4()) for _ in range(USERS)]
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    print(f"\n  {label} ({id_type} primary key)")
+    inserted = interval_rows = 0
+    start = interval_start = time.perf_counter()
+    try:
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                while inserted < args.rows:
+                    count = min(args.batch_size, args.rows - inserted)
+                    cursor.executemany(
+                        f"INSERT INTO {table} (note_id, user_id, note_title, created_at) VALUES (%s, %s, %s, %s)",
+                        [
+                            (new_id(), rng.choice(users), f"title {inserted + i}",
+                             now + timedelta(milliseconds=inserted + i))
+                            for i in range(count)
+                        ]
+                    )
+                    conn.commit()
+                    inserted += count
+                    interval_rows += count
+                    if inserted % args.report_every < count or inserted == args.rows:
+                        elapsed = time.perf_counter() - interval_start
+                        print(f"    {inserted:>12,} rows  {interval_rows / max(elapsed, 1e-9):>10,.0f} rows/s")
+                        interval_start, interval_rows = time.perf_counter(), 0
+        total = time.perf_counter() - start
+        data, index = table_size(db, table)
+        print(f"    total {total:.0f}s, {args.rows / total:,.0f} rows/s overall; "
+              f"data {data / 1024 / 1024:,.0f}MB, secondary indexes {index / 1024 / 1024:,.0f}MB")
+    finally:
+        if not args.keep:
+            with db.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare insert throughput of UUIDv4 and UUIDv7 note keys")
+    parser.add_argument("--rows", type=int, default=20_000_000, help="rows per layout")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per INSERT and commit")
+    parser.add_argument("--report-every", type=int, default=1_000_000)
+    parser.add_argument("--layout", choices=list(LAYOUTS), action="append", help="run only these layouts")
+    parser.add_argument("--keep", action="store_true", help="keep the tables for inspection")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    print("\n" + "=" * 70)
+    print("  NOTE ID INSERT BENCHMARK")
+    print("=" * 70)
+    print(f"{args.rows:,} rows per layout in batches of {args.batch_size}")
+    try:
+        for label in args.layout or LAYOUTS:
+            run(db, label, args)
+    finally:
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
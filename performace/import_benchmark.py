@@ -0,0 +1,108 @@
+"""
+Bulk import benchmark for POST /notes/import.
+
+Generates --notes notes as NDJSON on the fly and uploads them in one
+chunked request (plain or gzip-compressed, compressed as it is sent), so
+the client never holds the whole upload either. Reports the server's
+ingest rate and counts next to the client's end-to-end rate, and for
+comparison the rate of creating --single notes one POST /notes at a time.
+
+Needs the server running:
+    uvicorn main:app --port 8000
+    python import_benchmark.py --notes 200000 --body-bytes 1000 [--gzip]
+"""
+
+import argparse
+import json
+import random
+import time
+import zlib
+from typing import Iterator
+
+import requests
+
+from performance_test import BASE_URL, setup_test_user
+
+WORDS = "note import batch insert commit stream line json gzip row index page buffer".split()
+
+
+def note_lines(count: int, body_bytes: int, invalid_every: int, rng: random.Random) -> Iterator[bytes]:
+    for i in range(count):
+        if invalid_every and i % invalid_every == invalid_every - 1:
+            yield b'{"note_title": 1}\n'
+            continue
+        words = []
+        while sum(map(len, words)) + len(words) < body_bytes:
+            words.append(rng.choice(WORDS))
+        yield json.dumps({"note_title": f"imported {i}", "note_content": " ".join(words)}).encode() + b"\n"
+
+
+def upload_body(lines: Iterator[bytes], gzip: bool, chunk_lines: int = 500) -> Iterator[bytes]:
+    """Group lines into chunks, gzip-compressing them as they are produced when asked."""
+    compressor = zlib.compressobj(wbits=31) if gzip else None
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            data = b"".join(chunk)
+            chunk = []
+            yield compressor.compress(data) if compressor else data
+    data = b"".join(chunk)
+    if compressor:
+        yield compressor.compress(data) + compressor.flush()
+    elif data:
+        yield data
+
+
+def single_rate(session: requests.Session, count: int, body_bytes: int) -> float:
+    rng = random.Random(7)
+    start = time.perf_counter()
+    for line in note_lines(count, body_bytes, 0, rng):
+        session.post(f"{BASE_URL}/notes/", data=line, headers={"Content-Type": "application/json"}, timeout=30)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure POST /notes/import ingest speed")
+    parser.add_argument("--notes", type=int, default=200000)
+    parser.add_argument("--body-bytes", type=int, default=1000)
+    parser.add_argument("--gzip", action="store_true", help="upload a gzip-compressed body")
+    parser.add_argument("--invalid-every", type=int, default=0, help="make every Nth line invalid (0 = none)")
+    parser.add_argument("--single", type=int, default=500, help="notes to create one by one for comparison")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.headers["Authorization"] = f"Bearer {setup_test_user()}"
+
+    print("\n" + "=" * 70)
+    print("  NOTE IMPORT BENCHMARK")
+    print("=" * 70)
+    print(f"{args.notes} notes with {args.body_bytes}-byte bodies, {'gzip' if args.gzip else 'plain'} NDJSON\n")
+
+    lines = note_lines(args.notes, args.body_bytes, args.invalid_every, random.Random(42))
+    start = time.perf_counter()
+    response = session.post(
+        f"{BASE_URL}/notes/import",
+        data=upload_body(lines, args.gzip),
+        headers={"Content-Type": "application/x-ndjson"},
+        timeout=3600
+    )
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    result = response.json()
+
+    print(f"  imported {result['imported']} of {result['lines']} lines in {result['batches']} batches "
+          f"({result['failed']} failed, complete={result['complete']})")
+    print(f"  server   {result['rows_per_second']:10.0f} rows/s over {result['seconds']:.1f}s")
+    print(f"  client   {result['imported'] / elapsed:10.0f} rows/s over {elapsed:.1f}s end to end")
+    for error in result['errors'][:5]:
+        print(f"    line {error['line']}: {error['error']}")
+
+    if args.single:
+        rate = single_rate(session, args.single, args.body_bytes)
+        print(f"  POST /notes one by one: {rate:10.0f} rows/s ({args.single} notes)")
+        print(f"  import speedup: {result['imported'] / elapsed / rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
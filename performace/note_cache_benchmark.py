@@ -0,0 +1,106 @@
+"""
+Note response cache benchmark.
+
+Compares producing a GET /notes body from repository rows (build Note,
+convert to NoteResponse, serialize) with serving the pre-serialized bytes
+from ByteSizeCache, and shows memory accounting and eviction when many
+users' lists compete for a small cache.
+
+Runs without MySQL or a server:
+    python note_cache_benchmark.py [--notes 200] [--iterations 500]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Note, User
+from services.cache import ByteSizeCache
+from services.note_service import NoteService
+
+
+class RowRepository:
+    """Stands in for NoteRepository: rebuilds Note objects from row dicts on every call."""
+
+    def __init__(self, rows: List[dict]):
+        self.rows = rows
+
+    def get_by_user_id(self, user_id, query=None) -> List[Note]:
+        return [
+            Note(
+                note_id=row['note_id'], user_id=row['user_id'], note_title=row['note_title'],
+                note_content=row['note_content'], created_on=row['created_at'], last_update=row['updated_at']
+            )
+            for row in self.rows
+        ]
+
+    def get_list_meta(self, user_id):
+        return self.rows[0]['updated_at'], None
+
+    def in_shared_transaction(self) -> bool:
+        return False
+
+
+def build_rows(user_id: str, count: int) -> List[dict]:
+    now = datetime.now()
+    return [
+        {
+            'note_id': f"{user_id}-note-{i:05d}", 'user_id': user_id, 'note_title': f"Note {i}",
+            'note_content': "Lorem ipsum dolor sit amet. " * 20, 'created_at': now, 'updated_at': now,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(func, iterations: int) -> Dict:
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    ordered = sorted(latencies)
+    return {'avg_ms': statistics.mean(ordered), 'p99_ms': ordered[int(len(ordered) * 0.99)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cached and uncached GET /notes bodies")
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    user = User.model_construct(user_id="bench-user")
+    repository = RowRepository(build_rows(user.user_id, args.notes))
+    uncached = NoteService(repository)
+    cached = NoteService(repository, cache=ByteSizeCache(max_bytes=64 * 1024 * 1024, ttl_seconds=300))
+
+    print("\n" + "=" * 70)
+    print("  NOTE RESPONSE CACHE BENCHMARK")
+    print("=" * 70)
+    print(f"List of {args.notes} notes, {args.iterations} iterations\n")
+
+    miss = measure(lambda: uncached.get_notes_json(user), args.iterations)
+    hit = measure(lambda: cached.get_notes_json(user), args.iterations)
+    print(f"  {'rebuild + serialize':<22} avg {miss['avg_ms']:8.3f}ms  p99 {miss['p99_ms']:8.3f}ms")
+    print(f"  {'cache hit':<22} avg {hit['avg_ms']:8.3f}ms  p99 {hit['p99_ms']:8.3f}ms")
+    print(f"  Speedup: {miss['avg_ms'] / hit['avg_ms']:.0f}x")
+    print(f"  Stats: {cached.cache.stats()}")
+
+    # Many users competing for a cache that holds only part of their lists
+    body_size = len(uncached.get_notes_json(user)[1])
+    small = ByteSizeCache(max_bytes=body_size * 10, ttl_seconds=300, max_entry_bytes=body_size * 2)
+    service = NoteService(repository, cache=small)
+    for i in range(50):
+        service.get_notes_json(User.model_construct(user_id=f"user-{i % 20}"))
+    stats = small.stats()
+    print(f"\nBounded by size: {stats['entries']} entries, {stats['bytes']} of {stats['max_bytes']} bytes, "
+          f"{stats['evictions']} evictions, hit rate {stats['hit_rate']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
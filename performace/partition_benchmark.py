@@ -0,0 +1,173 @@
+"""
+Vertical partitioning benchmark: narrow notes + note_bodies vs. one wide table.
+
+Seeds one user with --notes notes twice: into the split schema (notes and
+note_bodies, as the app uses it) and into a temporary wide table that keeps
+the body inline like the old schema. Then times the metadata-only work that
+should not touch bodies on both layouts:
+
+  - ownership checks (user_id, version by primary key, random notes)
+  - listing a page of titles and timestamps in created_at order
+  - scanning every note's metadata for the user (e.g. a full sync of ids)
+
+and reports latency plus InnoDB buffer pool page requests per operation.
+
+Needs MySQL (configured through the usual DB_* environment variables):
+    python partition_benchmark.py --notes 100000 --body-bytes 4000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+from models import generate_id
+from repositories.note_ids import to_db_id
+
+WIDE_TABLE = "bench_notes_wide"
+INSERT_BATCH = 1000
+
+
+def seed(db: DatabaseManager, count: int, body_bytes: int) -> Tuple[str, List[bytes]]:
+    user_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    body = ("lorem ipsum dolor sit amet " * (body_bytes // 27 + 1))[:body_bytes]
+    note_ids = [to_db_id(generate_id()) for _ in range(count)]
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO users (user_id, user_name, user_email, password_hash) VALUES (%s, %s, %s, %s)",
+                (user_id, "partition bench", f"partition-{user_id}@example.com", "x")
+            )
+            cursor.execute(f"DROP TABLE IF EXISTS {WIDE_TABLE}")
+            cursor.execute(f"""
+                CREATE TABLE {WIDE_TABLE} (
+                    note_id BINARY(16) PRIMARY KEY,
+                    user_id VARCHAR(36) NOT NULL,
+                    note_title VARCHAR(255) NOT NULL,
+                    note_content MEDIUMTEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP(6) DEFAULT CURRENT_TIMESTAMP(6),
+                    version INT NOT NULL DEFAULT 1,
+                    INDEX idx_user_created (user_id, created_at, note_id)
+                )
+            """)
+    for start in range(0, count, INSERT_BATCH):
+        rows = [
+            (note_id, user_id, f"title {start + i}", now - timedelta(seconds=start + i))
+            for i, note_id in enumerate(note_ids[start:start + INSERT_BATCH])
+        ]
+        with db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(
+                    "INSERT INTO notes (note_id, user_id, note_title, created_at) VALUES (%s, %s, %s, %s)", rows
+                )
+                cursor.executemany(
+                    "INSERT INTO note_bodies (note_id, note_content) VALUES (%s, %s)",
+                    [(row[0], body) for row in rows]
+                )
+                cursor.executemany(
+                    f"INSERT INTO {WIDE_TABLE} (note_id, user_id, note_title, created_at, note_content) "
+                    f"VALUES (%s, %s, %s, %s, %s)",
+                    [(*row, body) for row in rows]
+                )
+        print(f"  Seeded {min(start + INSERT_BATCH, count)}/{count}")
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"ANALYZE TABLE notes, note_bodies, {WIDE_TABLE}")
+            cursor.fetchall()
+    return user_id, note_ids
+
+
+def cleanup(db: DatabaseManager, user_id: str):
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {WIDE_TABLE}")
+            cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
+
+
+def measure(db: DatabaseManager, run: Callable, iterations: int) -> Dict:
+    latencies = []
+    with db.get_connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Innodb_buffer_pool_read_requests'")
+            before = int(cursor.fetchone()['Value'])
+            for i in range(iterations):
+                start = time.perf_counter()
+                run(cursor, i)
+                cursor.fetchall()
+                latencies.append((time.perf_counter() - start) * 1000)
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Innodb_buffer_pool_read_requests'")
+            after = int(cursor.fetchone()['Value'])
+    ordered = sorted(latencies)
+    return {
+        'avg_ms': statistics.mean(ordered),
+        'p99_ms': ordered[int(len(ordered) * 0.99)],
+        'pages': (after - before) / iterations,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare metadata queries on split and wide note tables")
+    parser.add_argument("--notes", type=int, default=100000)
+    parser.add_argument("--body-bytes", type=int, default=4000)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--scans", type=int, default=5, help="iterations of the full metadata scan")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    db.initialize_database()
+    print(f"Seeding {args.notes} notes with {args.body_bytes}-byte bodies...")
+    user_id, note_ids = seed(db, args.notes, args.body_bytes)
+    rng = random.Random(42)
+    sample = [rng.choice(note_ids) for _ in range(args.iterations)]
+
+    cases = {
+        "ownership check": (
+            args.iterations,
+            lambda table: lambda cursor, i: cursor.execute(
+                f"SELECT user_id, version FROM {table} WHERE note_id = %s", (sample[i],)
+            ),
+        ),
+        "list page (50)": (
+            args.iterations,
+            lambda table: lambda cursor, i: cursor.execute(
+                f"SELECT note_id, note_title, created_at, updated_at FROM {table} "
+                f"WHERE user_id = %s ORDER BY created_at DESC, note_id DESC LIMIT 50 OFFSET %s",
+                (user_id, (i * 50) % max(args.notes - 50, 1))
+            ),
+        ),
+        "metadata scan": (
+            args.scans,
+            lambda table: lambda cursor, i: cursor.execute(
+                f"SELECT note_id, note_title, updated_at, version FROM {table} WHERE user_id = %s",
+                (user_id,)
+            ),
+        ),
+    }
+
+    try:
+        print("\n" + "=" * 70)
+        print("  VERTICAL PARTITIONING")
+        print("=" * 70)
+        print(f"{args.notes} notes for one user, {args.body_bytes}-byte bodies\n")
+        for label, (iterations, query) in cases.items():
+            for layout, table in (("split", "notes"), ("wide", WIDE_TABLE)):
+                stats = measure(db, query(table), iterations)
+                print(f"  {label:<16} {layout:<6} avg {stats['avg_ms']:9.2f}ms  p99 {stats['p99_ms']:9.2f}ms  "
+                      f"{stats['pages']:10.0f} page requests")
+    finally:
+        cleanup(db, user_id)
+        db.close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+PATCH vs PUT benchmark for small edits to large notes.
+
+Creates notes of 100KB and more, then makes the same sequence of
+single-character edits to each twice: once with PUT /notes/{id} carrying the
+whole new content, once with PATCH /notes/{id} carrying an insert/delete
+edit script. Reports request payload size and latency per edit, and checks
+that both paths end with the same content.
+
+Needs the server running:
+    uvicorn main:app --port 8000
+    python patch_benchmark.py --sizes 100,250,1000 --edits 50
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import requests
+
+from performance_test import BASE_URL, setup_test_user
+
+
+def plan_edits(length: int, count: int, rng: random.Random) -> List[Tuple[int, str]]:
+    """Single-character replacements at random positions: (position, new character)."""
+    return [(rng.randrange(length), rng.choice("abcdefghijklmnopqrstuvwxyz")) for _ in range(count)]
+
+
+def run_mode(session: requests.Session, content: str, edits: List[Tuple[int, str]], use_patch: bool) -> Dict:
+    note = session.post(
+        f"{BASE_URL}/notes/", json={"note_title": "patch benchmark", "note_content": content}, timeout=60
+    ).json()
+    note_url = f"{BASE_URL}/notes/{note['note_id']}"
+    version = note["version"]
+    payload_bytes: List[int] = []
+    latencies: List[float] = []
+    errors = 0
+    for position, character in edits:
+        content = content[:position] + character + content[position + 1:]
+        if use_patch:
+            body = {"version": version, "edits": [
+                {"op": "insert", "pos": position, "text": character},
+                {"op": "delete", "pos": position, "length": 1},
+            ]}
+        else:
+            body = {"version": version, "note_content": content}
+        data = json.dumps(body).encode()
+        start = time.perf_counter()
+        response = session.request(
+            "PATCH" if use_patch else "PUT", note_url, data=data,
+            headers={"Content-Type": "application/json"}, timeout=60
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        payload_bytes.append(len(data))
+        if response.status_code != 200:
+            errors += 1
+            continue
+        version = response.json()["version"]
+
+    final = session.get(note_url, timeout=60).json()["note_content"]
+    session.delete(note_url, timeout=60)
+    ordered = sorted(latencies)
+    return {
+        "payload_bytes": statistics.mean(payload_bytes),
+        "avg_ms": statistics.mean(ordered),
+        "p99_ms": ordered[int(len(ordered) * 0.99)],
+        "errors": errors,
+        "matches": final == content,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,250,1000", help="note sizes in KB, comma separated")
+    parser.add_argument("--edits", type=int, default=50, help="edits per note and mode")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    session.headers.update({"Authorization": f"Bearer {setup_test_user()}"})
+    rng = random.Random(42)
+
+    print("\n" + "=" * 70)
+    print("  PATCH VS PUT FOR SMALL EDITS TO LARGE NOTES")
+    print("=" * 70)
+    print(f"{args.edits} single-character edits per note\n")
+
+    failed = False
+    for size_kb in (int(size) for size in args.sizes.split(",")):
+        content = "".join(rng.choice("abcdefghij \n") for _ in range(size_kb * 1024))
+        edits = plan_edits(len(content), args.edits, rng)
+        results = {
+            "PUT": run_mode(session, content, edits, use_patch=False),
+            "PATCH": run_mode(session, content, edits, use_patch=True),
+        }
+        print(f"{size_kb}KB note:")
+        for label, stats in results.items():
+            print(f"  {label:<6} payload {stats['payload_bytes']:10.0f}B  avg {stats['avg_ms']:8.2f}ms  "
+                  f"p99 {stats['p99_ms']:8.2f}ms  errors {stats['errors']}  "
+                  f"content {'ok' if stats['matches'] else 'MISMATCH'}")
+            failed = failed or stats["errors"] > 0 or not stats["matches"]
+        put, patch = results["PUT"], results["PATCH"]
+        print(f"  PATCH sends {put['payload_bytes'] / patch['payload_bytes']:.0f}x fewer bytes, "
+              f"{put['avg_ms'] / patch['avg_ms']:.1f}x faster on average\n")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -159,6 +159,41 @@ def test_auth_signin(num_requests: int = 100) -> PerformanceMetrics:
     metrics.end_time = time.time()
     return metrics
 
+def test_concurrent_signin(num_concurrent: int = 20, requests_per_thread: int = 5) -> PerformanceMetrics:
+    print(f"\nTesting Concurrent Signin ({num_concurrent} threads, {requests_per_thread} requests each)...")
+    
+    # Create test user first
+    timestamp = int(time.time())
+    signup_data = {
+        "user_name": "SigninStorm User",
+        "user_email": f"signinstorm{timestamp}@example.com",
+        "password": "testpass123"
+    }
+    requests.post(f"{BASE_URL}/auth/signup", json=signup_data)
+    
+    signin_data = {
+        "user_email": signup_data["user_email"],
+        "password": signup_data["password"]
+    }
+    
+    metrics = PerformanceMetrics()
+    metrics.start_time = time.time()
+    
+    def worker(thread_id):
+        return [
+            make_request(f"{BASE_URL}/auth/signin", method="POST", json_data=signin_data)
+            for _ in range(requests_per_thread)
+        ]
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_concurrent) as executor:
+        futures = [executor.submit(worker, i) for i in range(num_concurrent)]
+        for future in concurrent.futures.as_completed(futures):
+            for response_time, status_code, error in future.result():
+                metrics.add_result(response_time, status_code, error)
+    
+    metrics.end_time = time.time()
+    return metrics
+
 def test_notes_create(num_requests: int = 100, token: str = None) -> PerformanceMetrics:
     print(f"\nTesting Notes Creation ({num_requests} requests)...")
     
@@ -187,6 +222,53 @@ def test_notes_create(num_requests: int = 100, token: str = None) -> Performance
     metrics.end_time = time.time()
     return metrics
 
+def test_notes_bulk_create(num_requests: int = 10, batch_size: int = 100, token: str = None) -> PerformanceMetrics:
+    print(f"\nTesting Bulk Notes Creation ({num_requests} requests of {batch_size} notes)...")
+    
+    if not token:
+        token = setup_test_user()
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    metrics = PerformanceMetrics()
+    metrics.start_time = time.time()
+    
+    for i in range(num_requests):
+        batch = [
+            {
+                "note_title": f"Bulk Test Note {i}-{j}",
+                "note_content": f"This is bulk note {j} of batch {i} created for performance testing."
+            }
+            for j in range(batch_size)
+        ]
+        response_time, status_code, error = make_request(
+            f"{BASE_URL}/notes/bulk",
+            method="POST",
+            headers=headers,
+            json_data=batch
+        )
+        metrics.add_result(response_time, status_code, error)
+    
+    metrics.end_time = time.time()
+    return metrics
+
+def compare_bulk_and_single_create(single: PerformanceMetrics, bulk: PerformanceMetrics, batch_size: int) -> Dict:
+    single_stats = single.get_stats()
+    bulk_stats = bulk.get_stats()
+    single_per_note = single_stats.get('avg_response_time', 0)
+    bulk_per_note = bulk_stats.get('avg_response_time', 0) / batch_size if batch_size else 0
+    comparison = {
+        'batch_size': batch_size,
+        'single_ms_per_note': single_per_note,
+        'bulk_ms_per_note': bulk_per_note,
+        'speedup': single_per_note / bulk_per_note if bulk_per_note > 0 else 0
+    }
+    
+    print(f"\nBulk vs Single Create ({batch_size} notes per bulk request):")
+    print(f"  Single create:       {single_per_note:.2f} ms/note")
+    print(f"  Bulk create:         {bulk_per_note:.2f} ms/note")
+    print(f"  Speedup:             {comparison['speedup']:.1f}x")
+    return comparison
+
 def test_notes_read(num_requests: int = 100, token: str = None) -> PerformanceMetrics:
     print(f"\nTesting Notes Read ({num_requests} requests)...")
     
@@ -219,6 +301,40 @@ def test_notes_read(num_requests: int = 100, token: str = None) -> PerformanceMe
     metrics.end_time = time.time()
     return metrics
 
+def test_notes_pagination(page_size: int = 20, token: str = None) -> PerformanceMetrics:
+    print(f"\nTesting Notes Pagination (page size {page_size}, walking every page)...")
+    
+    if not token:
+        token = setup_test_user()
+    
+    headers = {"Authorization": f"Bearer {token}"}
+    metrics = PerformanceMetrics()
+    metrics.start_time = time.time()
+    
+    cursor = None
+    page = 0
+    while True:
+        url = f"{BASE_URL}/notes?limit={page_size}"
+        if cursor:
+            url += f"&cursor={cursor}"
+        start = time.time()
+        try:
+            response = requests.get(url, headers=headers, timeout=30)
+            metrics.add_result((time.time() - start) * 1000, response.status_code)
+            cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+        except Exception as e:
+            metrics.add_result(0, 0, str(e))
+            cursor = None
+        page += 1
+        if not cursor:
+            break
+    
+    metrics.end_time = time.time()
+    if len(metrics.response_times) > 1:
+        print(f"  Pages: {page}, first page: {metrics.response_times[0]:.2f}ms, "
+              f"last page: {metrics.response_times[-1]:.2f}ms")
+    return metrics
+
 def test_concurrent_requests(num_concurrent: int = 20, requests_per_thread: int = 10) -> PerformanceMetrics:
     print(f"\nTesting Concurrent Requests ({num_concurrent} threads, {requests_per_thread} requests each)...")
     
@@ -333,14 +449,27 @@ def main():
     print_stats("User Signin Performance", metrics_signin)
     results['user_signin'] = metrics_signin.get_stats()
     
+    metrics_signin_concurrent = test_concurrent_signin(20, 5)
+    print_stats("Concurrent Signin Performance", metrics_signin_concurrent)
+    results['concurrent_signin'] = metrics_signin_concurrent.get_stats()
+    
     metrics_create = test_notes_create(100, token)
     print_stats("Notes Creation Performance", metrics_create)
     results['notes_create'] = metrics_create.get_stats()
     
+    metrics_bulk = test_notes_bulk_create(10, 100, token)
+    print_stats("Bulk Notes Creation Performance", metrics_bulk)
+    results['notes_bulk_create'] = metrics_bulk.get_stats()
+    results['bulk_vs_single_create'] = compare_bulk_and_single_create(metrics_create, metrics_bulk, 100)
+    
     metrics_read = test_notes_read(100, token)
     print_stats("Notes Read Performance", metrics_read)
     results['notes_read'] = metrics_read.get_stats()
     
+    metrics_paginate = test_notes_pagination(20, token)
+    print_stats("Notes Pagination Performance", metrics_paginate)
+    results['notes_pagination'] = metrics_paginate.get_stats()
+    
     metrics_concurrent = test_concurrent_requests(20, 10)
     print_stats("Concurrent Requests Performance", metrics_concurrent)
     results['concurrent_requests'] = metrics_concurrent.get_stats()
@@ -352,8 +481,13 @@ def main():
         'health_requests': 100,
         'signup_requests': 50,
         'signin_requests': 100,
+        'concurrent_signin_threads': 20,
+        'concurrent_signin_requests_per_thread': 5,
         'notes_create_requests': 100,
+        'bulk_create_requests': 10,
+        'bulk_create_batch_size': 100,
         'notes_read_requests': 100,
+        'pagination_page_size': 20,
         'concurrent_threads': 20,
         'requests_per_thread': 10
     }
@@ -0,0 +1,138 @@
+"""
+Idle push-connection capacity benchmark for GET /notes/events.
+
+Opens many Server-Sent Events streams against one running worker, holds
+them idle, and reports how many the worker accepted, its memory per open
+stream (when the worker PID is given) and how long one note change takes
+to reach every stream.
+
+Needs the server running (single worker, so all streams land in one process):
+    uvicorn main:app --port 8000
+    python push_connections_benchmark.py --connections 2000 --server-pid <pid>
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from performance_test import BASE_URL, setup_test_user
+
+
+def read_rss_kb(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def raise_fd_limit(needed: int):
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+
+async def open_stream(host: str, port: int, token: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET /notes/events HTTP/1.1\r\nHost: {host}\r\n"
+        f"Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n".encode()
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    if b" 200 " not in status_line:
+        writer.close()
+        raise ConnectionError(status_line.decode(errors="replace").strip())
+    await reader.readuntil(b": connected\n\n")
+    return reader, writer
+
+
+async def wait_for_event(reader: asyncio.StreamReader, note_id: str) -> float:
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("stream closed")
+        if line.startswith(b"data: ") and note_id in line.decode():
+            return time.perf_counter()
+
+
+async def run(connections: int, hold_seconds: float, server_pid: Optional[int]):
+    url = urlparse(BASE_URL)
+    host, port = url.hostname, url.port or 80
+    token = setup_test_user()
+    headers = {"Authorization": f"Bearer {token}"}
+    raise_fd_limit(connections + 256)
+
+    rss_before = read_rss_kb(server_pid) if server_pid else None
+    streams: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+    failures = []
+    start = time.perf_counter()
+    for batch_start in range(0, connections, 100):
+        batch = [open_stream(host, port, token) for _ in range(min(100, connections - batch_start))]
+        for result in await asyncio.gather(*batch, return_exceptions=True):
+            if isinstance(result, Exception):
+                failures.append(repr(result))
+            else:
+                streams.append(result)
+        print(f"  Progress: {len(streams)}/{connections} open")
+    open_seconds = time.perf_counter() - start
+
+    await asyncio.sleep(hold_seconds)
+    rss_after = read_rss_kb(server_pid) if server_pid else None
+    health = requests.get(f"{BASE_URL}/health", timeout=30).json()
+
+    # One change, fanned out to every open stream
+    fanout_seconds = None
+    if streams:
+        note = requests.post(
+            f"{BASE_URL}/notes/", headers=headers,
+            json={"note_title": "push", "note_content": "fan-out"}, timeout=30
+        ).json()
+        sent = time.perf_counter()
+        waiters = [wait_for_event(reader, note["note_id"]) for reader, _ in streams]
+        arrivals = await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), 60)
+        received = [arrival for arrival in arrivals if isinstance(arrival, float)]
+        fanout_seconds = (max(received) - sent) if received else None
+        requests.delete(f"{BASE_URL}/notes/{note['note_id']}", headers=headers, timeout=30)
+
+    for _, writer in streams:
+        writer.close()
+
+    print("\n" + "=" * 70)
+    print("  IDLE PUSH CONNECTIONS")
+    print("=" * 70)
+    print(f"Requested streams:        {connections}")
+    print(f"Open streams:             {len(streams)} ({len(failures)} failed) in {open_seconds:.2f}s")
+    print(f"Worker reports:           {json.dumps(health.get('change_notifier', {}))}")
+    if rss_before is not None and rss_after is not None and streams:
+        per_stream = (rss_after - rss_before) / len(streams)
+        print(f"Worker RSS:               {rss_before / 1024:.1f}MB -> {rss_after / 1024:.1f}MB "
+              f"({per_stream:.1f}KB per stream)")
+    if fanout_seconds is not None:
+        print(f"Fan-out of one change:    {fanout_seconds * 1000:.1f}ms to reach all streams")
+    if failures:
+        print(f"First failures:           {failures[:3]}")
+    sys.exit(0 if not failures else 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--hold", type=float, default=5.0, help="seconds to keep the streams idle")
+    parser.add_argument("--server-pid", type=int, default=None, help="worker PID to sample RSS from")
+    args = parser.parse_args()
+    asyncio.run(run(args.connections, args.hold, args.server_pid))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Search backend benchmark.
+
+Builds a synthetic corpus for one user and compares query latency of the
+pure-Python inverted index (InMemoryNoteSearchRepository) against the
+client-side approach it replaces: scanning every note for the words.
+Also reports index build time.
+
+Runs without MySQL or a server:
+    python search_benchmark.py [--notes 20000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Note
+from repositories.note_search_repository import InMemoryNoteSearchRepository, tokenize
+
+VOCABULARY_SIZE = 5000
+WORDS_PER_NOTE = 120
+PAGE_SIZE = 20
+
+
+def build_corpus(count: int, rng: random.Random) -> List[Note]:
+    vocabulary = [f"word{i}" for i in range(VOCABULARY_SIZE)]
+    # Zipf-like weights so some words are common and most are rare
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    now = datetime.now()
+    return [
+        Note(
+            note_id=f"note-{i:07d}",
+            user_id="bench-user",
+            note_title=" ".join(rng.choices(vocabulary, weights, k=4)),
+            note_content=" ".join(rng.choices(vocabulary, weights, k=WORDS_PER_NOTE)),
+            created_on=now,
+            last_update=now,
+        )
+        for i in range(count)
+    ]
+
+
+def scan_search(notes: List[Note], query: str) -> List[Note]:
+    terms = tokenize(query)
+    matches = []
+    for note in notes:
+        text = f"{note.note_title} {note.note_content}".lower()
+        hits = sum(text.count(term) for term in terms)
+        if hits:
+            matches.append((hits, note))
+    matches.sort(key=lambda item: -item[0])
+    return [note for _, note in matches[:PAGE_SIZE]]
+
+
+def summarize(latencies: List[float]) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        'avg_ms': statistics.mean(ordered),
+        'p50_ms': ordered[int(len(ordered) * 0.50)],
+        'p99_ms': ordered[int(len(ordered) * 0.99)],
+    }
+
+
+def time_queries(search, queries: List[str]) -> Dict:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inverted-index search with a full scan")
+    parser.add_argument("--notes", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    notes = build_corpus(args.notes, rng)
+    queries = [
+        " ".join(f"word{rng.randrange(VOCABULARY_SIZE)}" for _ in range(rng.randint(1, 3)))
+        for _ in range(args.queries)
+    ]
+
+    print("\n" + "=" * 70)
+    print("  SEARCH BACKEND BENCHMARK")
+    print("=" * 70)
+    print(f"{args.notes} notes x {WORDS_PER_NOTE} words, {args.queries} queries, page size {PAGE_SIZE}\n")
+
+    repository = InMemoryNoteSearchRepository(loader=lambda user_id: notes)
+    start = time.perf_counter()
+    repository.search("bench-user", "warmup", 1)
+    build_seconds = time.perf_counter() - start
+    print(f"Inverted index build: {build_seconds:.2f}s ({args.notes / build_seconds:.0f} notes/s)")
+
+    results = {
+        "inverted index": time_queries(lambda q: repository.search("bench-user", q, PAGE_SIZE), queries),
+        "full scan": time_queries(lambda q: scan_search(notes, q), queries),
+    }
+    for label, stats in results.items():
+        print(f"  {label:<16} avg {stats['avg_ms']:8.2f}ms  p50 {stats['p50_ms']:8.2f}ms  "
+              f"p99 {stats['p99_ms']:8.2f}ms")
+
+    speedup = results["full scan"]['avg_ms'] / results["inverted index"]['avg_ms']
+    print(f"\nInverted index is {speedup:.1f}x faster than scanning every note")
+
+
+if __name__ == "__main__":
+    main()
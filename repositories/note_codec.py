@@ -0,0 +1,71 @@
+"""At-rest compression of large note bodies."""
+
+import lzma
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+# Format marker (first byte of a stored blob) -> (compress, decompress)
+_CODECS: Dict[bytes, Tuple[Callable[[bytes, int], bytes], Callable[[bytes], bytes]]] = {
+    b"z": (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    b"x": (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+_MARKERS = {"zlib": b"z", "lzma": b"x"}
+_DEFAULT_LEVELS = {"zlib": 6, "lzma": 1}
+
+
+class NoteContentCodec:
+    """
+    Decide how a note body is stored and turn stored columns back into text.
+
+    Bodies of at least min_bytes (UTF-8) are compressed with the configured
+    algorithm into compressed_content, whose first byte marks the format, and
+    note_content keeps only a plain prefix of prefix_chars characters for
+    snippets and FULLTEXT. Rows with no compressed_content are plain, so rows
+    written before compression was enabled, or under another algorithm, are
+    always readable.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = "none",
+        min_bytes: int = 8192,
+        prefix_chars: int = 2000,
+        level: Optional[int] = None
+    ):
+        if algorithm != "none" and algorithm not in _MARKERS:
+            raise ValueError(f"Unknown note compression algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.min_bytes = min_bytes
+        self.prefix_chars = prefix_chars
+        self.level = _DEFAULT_LEVELS.get(algorithm, 0) if level is None else level
+
+    @property
+    def enabled(self) -> bool:
+        return self.algorithm != "none"
+
+    def encode(self, content: Optional[str]) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Return the (note_content, compressed_content) column values for content.
+
+        Content below the threshold, or that does not get smaller, is stored plain.
+        """
+        if not self.enabled or content is None:
+            return content, None
+        data = content.encode("utf-8")
+        if len(data) < self.min_bytes:
+            return content, None
+        marker = _MARKERS[self.algorithm]
+        compressed = marker + _CODECS[marker][0](data, self.level)
+        if len(compressed) >= len(data):
+            return content, None
+        return content[:self.prefix_chars], compressed
+
+    def decode(self, content: Optional[str], compressed: Optional[bytes]) -> Optional[str]:
+        """Return the full note body from its stored columns."""
+        if compressed is None:
+            return content
+        marker = bytes(compressed[:1])
+        codec = _CODECS.get(marker)
+        if codec is None:
+            raise ValueError(f"Unknown note body format marker: {marker!r}")
+        return codec[1](bytes(compressed[1:])).decode("utf-8")
@@ -0,0 +1,52 @@
+"""
+Conversion between canonical UUID strings and the stored note_id values.
+
+note_id is BINARY(16) on new databases and after migrate.py binary-ids
+--finish; databases upgraded from the VARCHAR(36) schema keep the string
+form until then. The encoding follows DatabaseManager.binary_note_ids,
+which initialize_database reads from the notes table.
+"""
+
+import uuid
+from typing import Iterable, List, Optional, Union
+
+from database import DatabaseManager
+
+DbId = Union[bytes, str]
+
+
+def to_db_id(note_id: str) -> Optional[DbId]:
+    """
+    Return the stored form of a note ID, or None if it is not a UUID.
+
+    None matches no row, so a malformed ID from a request behaves like an
+    unknown one. Byte order equals the order of the canonical strings, so
+    keyset cursors keep their meaning in either form.
+    """
+    try:
+        value = uuid.UUID(note_id)
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return value.bytes if DatabaseManager().binary_note_ids else str(value)
+
+
+def to_db_ids(note_ids: Iterable[str]) -> List[Optional[DbId]]:
+    """Convert several note IDs with to_db_id."""
+    return [to_db_id(note_id) for note_id in note_ids]
+
+
+def from_db_id(value: DbId) -> str:
+    """Return the canonical string form of a stored note ID."""
+    if isinstance(value, str):
+        return value
+    return str(uuid.UUID(bytes=bytes(value)))
+
+
+def to_db_position(note_id: str) -> DbId:
+    """
+    Convert the note_id half of a keyset position for comparison with note_id.
+
+    The empty ID that starts a scan (and any malformed one) becomes the empty
+    value, which sorts before every stored ID.
+    """
+    return to_db_id(note_id) or (b"" if DatabaseManager().binary_note_ids else "")
@@ -1,104 +1,719 @@
 """Note repository for database operations related to notes."""
 
-from typing import List, Optional
-from models import Note
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+from pymysql.cursors import SSDictCursor
+from models import Note, NoteListQuery, NoteSummary
 from database import DatabaseManager
+from repositories.note_codec import NoteContentCodec
+from repositories.note_ids import from_db_id, to_db_id, to_db_ids, to_db_position
+
+# Metadata lives in notes, bodies in note_bodies (one row per note, same note_id)
+_NOTE_COLUMNS = (
+    "notes.note_id, user_id, note_title, note_bodies.note_content, note_bodies.compressed_content, "
+    "created_at, updated_at, version"
+)
+_SUMMARY_COLUMNS = (
+    "notes.note_id, user_id, note_title, LEFT(note_bodies.note_content, %s) AS note_snippet, "
+    "created_at, updated_at"
+)
+_BODY_JOIN = "LEFT JOIN note_bodies ON note_bodies.note_id = notes.note_id"
+
+# sort field -> (column, index on (user_id, column, note_id))
+_SORT_COLUMNS = {
+    "created_at": ("created_at", "idx_user_created"),
+    "updated_at": ("updated_at", "idx_user_updated"),
+    "title": ("note_title", "idx_user_title"),
+}
+
+# NoteListQuery field -> (column, operator); ranges are [from, to)
+_DATE_FILTERS = (
+    ("created_from", "created_at", ">="),
+    ("created_to", "created_at", "<"),
+    ("updated_from", "updated_at", ">="),
+    ("updated_to", "updated_at", "<"),
+)
+
+
+def _stored_size(content: Optional[str], compressed: Optional[bytes]) -> int:
+    """Bytes a note body occupies in its two columns."""
+    return len((content or "").encode("utf-8")) + len(compressed or b"")
 
 
 class NoteRepository:
     """Repository class handling note-related database operations."""
     
-    def __init__(self):
-        """Initialize repository with database manager."""
+    def __init__(self, codec: Optional[NoteContentCodec] = None):
+        """
+        Initialize repository with database manager.
+        
+        codec decides which note bodies are stored compressed; bodies are
+        only decompressed when a full note is built from a row.
+        """
         self.db = DatabaseManager()
+        self.codec = codec or NoteContentCodec()
     
     def get_by_id(self, note_id: str) -> Optional[Note]:
         """Retrieve a note by its ID."""
         with self.db.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(
-                    """
-                    SELECT note_id, user_id, note_title, note_content, 
-                           created_at, updated_at 
-                    FROM notes 
-                    WHERE note_id = %s
-                    """,
-                    (note_id,)
+                    f"SELECT {_NOTE_COLUMNS} FROM notes {_BODY_JOIN} WHERE notes.note_id = %s",
+                    (to_db_id(note_id),)
                 )
                 result = cursor.fetchone()
                 
                 if result:
-                    return Note(
-                        note_id=result['note_id'],
-                        user_id=result['user_id'],
-                        note_title=result['note_title'],
-                        note_content=result['note_content'],
-                        created_on=result['created_at'],
-                        last_update=result['updated_at']
-                    )
+                    return self._to_note(result)
         return None
     
-    def get_by_user_id(self, user_id: str) -> List[Note]:
-        """Retrieve all notes belonging to a specific user."""
-        notes = []
+    def get_by_user_id(self, user_id: str, query: Optional[NoteListQuery] = None) -> List[Note]:
+        """Retrieve all notes belonging to a specific user, newest first unless query says otherwise."""
+        sql, params = self.build_list_query(user_id, query, _NOTE_COLUMNS)
         with self.db.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(
-                    """
-                    SELECT note_id, user_id, note_title, note_content, 
-                           created_at, updated_at 
-                    FROM notes 
-                    WHERE user_id = %s 
-                    ORDER BY created_at DESC
-                    """,
-                    (user_id,)
-                )
-                results = cursor.fetchall()
-                
-                for result in results:
-                    notes.append(Note(
-                        note_id=result['note_id'],
+                cursor.execute(sql, params)
+                return [self._to_note(result) for result in cursor.fetchall()]
+    
+    def stream_by_user_id(
+        self,
+        user_id: str,
+        batch_size: int,
+        query: Optional[NoteListQuery] = None
+    ) -> Iterator[List[Note]]:
+        """
+        Yield all of a user's notes in batches of at most batch_size.
+        
+        Rows are read through an unbuffered server-side cursor, so only one
+        batch is held in memory however many notes the user has. The
+        connection stays checked out until the generator is exhausted or
+        closed; closing it early reads and discards the remaining rows.
+        """
+        sql, params = self.build_list_query(user_id, query, _NOTE_COLUMNS)
+        with self.db.get_connection() as conn:
+            with conn.cursor(SSDictCursor) as cursor:
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    try:
+                        yield [self._to_note(result) for result in rows]
+                    except GeneratorExit:
+                        # Closed early: leave the blocks normally so the connection
+                        # ends its transaction and goes back to the pool clean
+                        return
+    
+    def get_page_by_user_id(
+        self,
+        user_id: str,
+        limit: int,
+        after: Optional[Tuple[Any, str]] = None,
+        query: Optional[NoteListQuery] = None
+    ) -> List[Note]:
+        """
+        Retrieve one page of a user's notes using keyset pagination.
+        
+        Args:
+            user_id: Owner of the notes
+            limit: Maximum number of notes to return
+            after: (sort value, note_id) of the last note on the previous page
+            query: Sort order and date filters (default: newest first)
+        """
+        sql, params = self.build_list_query(user_id, query, _NOTE_COLUMNS, limit, after)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return [self._to_note(result) for result in cursor.fetchall()]
+    
+    def get_summaries_by_user_id(
+        self,
+        user_id: str,
+        snippet_length: int,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[Any, str]] = None,
+        query: Optional[NoteListQuery] = None
+    ) -> List[NoteSummary]:
+        """
+        Retrieve a user's notes without their full content.
+        
+        Only a snippet of at most snippet_length characters is computed in
+        SQL, so large note bodies never leave MySQL.
+        
+        Args:
+            user_id: Owner of the notes
+            snippet_length: Maximum snippet length in characters
+            limit: Maximum number of notes to return (None for all)
+            after: (sort value, note_id) of the last note on the previous page
+            query: Sort order and date filters (default: newest first)
+        """
+        sql, params = self.build_list_query(
+            user_id, query, _SUMMARY_COLUMNS, limit, after, (snippet_length,)
+        )
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return [
+                    NoteSummary(
+                        note_id=from_db_id(result['note_id']),
                         user_id=result['user_id'],
                         note_title=result['note_title'],
-                        note_content=result['note_content'],
+                        note_snippet=result['note_snippet'] or "",
                         created_on=result['created_at'],
                         last_update=result['updated_at']
-                    ))
-        return notes
+                    )
+                    for result in cursor.fetchall()
+                ]
+    
+    def build_list_query(
+        self,
+        user_id: str,
+        query: Optional[NoteListQuery],
+        columns: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[Any, str]] = None,
+        column_params: tuple = ()
+    ) -> Tuple[str, tuple]:
+        """
+        Compile a list query into parameterized SQL.
+        
+        Every sort field has a (user_id, <sort column>, note_id) index, which
+        is forced so the rows are read in index order: no filesort, and date
+        filters on the other column are applied while walking the index.
+        Bodies are joined by primary key only for the rows returned.
+        
+        Returns:
+            The SQL text and its parameters
+        """
+        query = query or NoteListQuery()
+        column, index = _SORT_COLUMNS[query.sort]
+        descending = query.direction == "desc"
+        
+        conditions = ["user_id = %s"]
+        params = [*column_params, user_id]
+        for field, column_name, operator in _DATE_FILTERS:
+            value = getattr(query, field)
+            if value is not None:
+                conditions.append(f"{column_name} {operator} %s")
+                params.append(value)
+        if after is not None:
+            seek = "<" if descending else ">"
+            conditions.append(f"({column} {seek} %s OR ({column} = %s AND notes.note_id {seek} %s))")
+            params.extend([after[0], after[0], to_db_position(after[1])])
+        
+        order = "DESC" if descending else "ASC"
+        sql = (
+            f"SELECT {columns} FROM notes FORCE INDEX ({index}) {_BODY_JOIN} "
+            f"WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {column} {order}, notes.note_id {order}"
+        )
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit)
+        return sql, tuple(params)
     
     def create(self, note: Note) -> Note:
         """Create a new note in the database."""
         with self.db.get_connection() as conn:
             with conn.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO notes (note_id, user_id, note_title) VALUES (%s, %s, %s)",
+                    (to_db_id(note.note_id), note.user_id, note.note_title)
+                )
                 cursor.execute(
                     """
-                    INSERT INTO notes (note_id, user_id, note_title, note_content) 
-                    VALUES (%s, %s, %s, %s)
+                    INSERT INTO note_bodies (note_id, note_content, compressed_content) 
+                    VALUES (%s, %s, %s)
                     """,
-                    (note.note_id, note.user_id, note.note_title, note.note_content)
+                    (to_db_id(note.note_id), *self.codec.encode(note.note_content))
                 )
         return note
     
+    def create_many(self, notes: List[Note]) -> List[Note]:
+        """Insert several notes with one multi-row INSERT per table in a single transaction."""
+        if not notes:
+            return notes
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.executemany(
+                    "INSERT INTO notes (note_id, user_id, note_title) VALUES (%s, %s, %s)",
+                    [(to_db_id(note.note_id), note.user_id, note.note_title) for note in notes]
+                )
+                cursor.executemany(
+                    """
+                    INSERT INTO note_bodies (note_id, note_content, compressed_content) 
+                    VALUES (%s, %s, %s)
+                    """,
+                    [(to_db_id(note.note_id), *self.codec.encode(note.note_content)) for note in notes]
+                )
+        return notes
+    
     def update(self, note_id: str, title: str, content: str) -> None:
         """Update an existing note's title and content."""
         with self.db.get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(
                     """
-                    UPDATE notes 
-                    SET note_title = %s, note_content = %s 
-                    WHERE note_id = %s
+                    UPDATE notes JOIN note_bodies ON note_bodies.note_id = notes.note_id 
+                    SET note_title = %s, note_bodies.note_content = %s, note_bodies.compressed_content = %s, 
+                        version = version + 1 
+                    WHERE notes.note_id = %s
                     """,
-                    (title, content, note_id)
+                    (title, *self.codec.encode(content), to_db_id(note_id))
                 )
     
     def delete(self, note_id: str) -> None:
         """Delete a note from the database."""
         with self.db.get_connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("DELETE FROM notes WHERE note_id = %s", (note_id,))
+                cursor.execute(
+                    """
+                    INSERT INTO note_tombstones (note_id, user_id) 
+                    SELECT note_id, user_id FROM notes WHERE note_id = %s 
+                    ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6)
+                    """,
+                    (to_db_id(note_id),)
+                )
+                cursor.execute("DELETE FROM notes WHERE note_id = %s", (to_db_id(note_id),))
+    
+    def update_for_user(
+        self,
+        note_id: str,
+        user_id: str,
+        title: Optional[str],
+        content: Optional[str],
+        expected_versions: Optional[List[int]] = None
+    ) -> Optional[Note]:
+        """
+        Update a note owned by the given user and return the updated note.
+        
+        Fields passed as None are left unchanged and the version is bumped.
+        Returns None when no note with this ID belongs to the user, or when
+        expected_versions is given and the note's version is none of them;
+        the check and the write are one statement, so no lock is held
+        between reading and updating. The body row is only touched when
+        content is given.
+        """
+        condition, condition_params = self._version_condition(expected_versions)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                if content is None:
+                    cursor.execute(
+                        f"""
+                        UPDATE notes 
+                        SET note_title = COALESCE(%s, note_title), version = version + 1 
+                        WHERE note_id = %s AND user_id = %s {condition}
+                        """,
+                        (title, to_db_id(note_id), user_id, *condition_params)
+                    )
+                else:
+                    cursor.execute(
+                        f"""
+                        UPDATE notes JOIN note_bodies ON note_bodies.note_id = notes.note_id 
+                        SET note_title = COALESCE(%s, note_title), 
+                            note_bodies.note_content = %s, note_bodies.compressed_content = %s, 
+                            version = version + 1 
+                        WHERE notes.note_id = %s AND user_id = %s {condition}
+                        """,
+                        (title, *self.codec.encode(content), to_db_id(note_id), user_id, *condition_params)
+                    )
+                if cursor.rowcount == 0:
+                    return None
+                
+                cursor.execute(
+                    f"SELECT {_NOTE_COLUMNS} FROM notes {_BODY_JOIN} WHERE notes.note_id = %s",
+                    (to_db_id(note_id),)
+                )
+                return self._to_note(cursor.fetchone())
+    
+    def patch_for_user(
+        self,
+        note_id: str,
+        user_id: str,
+        base_version: int,
+        title: Optional[str],
+        edits: List[Tuple[int, int, str]]
+    ) -> Optional[Note]:
+        """
+        Apply an edit script to a note's content inside MySQL and return the updated note.
+        
+        edits are (position, delete_length, insert_text) triples in character
+        offsets of the base version, sorted and non-overlapping. The new
+        content is assembled by one CONCAT over slices of the stored value,
+        so the note body never travels to the application; compressed bodies
+        are instead decoded, edited and re-encoded here. Returns None when
+        the note does not belong to the user, is no longer at base_version,
+        or is shorter than the edits reach.
+        """
+        content = "COALESCE(note_bodies.note_content, '')"
+        parts, params = [], []
+        offset = 0
+        for position, length, text in edits:
+            parts.append(f"SUBSTRING({content}, %s, %s)")
+            params.extend((offset + 1, position - offset))
+            parts.append("%s")
+            params.append(text)
+            offset = position + length
+        parts.append(f"SUBSTRING({content}, %s)")
+        params.append(offset + 1)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    UPDATE notes JOIN note_bodies ON note_bodies.note_id = notes.note_id 
+                    SET note_bodies.note_content = CONCAT({", ".join(parts)}), 
+                        note_title = COALESCE(%s, note_title), 
+                        version = version + 1 
+                    WHERE notes.note_id = %s AND user_id = %s AND version = %s 
+                      AND note_bodies.compressed_content IS NULL AND CHAR_LENGTH({content}) >= %s
+                    """,
+                    (*params, title, to_db_id(note_id), user_id, base_version, offset)
+                )
+                if cursor.rowcount == 0 and not self._patch_compressed(
+                    cursor, note_id, user_id, base_version, title, edits, offset
+                ):
+                    return None
+                
+                cursor.execute(
+                    f"SELECT {_NOTE_COLUMNS} FROM notes {_BODY_JOIN} WHERE notes.note_id = %s",
+                    (to_db_id(note_id),)
+                )
+                result = cursor.fetchone()
+                note = self._to_note(result)
+                if result['compressed_content'] is None:
+                    stored, compressed = self.codec.encode(note.note_content)
+                    if compressed is not None:
+                        # Grown past the compression threshold
+                        cursor.execute(
+                            """
+                            UPDATE note_bodies SET note_content = %s, compressed_content = %s 
+                            WHERE note_id = %s
+                            """,
+                            (stored, compressed, to_db_id(note_id))
+                        )
+                return note
+    
+    def delete_for_user(
+        self,
+        note_id: str,
+        user_id: str,
+        expected_versions: Optional[List[int]] = None
+    ) -> bool:
+        """
+        Delete a note owned by the given user; returns False if no such note was found.
+        
+        With expected_versions the note is only deleted if its version is one of them.
+        """
+        condition, condition_params = self._version_condition(expected_versions)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM notes WHERE note_id = %s AND user_id = %s {condition}",
+                    (to_db_id(note_id), user_id, *condition_params)
+                )
+                if cursor.rowcount == 0:
+                    return False
+                self._record_tombstones(cursor, [note_id], user_id)
+                return True
+    
+    def get_many_for_user(self, note_ids: List[str], user_id: str) -> List[Note]:
+        """Retrieve the notes among note_ids that belong to the given user, in one query."""
+        if not note_ids:
+            return []
+        placeholders = self._placeholders(note_ids)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT {_NOTE_COLUMNS} FROM notes {_BODY_JOIN} 
+                    WHERE notes.note_id IN ({placeholders}) AND user_id = %s
+                    """,
+                    (*to_db_ids(note_ids), user_id)
+                )
+                return [self._to_note(result) for result in cursor.fetchall()]
+    
+    def delete_many_for_user(self, note_ids: List[str], user_id: str) -> Set[str]:
+        """
+        Delete the notes among note_ids that belong to the given user.
+        
+        Returns the IDs that were deleted.
+        """
+        if not note_ids:
+            return set()
+        placeholders = self._placeholders(note_ids)
+        params = (*to_db_ids(note_ids), user_id)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT note_id FROM notes 
+                    WHERE note_id IN ({placeholders}) AND user_id = %s 
+                    FOR UPDATE
+                    """,
+                    params
+                )
+                deleted = {from_db_id(row['note_id']) for row in cursor.fetchall()}
+                if deleted:
+                    cursor.execute(
+                        f"DELETE FROM notes WHERE note_id IN ({placeholders}) AND user_id = %s",
+                        params
+                    )
+                    self._record_tombstones(cursor, list(deleted), user_id)
+        return deleted
+    
+    def get_changes_since(
+        self,
+        user_id: str,
+        after: Tuple[datetime, str],
+        settle_seconds: float,
+        limit: int
+    ) -> List[Note]:
+        """
+        Retrieve notes created or updated after a (updated_at, note_id) position.
+        
+        Changes younger than settle_seconds are left for the next call so
+        transactions that commit late cannot slip behind the watermark.
+        Results are ordered by (updated_at, note_id) ascending.
+        """
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT {_NOTE_COLUMNS} FROM notes {_BODY_JOIN} 
+                    WHERE user_id = %s 
+                      AND (updated_at > %s OR (updated_at = %s AND notes.note_id > %s)) 
+                      AND updated_at < NOW(6) - INTERVAL %s MICROSECOND 
+                    ORDER BY updated_at, notes.note_id 
+                    LIMIT %s
+                    """,
+                    (user_id, after[0], after[0], to_db_position(after[1]), int(settle_seconds * 1_000_000), limit)
+                )
+                return [self._to_note(result) for result in cursor.fetchall()]
+    
+    def get_deletions_since(
+        self,
+        user_id: str,
+        after: Tuple[datetime, str],
+        settle_seconds: float,
+        limit: int
+    ) -> List[Tuple[datetime, str]]:
+        """
+        Retrieve (deleted_at, note_id) of notes deleted after a position.
+        
+        Same settling and ordering rules as get_changes_since.
+        """
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT note_id, deleted_at 
+                    FROM note_tombstones 
+                    WHERE user_id = %s 
+                      AND (deleted_at > %s OR (deleted_at = %s AND note_id > %s)) 
+                      AND deleted_at < NOW(6) - INTERVAL %s MICROSECOND 
+                    ORDER BY deleted_at, note_id 
+                    LIMIT %s
+                    """,
+                    (user_id, after[0], after[0], to_db_position(after[1]), int(settle_seconds * 1_000_000), limit)
+                )
+                return [(row['deleted_at'], from_db_id(row['note_id'])) for row in cursor.fetchall()]
+    
+    def prune_tombstones(self, retention_days: int) -> int:
+        """Delete tombstones older than the retention period; returns the number removed."""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM note_tombstones WHERE deleted_at < NOW(6) - INTERVAL %s DAY",
+                    (retention_days,)
+                )
+                return cursor.rowcount
+    
+    def get_note_meta(self, note_id: str) -> Optional[Tuple[str, int]]:
+        """Return (user_id, version) of a note with a primary-key lookup, or None."""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT user_id, version FROM notes WHERE note_id = %s",
+                    (to_db_id(note_id),)
+                )
+                result = cursor.fetchone()
+                return (result['user_id'], result['version']) if result else None
+    
+    def get_list_meta(self, user_id: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Return the user's latest note update and latest deletion times.
+        
+        Both are read from the end of an index, so the cost does not grow
+        with the number of notes.
+        """
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT (SELECT MAX(updated_at) FROM notes WHERE user_id = %s) AS last_update,
+                           (SELECT MAX(deleted_at) FROM note_tombstones WHERE user_id = %s) AS last_delete
+                    """,
+                    (user_id, user_id)
+                )
+                result = cursor.fetchone()
+                return result['last_update'], result['last_delete']
+    
+    def find_existing_ids(self, note_ids: Iterable[str]) -> Set[str]:
+        """Return which of the given note IDs exist, regardless of owner."""
+        note_ids = list(note_ids)
+        if not note_ids:
+            return set()
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT note_id FROM notes WHERE note_id IN ({self._placeholders(note_ids)})",
+                    tuple(to_db_ids(note_ids))
+                )
+                return {from_db_id(row['note_id']) for row in cursor.fetchall()}
+    
+    def exists(self, note_id: str) -> bool:
+        """Check whether a note with the given ID exists."""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM notes WHERE note_id = %s", (to_db_id(note_id),))
+                return cursor.fetchone() is not None
     
     def belongs_to_user(self, note_id: str, user_id: str) -> bool:
-        """Check if a note belongs to a specific user."""
-        note = self.get_by_id(note_id)
-        return note is not None and note.user_id == user_id
+        """Check if a note belongs to a specific user, without reading its body."""
+        meta = self.get_note_meta(note_id)
+        return meta is not None and meta[0] == user_id
+    
+    def recode_bodies(self, after: str, limit: int) -> Tuple[Optional[str], dict]:
+        """
+        Re-store one batch of note bodies with the current codec, in note_id order.
+        
+        Used to compress rows written before compression was enabled (or to
+        switch algorithms, or to decompress with the "none" codec). Rows whose
+        storage already matches the codec are left alone, and the notes row
+        (version, updated_at) is not touched, since the content is the same. A row edited
+        concurrently is skipped; its writer already stored it with the codec.
+        
+        Returns the last note_id of the batch (None when there are no more
+        rows) and counts of rows scanned and rewritten and bytes before/after.
+        """
+        stats = {'scanned': 0, 'rewritten': 0, 'bytes_before': 0, 'bytes_after': 0}
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT note_bodies.note_id, note_bodies.note_content, note_bodies.compressed_content, version 
+                    FROM note_bodies JOIN notes ON notes.note_id = note_bodies.note_id 
+                    WHERE note_bodies.note_id > %s 
+                    ORDER BY note_bodies.note_id 
+                    LIMIT %s
+                    """,
+                    (to_db_position(after), limit)
+                )
+                rows = cursor.fetchall()
+                updates = []
+                for row in rows:
+                    current = (row['note_content'], row['compressed_content'])
+                    stored, compressed = self.codec.encode(self.codec.decode(*current))
+                    size = _stored_size(*current)
+                    stats['scanned'] += 1
+                    stats['bytes_before'] += size
+                    unchanged = (compressed is None) == (current[1] is None) and (
+                        compressed is None or bytes(current[1][:1]) == compressed[:1]
+                    )
+                    if unchanged:
+                        stats['bytes_after'] += size
+                        continue
+                    stats['bytes_after'] += _stored_size(stored, compressed)
+                    updates.append((stored, compressed, row['note_id'], row['version']))
+                if updates:
+                    cursor.executemany(
+                        """
+                        UPDATE note_bodies JOIN notes ON notes.note_id = note_bodies.note_id 
+                        SET note_bodies.note_content = %s, note_bodies.compressed_content = %s 
+                        WHERE note_bodies.note_id = %s AND version = %s
+                        """,
+                        updates
+                    )
+                    stats['rewritten'] = cursor.rowcount
+        return (from_db_id(rows[-1]['note_id']) if rows else None), stats
+    
+    def in_shared_transaction(self) -> bool:
+        """Whether queries run on a connection bound to an open multi-request transaction."""
+        return self.db.has_bound_connection()
+    
+    def _patch_compressed(
+        self,
+        cursor,
+        note_id: str,
+        user_id: str,
+        base_version: int,
+        title: Optional[str],
+        edits: List[Tuple[int, int, str]],
+        end: int
+    ) -> bool:
+        """Apply edits to a compressed body in Python; False if the row does not qualify."""
+        cursor.execute(
+            """
+            SELECT note_bodies.note_content, note_bodies.compressed_content 
+            FROM notes JOIN note_bodies ON note_bodies.note_id = notes.note_id 
+            WHERE notes.note_id = %s AND user_id = %s AND version = %s 
+              AND note_bodies.compressed_content IS NOT NULL 
+            FOR UPDATE
+            """,
+            (to_db_id(note_id), user_id, base_version)
+        )
+        result = cursor.fetchone()
+        if result is None:
+            return False
+        body = self.codec.decode(result['note_content'], result['compressed_content'])
+        if len(body) < end:
+            return False
+        pieces = []
+        offset = 0
+        for position, length, text in edits:
+            pieces.append(body[offset:position])
+            pieces.append(text)
+            offset = position + length
+        pieces.append(body[offset:])
+        cursor.execute(
+            """
+            UPDATE notes JOIN note_bodies ON note_bodies.note_id = notes.note_id 
+            SET note_bodies.note_content = %s, note_bodies.compressed_content = %s, 
+                note_title = COALESCE(%s, note_title), version = version + 1 
+            WHERE notes.note_id = %s
+            """,
+            (*self.codec.encode("".join(pieces)), title, to_db_id(note_id))
+        )
+        return True
+    
+    def _record_tombstones(self, cursor, note_ids: List[str], user_id: str) -> None:
+        """Record deletions in the same transaction as the DELETE."""
+        cursor.executemany(
+            """
+            INSERT INTO note_tombstones (note_id, user_id) VALUES (%s, %s) 
+            ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP(6)
+            """,
+            [(to_db_id(note_id), user_id) for note_id in note_ids]
+        )
+    
+    def _version_condition(self, expected: Optional[List[int]]) -> Tuple[str, tuple]:
+        """Build the optimistic-concurrency predicate for conditional writes."""
+        if expected is None:
+            return "", ()
+        return f"AND version IN ({self._placeholders(expected)})", tuple(expected)
+    
+    def _placeholders(self, values: List) -> str:
+        """Build a %s placeholder list for an IN clause."""
+        return ", ".join(["%s"] * len(values))
+    
+    def _to_note(self, result: dict) -> Note:
+        """Build a Note from a database row."""
+        return Note(
+            note_id=from_db_id(result['note_id']),
+            user_id=result['user_id'],
+            note_title=result['note_title'],
+            note_content=self.codec.decode(result['note_content'], result.get('compressed_content')) or "",
+            created_on=result['created_at'],
+            last_update=result['updated_at'],
+            version=result['version']
+        )
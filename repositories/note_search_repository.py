@@ -0,0 +1,303 @@
+"""Full-text search backends for notes."""
+
+import contextvars
+import functools
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models import Note
+from database import DatabaseManager
+from repositories.note_codec import NoteContentCodec
+from repositories.note_ids import from_db_id
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Index updates made inside a shared transaction wait here until it commits
+_held_mutations: contextvars.ContextVar[Optional[List[Callable[[], None]]]] = contextvars.ContextVar(
+    "held_search_mutations", default=None
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if len(token) > 1]
+
+
+def extract_snippet(text: str, terms: List[str], length: int) -> str:
+    """
+    Cut a window of about length characters around the first query term in text.
+
+    Falls back to the start of the text when no term occurs in it.
+    """
+    if len(text) <= length:
+        return text
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms]
+    positions = [position for position in positions if position >= 0]
+    if not positions:
+        return text[:length].rstrip() + "…"
+    start = max(0, min(positions) - length // 4)
+    end = min(len(text), start + length)
+    start = max(0, end - length)
+    return ("…" if start > 0 else "") + text[start:end].strip() + ("…" if end < len(text) else "")
+
+
+class NoteSearchRepository(ABC):
+    """
+    Interface for ranked, per-user note search.
+
+    search() returns (note, score) pairs ordered by descending relevance.
+    Backends that keep their own index are told about writes through
+    index_note() and remove_notes(); database-backed ones ignore them.
+    Between hold() and release() those updates are queued instead, so a
+    rolled-back transaction never reaches the index.
+    """
+
+    @abstractmethod
+    def search(self, user_id: str, query: str, limit: int, offset: int = 0) -> List[Tuple[Note, float]]:
+        """Return the user's best matches for query, best first."""
+
+    def index_note(self, note: Note) -> None:
+        """Add or replace a note in the index."""
+
+    def remove_notes(self, user_id: str, note_ids: List[str]) -> None:
+        """Drop notes from the index."""
+
+    def hold(self) -> contextvars.Token:
+        """Start holding index updates made in this context (e.g. an open transaction)."""
+        return _held_mutations.set([])
+
+    def release(self, token: contextvars.Token, apply: bool) -> None:
+        """Stop holding index updates and apply them if the transaction committed."""
+        held = _held_mutations.get() or []
+        _held_mutations.reset(token)
+        if apply:
+            for mutation in held:
+                mutation()
+
+
+class MySQLNoteSearchRepository(NoteSearchRepository):
+    """
+    Search backed by the FULLTEXT indexes on notes (note_title) and note_bodies (note_content).
+
+    The score is the sum of both relevances. For bodies stored compressed,
+    note_content holds only a plain prefix, so words past it are not
+    matched; snippets still come from the full body.
+    """
+
+    def __init__(self, codec: Optional[NoteContentCodec] = None):
+        """Initialize repository with database manager."""
+        self.db = DatabaseManager()
+        self.codec = codec or NoteContentCodec()
+
+    def build_search_query(self, user_id: str, query: str, limit: int, offset: int = 0) -> Tuple[str, tuple]:
+        """
+        Compile a search into parameterized SQL.
+
+        Each MATCH runs in its own subquery so it can be driven by its
+        table's FULLTEXT index (one MATCH OR'ed with another on a joined
+        table can use neither). The matches are combined with UNION ALL,
+        their scores summed per note and the page cut before notes and
+        bodies are joined back by primary key.
+
+        Returns:
+            The SQL text and its parameters
+        """
+        sql = """
+            SELECT notes.note_id, user_id, note_title,
+                   note_bodies.note_content, note_bodies.compressed_content,
+                   created_at, updated_at, version, ranked.score
+            FROM (
+                SELECT note_id, SUM(score) AS score
+                FROM (
+                    SELECT note_id, MATCH(note_title) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score
+                    FROM notes
+                    WHERE MATCH(note_title) AGAINST (%s IN NATURAL LANGUAGE MODE) AND user_id = %s
+                    UNION ALL
+                    SELECT note_bodies.note_id,
+                           MATCH(note_bodies.note_content) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score
+                    FROM note_bodies JOIN notes ON notes.note_id = note_bodies.note_id
+                    WHERE MATCH(note_bodies.note_content) AGAINST (%s IN NATURAL LANGUAGE MODE)
+                      AND notes.user_id = %s
+                ) AS matches
+                GROUP BY note_id
+                ORDER BY score DESC, note_id
+                LIMIT %s OFFSET %s
+            ) AS ranked
+            JOIN notes ON notes.note_id = ranked.note_id
+            JOIN note_bodies ON note_bodies.note_id = ranked.note_id
+            ORDER BY ranked.score DESC, ranked.note_id
+        """
+        return sql, (query, query, user_id, query, query, user_id, limit, offset)
+
+    def search(self, user_id: str, query: str, limit: int, offset: int = 0) -> List[Tuple[Note, float]]:
+        """Rank the user's notes with MATCH ... AGAINST in natural language mode."""
+        sql, params = self.build_search_query(user_id, query, limit, offset)
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(sql, params)
+                return [
+                    (
+                        Note(
+                            note_id=from_db_id(result['note_id']),
+                            user_id=result['user_id'],
+                            note_title=result['note_title'],
+                            note_content=self.codec.decode(
+                                result['note_content'], result['compressed_content']
+                            ),
+                            created_on=result['created_at'],
+                            last_update=result['updated_at'],
+                            version=result['version']
+                        ),
+                        float(result['score'])
+                    )
+                    for result in cursor.fetchall()
+                ]
+
+
+class _UserIndex:
+    """Inverted index over one user's notes."""
+
+    def __init__(self):
+        self.notes: Dict[str, Note] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.total_length = 0
+
+    def add(self, note: Note, title_weight: int) -> None:
+        self.remove(note.note_id)
+        terms = Counter(tokenize(note.note_content))
+        for term in tokenize(note.note_title):
+            terms[term] += title_weight
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[note.note_id] = frequency
+        length = sum(terms.values())
+        self.notes[note.note_id] = note
+        self.lengths[note.note_id] = length
+        self.total_length += length
+
+    def remove(self, note_id: str) -> None:
+        note = self.notes.pop(note_id, None)
+        if note is None:
+            return
+        for term in set(tokenize(note.note_title)) | set(tokenize(note.note_content)):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(note_id, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= self.lengths.pop(note_id)
+
+    def score(self, terms: List[str], k1: float = 1.2, b: float = 0.75) -> Dict[str, float]:
+        """Okapi BM25 score of every note containing at least one term."""
+        count = len(self.notes)
+        if not count:
+            return {}
+        average_length = self.total_length / count or 1
+        scores: Dict[str, float] = {}
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for note_id, frequency in postings.items():
+                norm = k1 * (1 - b + b * self.lengths[note_id] / average_length)
+                scores[note_id] = scores.get(note_id, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+        return scores
+
+
+class InMemoryNoteSearchRepository(NoteSearchRepository):
+    """
+    Pure-Python inverted index with BM25 ranking, kept per user in process memory.
+
+    A user's index is built on their first search from loader (for example
+    NoteRepository.get_by_user_id) and kept current by index_note() and
+    remove_notes(). The loader runs outside the lock; updates that arrive
+    while it runs are replayed onto its result before it is swapped in.
+    Writes made by other processes are not seen, so use it with a single
+    worker, for non-MySQL storage or for benchmarking.
+    """
+
+    def __init__(self, loader: Optional[Callable[[str], List[Note]]] = None, title_weight: int = 2):
+        self.loader = loader
+        self.title_weight = title_weight
+        self._indexes: Dict[str, _UserIndex] = {}
+        # Updates queued for users whose index is being loaded, and how many loads are running
+        self._loading: Dict[str, List[Callable[[_UserIndex], None]]] = {}
+        self._loads: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def search(self, user_id: str, query: str, limit: int, offset: int = 0) -> List[Tuple[Note, float]]:
+        """Rank the user's notes by BM25 over title and content tokens."""
+        terms = tokenize(query)
+        with self._lock:
+            index = self._indexes.get(user_id)
+        if index is None:
+            index = self._load(user_id)
+        with self._lock:
+            scores = index.score(terms)
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            return [(index.notes[note_id], score) for note_id, score in ranked[offset:offset + limit]]
+
+    def index_note(self, note: Note) -> None:
+        """Add or replace a note in its owner's index once that index is loaded."""
+        self._mutate(note.user_id, lambda index: index.add(note, self.title_weight))
+
+    def remove_notes(self, user_id: str, note_ids: List[str]) -> None:
+        """Drop notes from their owner's index."""
+        def remove(index: _UserIndex) -> None:
+            for note_id in note_ids:
+                index.remove(note_id)
+        self._mutate(user_id, remove)
+
+    def _mutate(self, user_id: str, mutation: Callable[[_UserIndex], None]) -> None:
+        held = _held_mutations.get()
+        if held is not None:
+            held.append(functools.partial(self._apply, user_id, mutation))
+            return
+        self._apply(user_id, mutation)
+
+    def _apply(self, user_id: str, mutation: Callable[[_UserIndex], None]) -> None:
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None and user_id in self._loading:
+                self._loading[user_id].append(mutation)
+                return
+            if index is None and self.loader is None:
+                index = self._indexes[user_id] = _UserIndex()
+            if index is not None:
+                mutation(index)
+
+    def _load(self, user_id: str) -> _UserIndex:
+        """Build a user's index from the loader and swap it in, unless another load won."""
+        with self._lock:
+            self._loading.setdefault(user_id, [])
+            self._loads[user_id] = self._loads.get(user_id, 0) + 1
+        try:
+            loaded = _UserIndex()
+            if self.loader is not None:
+                for note in self.loader(user_id):
+                    loaded.add(note, self.title_weight)
+        except Exception:
+            with self._lock:
+                self._finish_load(user_id, None)
+            raise
+        with self._lock:
+            return self._finish_load(user_id, loaded)
+
+    def _finish_load(self, user_id: str, loaded: Optional[_UserIndex]) -> Optional[_UserIndex]:
+        """Replay queued updates onto a finished load and swap it in. Call with the lock held."""
+        self._loads[user_id] -= 1
+        if not self._loads[user_id]:
+            del self._loads[user_id]
+        if loaded is not None and user_id not in self._indexes:
+            for mutation in self._loading.get(user_id, []):
+                mutation(loaded)
+            self._indexes[user_id] = loaded
+        if user_id in self._indexes or user_id not in self._loads:
+            self._loading.pop(user_id, None)
+        return self._indexes.get(user_id)
@@ -19,7 +19,7 @@ class UserRepository:
                 cursor.execute(
                     """
                     SELECT user_id, user_name, user_email, password_hash, 
-                           created_at, updated_at 
+                           token_version, created_at, updated_at 
                     FROM users 
                     WHERE user_email = %s
                     """,
@@ -33,6 +33,7 @@ class UserRepository:
                         user_name=result['user_name'],
                         user_email=result['user_email'],
                         password=result['password_hash'],
+                        token_version=result['token_version'],
                         created_on=result['created_at'],
                         last_update=result['updated_at']
                     )
@@ -51,6 +52,32 @@ class UserRepository:
                 )
         return user
     
+    def get_token_version(self, user_id: str) -> Optional[int]:
+        """Retrieve the current token version of a user, or None if the user does not exist."""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT token_version FROM users WHERE user_id = %s",
+                    (user_id,)
+                )
+                result = cursor.fetchone()
+        return result['token_version'] if result else None
+    
+    def increment_token_version(self, user_id: str) -> Optional[int]:
+        """Invalidate all tokens issued to a user and return the new token version."""
+        with self.db.get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE users SET token_version = token_version + 1 WHERE user_id = %s",
+                    (user_id,)
+                )
+                cursor.execute(
+                    "SELECT token_version FROM users WHERE user_id = %s",
+                    (user_id,)
+                )
+                result = cursor.fetchone()
+        return result['token_version'] if result else None
+    
     def exists_by_email(self, email: str) -> bool:
         """Check if a user with the given email already exists."""
         user = self.get_by_email(email)
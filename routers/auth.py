@@ -5,9 +5,8 @@ from fastapi import APIRouter, HTTPException, Depends
 
 from models import UserCreate, UserLogin, Token, User
 from services.auth_service import AuthService
-from services.user_service import UserService
-from repositories.user_repository import UserRepository
-from dependencies import get_auth_service, get_user_service, get_current_user
+from services.async_user_service import AsyncUserService
+from dependencies import get_auth_service, get_async_user_service, get_current_user
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -16,7 +15,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/signup", summary="Create a new user account")
 async def signup(
     user_data: UserCreate,
-    user_service: UserService = Depends(get_user_service)
+    user_service: AsyncUserService = Depends(get_async_user_service)
 ):
     """
     Create a new user account with email and password.
@@ -25,14 +24,14 @@ async def signup(
     - **user_email**: The user's email address (must be unique)
     - **password**: The user's password (will be hashed before storage)
     """
-    return user_service.create_user(user_data)
+    return await user_service.create_user(user_data)
 
 
 @router.post("/signin", response_model=Token, summary="Sign in with email and password")
 async def signin(
     credentials: UserLogin,
     auth_service: AuthService = Depends(get_auth_service),
-    user_repo: UserRepository = Depends(lambda: UserRepository())
+    user_service: AsyncUserService = Depends(get_async_user_service)
 ):
     """
     Authenticate user and return access token.
@@ -42,7 +41,7 @@ async def signin(
     
     Returns a JWT access token that should be included in subsequent requests.
     """
-    user = auth_service.authenticate_user(credentials.user_email, credentials.password, user_repo)
+    user = await user_service.authenticate(credentials.user_email, credentials.password)
     
     if not user:
         raise HTTPException(
@@ -52,7 +51,7 @@ async def signin(
         )
     
     access_token = auth_service.create_jwt_token(
-        data={"sub": user.user_email},
+        data=auth_service.build_token_claims(user),
         expires_delta=timedelta(minutes=auth_service.access_token_expire_minutes)
     )
     
@@ -62,11 +61,29 @@ async def signin(
 @router.get("/me", summary="Get current user information")
 async def get_current_user_info(
     current_user: User = Depends(get_current_user),
-    user_service: UserService = Depends(get_user_service)
+    user_service: AsyncUserService = Depends(get_async_user_service)
 ):
     """
     Get information about the currently authenticated user.
     
     Requires a valid JWT token in the Authorization header.
     """
-    return user_service.get_user_info(current_user)
\ No newline at end of file
+    if current_user.created_on is None:
+        # Stateless tokens carry identity only; load the full profile
+        current_user = await user_service.get_user_by_email(current_user.user_email)
+        if current_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+    return user_service.get_user_info(current_user)
+
+
+@router.post("/revoke", summary="Revoke all access tokens of the current user")
+async def revoke_tokens(
+    current_user: User = Depends(get_current_user),
+    user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    """
+    Invalidate every access token issued to the current user, including the
+    one used for this request. Sign in again to obtain a new token.
+    """
+    await user_service.revoke_tokens(current_user)
+    return {"message": "Tokens revoked successfully"}
\ No newline at end of file
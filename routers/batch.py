@@ -0,0 +1,244 @@
+"""Batch route that executes many API operations in one HTTP call."""
+
+import asyncio
+import json
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from starlette.datastructures import Headers
+
+from config import settings
+from database import DatabaseManager
+from models import BatchOperation, BatchOperationResult, BatchRequest, BatchResponse, User
+from dependencies import change_notifier, db_executor, get_current_user, note_search_repository, note_service
+
+
+router = APIRouter(tags=["Batch"])
+db = DatabaseManager()
+
+# Routes whose request or response is a stream; they cannot run as a buffered
+# sub-request (an event stream would never finish and hold the batch open)
+_STREAMING_PATHS = {"/notes/events", "/notes/export", "/notes/import"}
+
+# Per-operation headers a sub-request may carry (conditional requests)
+_FORWARDED_HEADERS = {"if-match", "if-none-match"}
+
+
+@router.post("/batch", response_model=BatchResponse, summary="Execute several API calls at once")
+async def batch(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Execute an ordered list of sub-requests against the API in one round trip.
+
+    - **requests**: Up to `BATCH_MAX_REQUESTS` items of `{"method", "path", "body", "headers"}`,
+      e.g. `{"method": "PUT", "path": "/notes/<id>", "body": {"note_title": "New"},
+      "headers": {"If-Match": "\"v3\""}}`; `headers` may only hold `If-Match` and `If-None-Match`
+    - **atomic**: Run every sub-request in one database transaction. Execution
+      stops at the first sub-request with a status of 400 or above, which is
+      then rolled back; the remaining sub-requests are reported with status 424.
+
+    The caller is authenticated once for the whole batch. The streaming
+    endpoints (`/notes/events`, `/notes/export`, `/notes/import`) are
+    rejected with 400.
+    """
+    batch_request = await _read_batch_request(request)
+    operations = batch_request.requests
+    if len(operations) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} sub-requests are allowed per batch"
+        )
+    for operation in operations:
+        route = operation.path.split("?")[0].rstrip("/")
+        if not operation.path.startswith("/") or route == "/batch":
+            raise HTTPException(status_code=400, detail=f"Invalid sub-request path: {operation.path}")
+        if route in _STREAMING_PATHS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Streaming endpoints cannot be batched: {operation.path}"
+            )
+        unsupported = sorted(set(map(str.lower, operation.headers or {})) - _FORWARDED_HEADERS)
+        if unsupported:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported sub-request headers: {', '.join(unsupported)}"
+            )
+
+    if not batch_request.atomic:
+        results = [await _dispatch(request, operation, current_user) for operation in operations]
+        return BatchResponse(results=results, committed=True)
+
+    conn = await db_executor.run(db.pool.acquire)
+    token = db.bind_connection(conn)
+    held_events = change_notifier.hold()
+    held_index_updates = note_search_repository.hold()
+    discard = False
+    committed = False
+    try:
+        results = await _run_until_failure(request, operations, current_user)
+        committed = all(result.status < 400 for result in results)
+        try:
+            await db_executor.run(conn.commit if committed else conn.rollback)
+        except Exception:
+            discard = True
+            committed = False
+            raise
+    finally:
+        db.unbind_connection(token)
+        db.pool.release(conn, discard=discard)
+        # Responses read or invalidated mid-transaction may not match what was committed
+        note_service.invalidate_user_cache(current_user.user_id)
+        note_search_repository.release(held_index_updates, apply=committed)
+        change_notifier.release(held_events, deliver=committed)
+
+    return BatchResponse(results=results, committed=committed)
+
+
+async def _read_batch_request(request: Request) -> BatchRequest:
+    """
+    Read and validate the batch body, refusing it past BATCH_MAX_BODY_BYTES.
+
+    The limit is checked against Content-Length and again while the body
+    streams in, so an oversized batch is never buffered or parsed.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Batch body exceeds {settings.BATCH_MAX_BODY_BYTES} bytes"
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > settings.BATCH_MAX_BODY_BYTES:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > settings.BATCH_MAX_BODY_BYTES:
+            raise too_large
+    try:
+        return BatchRequest.model_validate_json(bytes(body))
+    except ValidationError as e:
+        # Same 422 shape FastAPI produces for a declared body parameter
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+
+async def _run_until_failure(
+    request: Request,
+    operations: List[BatchOperation],
+    user: User
+) -> List[BatchOperationResult]:
+    """Run sub-requests in order, skipping everything after the first failure."""
+    results = []
+    for operation in operations:
+        if results and results[-1].status >= 400:
+            results.append(BatchOperationResult(
+                status=424,
+                body={"detail": "Skipped after an earlier sub-request failed"}
+            ))
+            continue
+        results.append(await _dispatch(request, operation, user))
+    return results
+
+
+async def _dispatch(
+    request: Request,
+    operation: BatchOperation,
+    user: User,
+    redirects: int = 1
+) -> BatchOperationResult:
+    """Run one sub-request through the ASGI app in-process and capture its response."""
+    path, _, query = operation.path.partition("?")
+    body = b"" if operation.body is None else json.dumps(operation.body).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("ascii")),
+    ]
+    authorization = request.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+    for name, value in (operation.headers or {}).items():
+        headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": operation.method,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("utf-8"),
+        "headers": headers,
+        "state": {**request.scope.get("state", {}), "batch_user": user},
+    }
+
+    body_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    status = 500
+    response_headers = []
+    chunks = []
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # ServerErrorMiddleware re-raises after sending its 500 response
+        pass
+    finally:
+        disconnected.set()
+
+    response_headers = Headers(raw=response_headers)
+    location = response_headers.get("location")
+    if status in (307, 308) and location and redirects > 0:
+        # e.g. "/notes" -> "/notes/"; follow the app's own slash redirect once
+        redirected = BatchOperation(
+            method=operation.method,
+            path=_relative_location(location),
+            body=operation.body,
+            headers=operation.headers
+        )
+        return await _dispatch(request, redirected, user, redirects - 1)
+
+    return BatchOperationResult(status=status, body=_decode_body(b"".join(chunks), response_headers))
+
+
+def _relative_location(location: str) -> str:
+    """Strip scheme and host from a redirect location."""
+    if "://" in location:
+        location = "/" + location.split("://", 1)[1].partition("/")[2]
+    return location
+
+
+def _decode_body(raw: bytes, headers: Headers) -> Optional[object]:
+    """Decode a sub-response body as JSON when possible."""
+    if not raw:
+        return None
+    if "json" in headers.get("content-type", ""):
+        try:
+            return json.loads(raw)
+        except ValueError:
+            pass
+    return raw.decode("utf-8", errors="replace")
@@ -4,6 +4,9 @@ from datetime import datetime, timezone
 from fastapi import APIRouter
 
 from database import DatabaseManager
+from dependencies import (
+    auth_service, change_notifier, db_executor, note_cache, password_hasher, user_cache
+)
 
 
 router = APIRouter(tags=["Health"])
@@ -32,10 +35,17 @@ async def health_check():
     Checks database connectivity and returns overall system health status.
     Useful for load balancers and monitoring systems.
     """
-    db_status = "connected" if db.test_connection() else "disconnected"
+    db_status = "connected" if await db_executor.run(db.test_connection) else "disconnected"
     
     return {
         "status": "healthy",
         "database": db_status,
+        "database_pool": db.get_pool_stats(),
+        "database_executor": db_executor.stats(),
+        "password_hasher": password_hasher.stats(),
+        "user_cache": user_cache.stats(),
+        "token_cache": auth_service.token_cache.stats(),
+        "note_cache": note_cache.stats(),
+        "change_notifier": change_notifier.stats(),
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
\ No newline at end of file
@@ -1,10 +1,18 @@
 """Note management routes for creating, reading, updating, and deleting notes."""
 
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Literal, Optional
+from fastapi import APIRouter, Body, Depends, Header, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
 
-from models import NoteCreate, NoteUpdate, User
-from services.note_service import NoteService
-from dependencies import get_note_service, get_current_user
+from config import settings
+from models import NoteCreate, NoteUpdate, NotePatch, NoteIdList, NoteListQuery, User
+from services.async_note_service import AsyncNoteService
+from services.change_notifier import ChangeNotifier, Subscription
+from dependencies import get_async_note_service, get_change_notifier, get_current_user
 
 
 router = APIRouter(prefix="/notes", tags=["Notes"])
@@ -14,7 +22,7 @@ router = APIRouter(prefix="/notes", tags=["Notes"])
 async def create_note(
     note_data: NoteCreate,
     current_user: User = Depends(get_current_user),
-    note_service: NoteService = Depends(get_note_service)
+    note_service: AsyncNoteService = Depends(get_async_note_service)
 ):
     """
     Create a new note for the authenticated user.
@@ -22,44 +30,269 @@ async def create_note(
     - **note_title**: The title of the note
     - **note_content**: The content/body of the note
     """
-    return note_service.create_note(note_data, current_user)
+    return await note_service.create_note(note_data, current_user)
+
+
+@router.post("/bulk", summary="Create many notes at once")
+async def create_notes_bulk(
+    notes: List[Any] = Body(...),
+    current_user: User = Depends(get_current_user),
+    note_service: AsyncNoteService = Depends(get_async_note_service)
+):
+    """
+    Create several notes in a single request and transaction.
+    
+    The body is a JSON array of note objects (`note_title`, `note_content`),
+    at most `BULK_MAX_NOTES` long. Each item is validated separately and
+    the response reports a `created` or `invalid` status per array index.
+    """
+    return await note_service.create_notes(notes, current_user)
+
+
+@router.post("/import", summary="Import notes from NDJSON")
+async def import_notes(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    note_service: AsyncNoteService = Depends(get_async_note_service)
+):
+    """
+    Create notes from an NDJSON body: one `{"note_title", "note_content"}` object per line.
+    
+    The body may be gzip-compressed, and has no size limit: it is read and
+    inserted as it arrives, in batches of `IMPORT_BATCH_SIZE` lines with a
+    commit per batch. Invalid lines are skipped and listed (up to
+    `IMPORT_MAX_ERRORS`) with their line numbers. The result reports the
+    counts, `last_committed_line`, whether the whole body was read
+    (`complete`) and the ingest rate in `rows_per_second`.
+    """
+    return await note_service.import_notes(request.stream(), current_user)
+
+
+@router.post("/batch-get", summary="Get several notes by ID")
+async def batch_get_notes(
+    request: NoteIdList,
+    current_user: User = Depends(get_current_user),
+    note_service: AsyncNoteService = Depends(get_async_note_service)
+):
+    """
+    Retrieve several notes in one request.
+    
+    - **note_ids**: IDs to fetch (at most `BATCH_MAX_IDS`)
+    
+    Each ID is reported as `found` (with the note), `not_found` or `forbidden`.
+    """
+    return await note_service.get_notes_by_ids(request.note_ids, current_user)
+
+
+@router.post("/batch-delete", summary="Delete several notes by ID")
+async def batch_delete_notes(
+    request: NoteIdList,
+    current_user: User = Depends(get_current_user),
+    note_service: AsyncNoteService = Depends(get_async_note_service)
+):
+    """
+    Delete several notes in one request and transaction.
+    
+    - **note_ids**: IDs to delete (at most `BATCH_MAX_IDS`)
+    
+    Each ID is reported as `deleted`, `not_found` or `forbidden`.
+    """
+    return await note_service.delete_notes_by_ids(request.note_ids, current_user)
 
 
 @router.get("/", summary="Get all notes for the current user")
 async def get_notes(
+    limit: Optional[int] = Query(None, ge=1, le=settings.NOTES_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Literal["full", "summary"] = "full",
+    sort: Literal["created_at", "updated_at", "title"] = "created_at",
+    direction: Literal["asc", "desc"] = "desc",
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    note_service: NoteService = Depends(get_note_service)
+    note_service: AsyncNoteService = Depends(get_async_note_service)
 ):
     """
     Retrieve all notes belonging to the authenticated user.
     
-    Notes are returned in descending order by creation date.
+    Notes are returned in descending order by creation date unless sorted otherwise.
+    
+    - **limit**: Page size; when set (or when a cursor is given) the response is
+      `{"notes": [...], "next_cursor": ...}` instead of a plain list
+    - **cursor**: `next_cursor` from the previous page
+    - **fields**: `summary` returns id, title, a short `note_snippet` and timestamps
+      instead of the full content; use `GET /notes/{note_id}` for the full note
+    - **sort**: `created_at`, `updated_at` or `title`
+    - **direction**: `desc` (default) or `asc`
+    - **created_from** / **created_to**: Only notes created in `[from, to)` (ISO 8601)
+    - **updated_from** / **updated_to**: Only notes last updated in `[from, to)` (ISO 8601)
+    
+    The response carries an `ETag` that changes whenever any of the user's notes
+    is created, updated or deleted; send it back in `If-None-Match` to get
+    `304 Not Modified` instead of the list.
+    """
+    summary = fields == "summary"
+    query = NoteListQuery(
+        sort=sort,
+        direction=direction,
+        created_from=created_from,
+        created_to=created_to,
+        updated_from=updated_from,
+        updated_to=updated_to
+    )
+    etag, body = await note_service.get_notes_json(
+        current_user, limit, cursor, summary, query, if_none_match
+    )
+    return _conditional_response(etag, body)
+
+
+@router.get("/export", summary="Export all notes as NDJSON")
+async def export_notes(
+    gzip: bool = False,
+    current_user: User = Depends(get_current_user),
+    note_service: AsyncNoteService = Depends(get_async_note_service)
+):
+    """
+    Stream every note of the authenticated user, one JSON object per line.
+    
+    - **gzip**: Send the export gzip-compressed (`notes.ndjson.gz`)
+    
+    Notes are written oldest first as they are read from the database, so
+    the export starts immediately and server memory does not depend on the
+    number of notes. Each line has the same fields as `GET /notes/{note_id}`.
+    """
+    export = note_service.export_notes(current_user, gzip)
+    filename = "notes.ndjson.gz" if gzip else "notes.ndjson"
+    return StreamingResponse(
+        export,
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+        # Runs however the stream ends, including client disconnects
+        background=BackgroundTask(export.aclose)
+    )
+
+
+@router.get("/changes", summary="Get notes changed since a sync token")
+async def get_note_changes(
+    since: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.SYNC_MAX_CHANGES),
+    current_user: User = Depends(get_current_user),
+    note_service: AsyncNoteService = Depends(get_async_note_service)
+):
+    """
+    Retrieve notes created, updated or deleted since the last sync.
+    
+    - **since**: `next_token` from the previous call; omit it for a full sync
+    - **limit**: Maximum changed and deleted entries per call (at most `SYNC_MAX_CHANGES`)
+    
+    Returns `{"changed": [...], "deleted": [note_id, ...], "next_token", "has_more"}`.
+    Keep calling with the new token while `has_more` is true. A token older than
+    `SYNC_TOMBSTONE_RETENTION_DAYS` is rejected with 410; start again without one.
+    """
+    return await note_service.get_changes(current_user, since, limit)
+
+
+@router.get("/search", summary="Search notes by title and content")
+async def search_notes(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(settings.NOTES_PAGE_DEFAULT_LIMIT, ge=1, le=settings.NOTES_PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    note_service: AsyncNoteService = Depends(get_async_note_service)
+):
+    """
+    Full-text search over the authenticated user's notes.
+    
+    - **q**: Search words; results are ranked by relevance
+    - **limit**: Page size
+    - **cursor**: `next_cursor` from the previous page
+    
+    Each result has a `note_snippet` around the first matching word and a `score`.
     """
-    return note_service.get_user_notes(current_user)
+    return await note_service.search_notes(current_user, q, limit, cursor)
+
+
+@router.get("/events", summary="Stream note change events")
+async def note_events(
+    current_user: User = Depends(get_current_user),
+    notifier: ChangeNotifier = Depends(get_change_notifier)
+):
+    """
+    Push notifications for the user's notes as Server-Sent Events.
+    
+    Each event is `event: created|updated|deleted` with data
+    `{"type", "note_id", "last_update"}`; fetch the details with
+    `GET /notes/changes`. A comment line is sent every
+    `NOTIFY_KEEPALIVE_SECONDS` while idle. A client that falls more than
+    `NOTIFY_BUFFER_SIZE` events behind receives `event: overflow` and is
+    disconnected; it should resync with `GET /notes/changes` and reconnect.
+    """
+    subscription = notifier.subscribe(current_user.user_id)
+    return StreamingResponse(
+        _event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Runs however the stream ends, including client disconnects
+        background=BackgroundTask(notifier.unsubscribe, subscription)
+    )
+
+
+async def _event_stream(subscription: Subscription) -> AsyncIterator[str]:
+    """Format a subscription's events as an SSE stream."""
+    yield ": connected\n\n"
+    while True:
+        try:
+            event = await subscription.get(settings.NOTIFY_KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        if event is None:
+            if subscription.overflowed:
+                yield 'event: overflow\ndata: {"detail": "Too far behind, resync with /notes/changes"}\n\n'
+            return
+        yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
 
 
 @router.get("/{note_id}", summary="Get a specific note by ID")
 async def get_note(
     note_id: str,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    note_service: NoteService = Depends(get_note_service)
+    note_service: AsyncNoteService = Depends(get_async_note_service)
 ):
     """
     Retrieve a specific note by its ID.
     
     - **note_id**: The unique identifier of the note
     
-    The user can only access notes they own.
+    The user can only access notes they own. The response carries the note's
+    `ETag`; send it in `If-None-Match` to get `304 Not Modified` while the note
+    is unchanged, or in `If-Match` on `PUT`/`DELETE` to avoid overwriting
+    someone else's edit.
     """
-    return note_service.get_note_by_id(note_id, current_user)
+    etag, body = await note_service.get_note_json(note_id, current_user, if_none_match)
+    return _conditional_response(etag, body)
+
+
+def _conditional_response(etag: str, body: Optional[bytes]) -> Response:
+    """Build a 200 JSON response, or a bodiless 304 when body is None."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.put("/{note_id}", summary="Update an existing note")
 async def update_note(
     note_id: str,
     note_data: NoteUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    note_service: NoteService = Depends(get_note_service)
+    note_service: AsyncNoteService = Depends(get_async_note_service)
 ):
     """
     Update an existing note's title and/or content.
@@ -67,24 +300,59 @@ async def update_note(
     - **note_id**: The unique identifier of the note
     - **note_title**: New title for the note (optional)
     - **note_content**: New content for the note (optional)
+    - **version**: Version the edit is based on (optional); if the note has moved on,
+      nothing is written and the response is `409 Conflict` with `current_version`
+    
+    The user can only update notes they own. With an `If-Match` header the update
+    is only applied if the note still has that ETag; otherwise the response is
+    `412 Precondition Failed` with the current `ETag`.
+    """
+    note = await note_service.update_note(note_id, note_data, current_user, if_match)
+    response.headers["ETag"] = note_service.note_etag(note.version)
+    return note
+
+
+@router.patch("/{note_id}", summary="Apply text edits to a note")
+async def patch_note(
+    note_id: str,
+    patch: NotePatch,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    note_service: AsyncNoteService = Depends(get_async_note_service)
+):
+    """
+    Change part of a note's content without sending all of it.
+    
+    - **note_id**: The unique identifier of the note
+    - **version**: Version the edits are based on; if the note has moved on, nothing
+      is written and the response is `409 Conflict` with `current_version`
+    - **edits**: Up to `PATCH_MAX_EDITS` of `{"op": "insert", "pos", "text"}` or
+      `{"op": "delete", "pos", "length"}`, sorted by `pos` and non-overlapping
+    - **note_title**: New title for the note (optional)
     
-    The user can only update notes they own.
+    Positions are character (Unicode code point) offsets into the content of the
+    base version; replace text with an insert followed by a delete at the same `pos`.
+    Edits that reach past the end of the content return `422`.
     """
-    return note_service.update_note(note_id, note_data, current_user)
+    note = await note_service.patch_note(note_id, patch, current_user)
+    response.headers["ETag"] = note_service.note_etag(note.version)
+    return note
 
 
 @router.delete("/{note_id}", summary="Delete a note")
 async def delete_note(
     note_id: str,
+    if_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    note_service: NoteService = Depends(get_note_service)
+    note_service: AsyncNoteService = Depends(get_async_note_service)
 ):
     """
     Delete a note by its ID.
     
     - **note_id**: The unique identifier of the note
     
-    The user can only delete notes they own.
+    The user can only delete notes they own. With an `If-Match` header the note
+    is only deleted if it still has that ETag (`412 Precondition Failed` otherwise).
     """
-    note_service.delete_note(note_id, current_user)
+    await note_service.delete_note(note_id, current_user, if_match)
     return {"message": "Note deleted successfully"}
\ No newline at end of file
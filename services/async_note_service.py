@@ -0,0 +1,268 @@
+"""Async facade over NoteService for use from async route handlers."""
+
+import threading
+import time
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+from models import (
+    NoteCreate, NoteUpdate, NotePatch, NoteResponse, NoteListQuery, NotePage, NoteSummary, NoteChanges, NoteSearchPage,
+    BulkNoteResponse, BatchNoteResponse, NoteImportError, NoteImportResult, User
+)
+from config import settings
+from services.ndjson import Line, NDJSONReader
+from services.note_service import NoteService
+from database.executor import DatabaseExecutor
+
+
+class ExecutorStream:
+    """
+    Async iterator over a blocking chunk generator, stepped on the database executor.
+    
+    Steps never overlap: aclose() waits for a step still running on a
+    worker (for example after the client disconnected) before it closes
+    the generator and releases what it holds.
+    """
+    
+    def __init__(self, chunks: Iterator[bytes], executor: DatabaseExecutor):
+        self._chunks = chunks
+        self._executor = executor
+        self._lock = threading.Lock()
+    
+    def _next(self) -> Optional[bytes]:
+        with self._lock:
+            return next(self._chunks, None)
+    
+    def _close(self) -> None:
+        with self._lock:
+            self._chunks.close()
+    
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self._executor.run(self._next)
+            if chunk is None:
+                return
+            yield chunk
+    
+    async def aclose(self) -> None:
+        """Close the generator on the executor; safe to call more than once."""
+        await self._executor.run(self._close)
+
+
+class AsyncNoteService:
+    """Awaitable note operations backed by the blocking NoteService."""
+    
+    def __init__(self, note_service: NoteService, executor: DatabaseExecutor):
+        self.note_service = note_service
+        self.executor = executor
+    
+    async def create_note(self, note_data: NoteCreate, current_user: User) -> NoteResponse:
+        """Create a new note for the authenticated user."""
+        return await self.executor.run(self.note_service.create_note, note_data, current_user)
+    
+    async def create_notes(self, items: List[Any], current_user: User) -> BulkNoteResponse:
+        """Create many notes for the authenticated user in one transaction."""
+        return await self.executor.run(self.note_service.create_notes, items, current_user)
+    
+    async def import_notes(self, chunks: AsyncIterator[bytes], current_user: User) -> NoteImportResult:
+        """
+        Import notes from a streamed NDJSON body, plain or gzip-compressed.
+        
+        Lines are collected into batches of IMPORT_BATCH_SIZE lines (fewer if
+        they reach IMPORT_BATCH_MAX_BYTES), and each batch is validated,
+        inserted and committed on the executor before more of the body is
+        read. Memory is therefore bounded by one batch whatever the upload
+        size. Committed batches stay if the import stops early.
+        """
+        start = time.perf_counter()
+        reader = NDJSONReader(settings.IMPORT_MAX_LINE_BYTES)
+        batch: List[Tuple[int, bytes]] = []
+        errors: List[NoteImportError] = []
+        progress = {'imported': 0, 'failed': 0, 'batches': 0, 'last_committed_line': 0, 'batch_bytes': 0}
+        
+        def record(failed: List[NoteImportError]) -> None:
+            progress['failed'] += len(failed)
+            errors.extend(failed[:max(settings.IMPORT_MAX_ERRORS - len(errors), 0)])
+        
+        async def flush() -> None:
+            if not batch:
+                return
+            failed = await self.executor.run(self.note_service.import_notes, list(batch), current_user)
+            progress['imported'] += len(batch) - len(failed)
+            progress['batches'] += 1
+            progress['last_committed_line'] = batch[-1][0]
+            record(failed)
+            batch.clear()
+            progress['batch_bytes'] = 0
+        
+        async def consume(lines: Iterable[Line]) -> None:
+            for number, line, error in lines:
+                if error is not None:
+                    record([NoteImportError(line=number, error=error)])
+                    continue
+                batch.append((number, line))
+                progress['batch_bytes'] += len(line)
+                if (len(batch) >= settings.IMPORT_BATCH_SIZE
+                        or progress['batch_bytes'] >= settings.IMPORT_BATCH_MAX_BYTES):
+                    await flush()
+        
+        async for chunk in chunks:
+            await consume(reader.feed(chunk))
+            if reader.failed:
+                break
+        await consume(reader.finish())
+        await flush()
+        
+        seconds = time.perf_counter() - start
+        return NoteImportResult(
+            lines=reader.line_number,
+            imported=progress['imported'],
+            failed=progress['failed'],
+            batches=progress['batches'],
+            last_committed_line=progress['last_committed_line'],
+            errors=errors,
+            errors_truncated=progress['failed'] > len(errors),
+            complete=not reader.failed,
+            seconds=round(seconds, 3),
+            rows_per_second=round(progress['imported'] / seconds, 1) if seconds > 0 else 0.0
+        )
+    
+    async def get_user_notes(
+        self,
+        current_user: User,
+        query: Optional[NoteListQuery] = None
+    ) -> List[NoteResponse]:
+        """Get all notes for the authenticated user."""
+        return await self.executor.run(self.note_service.get_user_notes, current_user, query)
+    
+    def export_notes(self, current_user: User, gzip: bool = False) -> ExecutorStream:
+        """Stream the user's notes as NDJSON chunks; call aclose() once the response ends."""
+        return ExecutorStream(self.note_service.export_notes(current_user, gzip), self.executor)
+    
+    async def get_user_note_summaries(
+        self,
+        current_user: User,
+        query: Optional[NoteListQuery] = None
+    ) -> List[NoteSummary]:
+        """Get all notes for the authenticated user as summaries without full content."""
+        return await self.executor.run(self.note_service.get_user_note_summaries, current_user, query)
+    
+    async def get_user_notes_page(
+        self,
+        current_user: User,
+        limit: int,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        query: Optional[NoteListQuery] = None
+    ) -> NotePage:
+        """Get one page of the user's notes with a cursor for the next page."""
+        return await self.executor.run(
+            self.note_service.get_user_notes_page, current_user, limit, cursor, summary, query
+        )
+    
+    async def get_changes(
+        self,
+        current_user: User,
+        since: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> NoteChanges:
+        """Get notes created, updated or deleted since a sync token."""
+        return await self.executor.run(self.note_service.get_changes, current_user, since, limit)
+    
+    async def search_notes(
+        self,
+        current_user: User,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> NoteSearchPage:
+        """Search the user's notes by title and content, best match first."""
+        return await self.executor.run(
+            self.note_service.search_notes, current_user, query, limit, cursor
+        )
+    
+    def note_etag(self, version: int) -> str:
+        """Strong ETag of a note version."""
+        return self.note_service.note_etag(version)
+    
+    async def get_note_json(
+        self,
+        note_id: str,
+        current_user: User,
+        if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[bytes]]:
+        """
+        Get a note's ETag and serialized JSON; cache hits are served without the executor.
+        
+        With If-None-Match only a metadata lookup runs first; the body is None
+        when the client's copy is current.
+        """
+        etag = None
+        if if_none_match:
+            etag = await self.executor.run(self.note_service.current_note_etag, note_id, current_user)
+            if etag is not None and self.note_service.etag_matches(if_none_match, etag):
+                return etag, None
+        cached = self.note_service.peek_note_json(note_id, current_user, etag)
+        if cached is not None:
+            return cached
+        return await self.executor.run(self.note_service.load_note_json, note_id, current_user)
+    
+    async def get_notes_json(
+        self,
+        current_user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        query: Optional[NoteListQuery] = None,
+        if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[bytes]]:
+        """
+        Get the ETag and serialized JSON of the user's notes; cache hits skip the executor.
+        
+        With If-None-Match only a metadata query runs first; the body is None
+        when the client's copy is current.
+        """
+        etag = None
+        if if_none_match:
+            etag = await self.executor.run(
+                self.note_service.current_list_etag, current_user, limit, cursor, summary, query
+            )
+            if self.note_service.etag_matches(if_none_match, etag):
+                return etag, None
+        cached = self.note_service.peek_notes_json(current_user, limit, cursor, summary, query, etag)
+        if cached is not None:
+            return cached
+        return await self.executor.run(
+            self.note_service.load_notes_json, current_user, limit, cursor, summary, query
+        )
+    
+    async def get_note_by_id(self, note_id: str, current_user: User) -> NoteResponse:
+        """Get a specific note by ID, ensuring user ownership."""
+        return await self.executor.run(self.note_service.get_note_by_id, note_id, current_user)
+    
+    async def get_notes_by_ids(self, note_ids: List[str], current_user: User) -> BatchNoteResponse:
+        """Get several notes by ID, reporting status per ID."""
+        return await self.executor.run(self.note_service.get_notes_by_ids, note_ids, current_user)
+    
+    async def delete_notes_by_ids(self, note_ids: List[str], current_user: User) -> BatchNoteResponse:
+        """Delete several notes by ID, reporting status per ID."""
+        return await self.executor.run(self.note_service.delete_notes_by_ids, note_ids, current_user)
+    
+    async def update_note(
+        self,
+        note_id: str,
+        note_data: NoteUpdate,
+        current_user: User,
+        if_match: Optional[str] = None
+    ) -> NoteResponse:
+        """Update an existing note, ensuring user ownership and an If-Match precondition."""
+        return await self.executor.run(
+            self.note_service.update_note, note_id, note_data, current_user, if_match
+        )
+    
+    async def patch_note(self, note_id: str, patch: NotePatch, current_user: User) -> NoteResponse:
+        """Apply an edit script to a note based on patch.version."""
+        return await self.executor.run(self.note_service.patch_note, note_id, patch, current_user)
+    
+    async def delete_note(self, note_id: str, current_user: User, if_match: Optional[str] = None) -> None:
+        """Delete a note, ensuring user ownership and an If-Match precondition."""
+        await self.executor.run(self.note_service.delete_note, note_id, current_user, if_match)
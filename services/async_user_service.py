@@ -0,0 +1,60 @@
+"""Async facade over UserService for use from async route handlers."""
+
+from typing import Optional
+
+from models import User, UserCreate, UserResponse
+from services.user_service import UserService
+from services.password_hasher import PasswordHasher
+from database.executor import DatabaseExecutor
+
+
+class AsyncUserService:
+    """Awaitable user and authentication operations backed by the blocking services."""
+    
+    def __init__(
+        self,
+        user_service: UserService,
+        executor: DatabaseExecutor,
+        password_hasher: PasswordHasher
+    ):
+        self.user_service = user_service
+        self.executor = executor
+        self.password_hasher = password_hasher
+    
+    async def create_user(self, user_data: UserCreate) -> UserResponse:
+        """Create a new user account, hashing the password on the process pool."""
+        password_hash = await self.password_hasher.hash_password(user_data.password)
+        return await self.executor.run(self.user_service.create_user, user_data, password_hash)
+    
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """Look up a user by email address, hitting the database only on a cache miss."""
+        user = self.user_service.user_cache.get(email)
+        if user is not None:
+            found, version = self.user_service.token_versions.get_cached(user.user_id)
+            if found and version == user.token_version:
+                return user
+        return await self.executor.run(self.user_service.revalidate_user, email, user)
+    
+    async def get_token_version(self, user_id: str) -> Optional[int]:
+        """Get a user's token version, hitting the database only on a cache miss."""
+        found, version = self.user_service.token_versions.get_cached(user_id)
+        if found:
+            return version
+        return await self.executor.run(self.user_service.get_token_version, user_id)
+    
+    async def revoke_tokens(self, user: User) -> None:
+        """Revoke every access token issued to the user so far."""
+        await self.executor.run(self.user_service.revoke_tokens, user)
+    
+    async def authenticate(self, email: str, password: str) -> Optional[User]:
+        """Authenticate a user with email and password, verifying on the process pool."""
+        user = await self.get_user_by_email(email)
+        
+        if not user or not await self.password_hasher.verify_password(password, user.password):
+            return None
+        
+        return user
+    
+    def get_user_info(self, user: User) -> UserResponse:
+        """Get user information for response."""
+        return self.user_service.get_user_info(user)
@@ -1,13 +1,16 @@
 """Authentication service handling password hashing, JWT tokens, and user authentication."""
 
 import bcrypt
+import hashlib
 import jwt
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi import HTTPException
 
 from models import User
 from config import settings
+from services.cache import TTLCache
 
 
 class AuthService:
@@ -17,6 +20,11 @@ class AuthService:
         self.secret_key = settings.SECRET_KEY
         self.algorithm = settings.ALGORITHM
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        self.stateless_auth = settings.STATELESS_AUTH
+        self.token_cache = TTLCache(
+            max_size=settings.TOKEN_CACHE_MAX_SIZE,
+            ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS
+        )
     
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt with a salt."""
@@ -31,6 +39,20 @@ class AuthService:
             hashed_password.encode('utf-8')
         )
     
+    def build_token_claims(self, user: User) -> dict:
+        """
+        Build the identity claims for a user's access token.
+        
+        Besides the email subject, tokens carry the user id, name and token
+        version so stateless mode can authenticate without a user lookup.
+        """
+        return {
+            "sub": user.user_email,
+            "uid": user.user_id,
+            "name": user.user_name,
+            "ver": user.token_version,
+        }
+    
     def create_jwt_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT token with the given data and expiration time."""
         if expires_delta:
@@ -46,10 +68,22 @@ class AuthService:
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
     
     def decode_jwt_token(self, token: str) -> dict:
-        """Decode and validate a JWT token."""
+        """
+        Decode and validate a JWT token.
+        
+        Verified payloads are cached by token digest until the token expires,
+        so repeat requests with the same bearer token skip the signature
+        check and JSON parse.
+        """
+        digest = hashlib.sha256(token.encode('utf-8')).digest()
+        payload = self.token_cache.get(digest)
+        if payload is not None:
+            return dict(payload)
+        
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
+            self._cache_verified_token(digest, payload)
+            return dict(payload)
         except jwt.ExpiredSignatureError:
             raise HTTPException(
                 status_code=401,
@@ -63,6 +97,16 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
     
+    def _cache_verified_token(self, digest: bytes, payload: dict) -> None:
+        """Cache a verified payload no longer than the token's own lifetime."""
+        now = time.monotonic()
+        expires_at = now + self.token_cache.ttl_seconds
+        exp = payload.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, now + (float(exp) - time.time()))
+        if expires_at > now:
+            self.token_cache.set(digest, payload, expires_at=expires_at)
+    
     def authenticate_user(self, email: str, password: str, user_repository) -> Optional[User]:
         """Authenticate a user with email and password."""
         user = user_repository.get_by_email(email)
@@ -0,0 +1,249 @@
+"""Bounded in-process caches shared by the services."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a time-to-live.
+
+    Entries are evicted least-recently-used first once max_size is reached.
+    A max_size of 0 disables the cache: every lookup is a miss.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if it is missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            expires_at: Absolute time.monotonic() deadline; defaults to now + ttl_seconds
+        """
+        if self.max_size <= 0:
+            return
+        if expires_at is None:
+            expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Return a snapshot of size and hit/miss counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+
+class ByteSizeCache:
+    """
+    Thread-safe LRU cache of serialized bytes bounded by total memory.
+
+    Each entry is charged its value length (or an explicit size for
+    composite values) plus a fixed per-entry overhead,
+    and least-recently-used entries are evicted until the total fits in
+    max_bytes. Entries also expire after ttl_seconds.
+
+    Entries may belong to a group (e.g. all list pages of one user) that is
+    invalidated as a whole. Every invalidation bumps the group's generation;
+    a value computed before that must not be stored, so readers pass the
+    generation they saw before querying to set().
+    """
+
+    ENTRY_OVERHEAD = 200
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 60.0,
+        max_entry_bytes: Optional[int] = None
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 8
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._groups: Dict[Hashable, Set[Hashable]] = {}
+        self._generations: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._rejected = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or None if missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, _, _, expires_at = entry
+            if expires_at <= now:
+                self._remove(key)
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def generation(self, group: Hashable) -> int:
+        """Return the group's current generation, to be passed to set()."""
+        with self._lock:
+            return self._generations.get(group, 0)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        group: Optional[Hashable] = None,
+        generation: Optional[int] = None,
+        size: Optional[int] = None
+    ) -> bool:
+        """
+        Store a value under key.
+
+        Args:
+            key: Cache key
+            value: Serialized value
+            group: Group the entry is invalidated with
+            generation: Group generation read before the value was computed;
+                the value is dropped if the group was invalidated since
+            size: Bytes to charge for the value; defaults to len(value)
+
+        Returns:
+            Whether the value was stored
+        """
+        size = (len(value) if size is None else size) + self.ENTRY_OVERHEAD
+        if self.max_bytes <= 0 or size > self.max_entry_bytes:
+            with self._lock:
+                self._rejected += 1
+            return False
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if generation is not None and self._generations.get(group, 0) != generation:
+                return False
+            self._remove(key)
+            self._data[key] = (value, group, size, expires_at)
+            self._bytes += size
+            if group is not None:
+                self._groups.setdefault(group, set()).add(key)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+                self._evictions += 1
+            return True
+
+    def invalidate(self, key: Hashable, group: Optional[Hashable] = None) -> None:
+        """Drop one entry and, if group is given, fence off in-flight values for it."""
+        with self._lock:
+            if group is not None:
+                self._generations[group] = self._generations.get(group, 0) + 1
+            if key in self._data:
+                self._remove(key)
+                self._invalidations += 1
+
+    def invalidate_group(self, group: Hashable) -> None:
+        """Drop every entry of a group."""
+        with self._lock:
+            self._generations[group] = self._generations.get(group, 0) + 1
+            for key in list(self._groups.get(group, ())):
+                self._remove(key)
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+            self._groups.clear()
+            self._generations.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        _, group, size, _ = entry
+        self._bytes -= size
+        if group is not None:
+            keys = self._groups.get(group)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._groups[group]
+
+    def stats(self) -> dict:
+        """Return a snapshot of memory use and hit/miss counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'rejected_oversize': self._rejected,
+            }
@@ -0,0 +1,165 @@
+"""In-process fan-out of note change events to connected push subscribers."""
+
+import asyncio
+import contextvars
+import threading
+from typing import Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+# Events published inside a shared transaction wait here until it commits
+_held_events: contextvars.ContextVar[Optional[List[tuple]]] = contextvars.ContextVar(
+    "held_events", default=None
+)
+
+
+class Subscription:
+    """
+    One connected client's bounded event buffer.
+
+    Events are queued on the subscriber's event loop. When the buffer is
+    full the subscriber is treated as a slow consumer: the subscription is
+    closed instead of letting its backlog grow.
+    """
+
+    def __init__(self, user_id: str, buffer_size: int, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.closed = False
+        self.overflowed = False
+
+    def _offer(self, event: dict) -> bool:
+        """Queue an event; must run on the subscriber's loop. Returns False on overflow."""
+        if self.closed:
+            return True
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self._close()
+            return False
+
+    def _close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        # Wake a reader blocked on get(); room is made if the buffer is full
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """
+        Wait for the next event.
+
+        Returns None when the subscription has been closed and raises
+        asyncio.TimeoutError when nothing arrived within timeout.
+        """
+        if self.closed and self.queue.empty():
+            return None
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class ChangeNotifier:
+    """
+    Publishes compact note change events to each user's open push connections.
+
+    publish() may be called from any thread, e.g. the database executor
+    running NoteService; delivery is handed to each subscriber's event loop.
+    Events are only delivered in this process, so clients still use
+    GET /notes/changes to catch up after reconnecting.
+    """
+
+    def __init__(self, buffer_size: int = 64, max_connections: int = 10000):
+        self.buffer_size = buffer_size
+        self.max_connections = max_connections
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._connections = 0
+        self._published = 0
+        self._delivered = 0
+        self._slow_consumers = 0
+
+    def subscribe(self, user_id: str) -> Subscription:
+        """Open a subscription for a user on the running event loop."""
+        subscription = Subscription(user_id, self.buffer_size, asyncio.get_running_loop())
+        with self._lock:
+            if self._connections >= self.max_connections:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many open notification streams, please retry",
+                    headers={"Retry-After": "5"},
+                )
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+            self._connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription; safe to call more than once."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is None or subscription not in subscriptions:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+            self._connections -= 1
+        subscription.closed = True
+
+    def publish(self, user_id: str, event_type: str, note_id: str, **fields) -> None:
+        """
+        Send a change event to every connection of a user.
+
+        Inside hold() the event is kept back until the transaction commits.
+        """
+        event = {"type": event_type, "note_id": note_id, **fields}
+        held = _held_events.get()
+        if held is not None:
+            held.append((user_id, event))
+            return
+        self._deliver(user_id, event)
+
+    def hold(self) -> contextvars.Token:
+        """Start holding events published in this context (e.g. an open transaction)."""
+        return _held_events.set([])
+
+    def release(self, token: contextvars.Token, deliver: bool) -> None:
+        """Stop holding events and deliver them if the transaction committed."""
+        held = _held_events.get() or []
+        _held_events.reset(token)
+        if deliver:
+            for user_id, event in held:
+                self._deliver(user_id, event)
+
+    def _deliver(self, user_id: str, event: dict) -> None:
+        with self._lock:
+            self._published += 1
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(self._offer, subscription, event)
+
+    def _offer(self, subscription: Subscription, event: dict) -> None:
+        if subscription.closed:
+            return
+        if subscription._offer(event):
+            with self._lock:
+                self._delivered += 1
+            return
+        with self._lock:
+            self._slow_consumers += 1
+        self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        """Return a snapshot of open connections and delivery counters."""
+        with self._lock:
+            return {
+                'connections': self._connections,
+                'users': len(self._subscriptions),
+                'max_connections': self.max_connections,
+                'buffer_size': self.buffer_size,
+                'published': self._published,
+                'delivered': self._delivered,
+                'slow_consumers_disconnected': self._slow_consumers,
+            }
@@ -0,0 +1,117 @@
+"""Incremental NDJSON line splitting for streamed uploads."""
+
+import zlib
+from typing import Iterator, Optional, Tuple
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# (line number, line bytes or None, error or None)
+Line = Tuple[int, Optional[bytes], Optional[str]]
+
+
+class NDJSONReader:
+    """
+    Split a byte stream into NDJSON lines as it arrives.
+
+    A body starting with the gzip magic bytes is decompressed on the fly,
+    at most chunk_bytes of output at a time, so neither the upload nor its
+    decompressed form is ever held whole. A line longer than max_line_bytes
+    is reported as an error and skipped without being buffered. Blank
+    lines are skipped but still counted, so line numbers match the file.
+    A body that is not valid gzip ends with one error and sets failed;
+    everything fed after that is ignored.
+    """
+
+    def __init__(self, max_line_bytes: int, chunk_bytes: int = 64 * 1024):
+        self.max_line_bytes = max_line_bytes
+        self.chunk_bytes = chunk_bytes
+        self.line_number = 0
+        self._buffer = bytearray()
+        self._overflow = False
+        self._gzip: Optional[bool] = None
+        self._head = b""
+        self._decompressor = None
+        self.failed = False
+
+    def feed(self, data: bytes) -> Iterator[Line]:
+        """Yield the lines completed by the next piece of the body."""
+        if self.failed:
+            return
+        if self._gzip is None:
+            data = self._head + data
+            if len(data) < len(_GZIP_MAGIC):
+                self._head = data
+                return
+            self._head = b""
+            self._gzip = data.startswith(_GZIP_MAGIC)
+        if not self._gzip:
+            yield from self._split(data)
+            return
+        while True:
+            if self._decompressor is None:
+                if not data:
+                    return
+                # A new member; gzip files may be concatenated
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            try:
+                output = self._decompressor.decompress(data, self.chunk_bytes)
+            except zlib.error as e:
+                yield self._fail(f"Body is not valid gzip data: {e}")
+                return
+            yield from self._split(output)
+            if self._decompressor.eof:
+                data = self._decompressor.unused_data
+                self._decompressor = None
+            else:
+                data = self._decompressor.unconsumed_tail
+                if not data and len(output) < self.chunk_bytes:
+                    return
+
+    def finish(self) -> Iterator[Line]:
+        """Yield the last line once the body has ended."""
+        if self.failed:
+            return
+        if self._gzip is None and self._head:
+            self._gzip = False
+            yield from self._split(self._head)
+        if self._decompressor is not None:
+            yield self._fail("Body ends in the middle of a gzip stream")
+            return
+        if self._buffer.strip() or self._overflow:
+            yield self._complete_line()
+
+    def _fail(self, error: str) -> Line:
+        self.failed = True
+        self._buffer.clear()
+        return self.line_number + 1, None, error
+
+    def _split(self, data: bytes) -> Iterator[Line]:
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end < 0:
+                break
+            self._append(data[start:end])
+            line = self._complete_line()
+            if line[1] is None or line[1].strip():
+                yield line
+            start = end + 1
+        self._append(data[start:])
+
+    def _append(self, data: bytes) -> None:
+        if self._overflow:
+            return
+        if len(self._buffer) + len(data) > self.max_line_bytes:
+            self._overflow = True
+            self._buffer.clear()
+        else:
+            self._buffer += data
+
+    def _complete_line(self) -> Line:
+        self.line_number += 1
+        if self._overflow:
+            self._overflow = False
+            return self.line_number, None, f"Line is longer than {self.max_line_bytes} bytes"
+        line = bytes(self._buffer)
+        self._buffer.clear()
+        return self.line_number, line, None
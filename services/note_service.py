@@ -1,18 +1,53 @@
 """Note service handling business logic for note operations."""
 
+import base64
+import binascii
+import hashlib
+import json
+import math
+import time
+import zlib
 from datetime import datetime, timezone
-from typing import List
+from typing import Any, Iterator, List, Optional, Tuple, Union, get_args
 from fastapi import HTTPException
+from pydantic import TypeAdapter, ValidationError
 
-from models import Note, NoteCreate, NoteUpdate, NoteResponse, User, generate_id
+from config import settings
+from models import (
+    Note, NoteCreate, NoteUpdate, NotePatch, NoteResponse, NoteListQuery, NotePage, NoteSummary, NoteChanges,
+    NoteSearchHit, NoteSearchPage, NoteImportError,
+    BulkNoteResult, BulkNoteResponse, BatchNoteResult, BatchNoteResponse, User, generate_id
+)
 from repositories.note_repository import NoteRepository
+from repositories.note_search_repository import NoteSearchRepository, extract_snippet, tokenize
+from services.cache import ByteSizeCache
+from services.change_notifier import ChangeNotifier
+
+# Position before any note was written; the starting point of a full sync
+_SYNC_ORIGIN = datetime(1970, 1, 1)
+
+# Sort orders a list cursor may name, as accepted by NoteListQuery
+_CURSOR_SORTS = get_args(NoteListQuery.model_fields['sort'].annotation)
+_CURSOR_DIRECTIONS = get_args(NoteListQuery.model_fields['direction'].annotation)
+
+_NOTE_LIST = TypeAdapter(List[NoteResponse])
+_SUMMARY_LIST = TypeAdapter(List[NoteSummary])
 
 
 class NoteService:
     """Service class handling note-related business logic."""
     
-    def __init__(self, note_repository: NoteRepository):
+    def __init__(
+        self,
+        note_repository: NoteRepository,
+        notifier: Optional[ChangeNotifier] = None,
+        search_repository: Optional[NoteSearchRepository] = None,
+        cache: Optional[ByteSizeCache] = None
+    ):
         self.note_repository = note_repository
+        self.notifier = notifier
+        self.search_repository = search_repository
+        self.cache = cache
     
     def create_note(self, note_data: NoteCreate, current_user: User) -> NoteResponse:
         """Create a new note for the authenticated user."""
@@ -27,14 +62,271 @@ class NoteService:
         )
         
         self.note_repository.create(note)
+        self._invalidate(current_user)
+        self._index(note)
+        self._publish(current_user, "created", note)
         
         return self._convert_to_response(note)
     
-    def get_user_notes(self, current_user: User) -> List[NoteResponse]:
+    def create_notes(self, items: List[Any], current_user: User) -> BulkNoteResponse:
+        """
+        Create many notes for the authenticated user in one transaction.
+        
+        Each item is validated as NoteCreate on its own; invalid items are
+        reported per index and the valid ones are inserted together.
+        """
+        if len(items) > settings.BULK_MAX_NOTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"At most {settings.BULK_MAX_NOTES} notes can be created per request"
+            )
+        
+        now = datetime.now(timezone.utc)
+        notes = []
+        results = []
+        for index, item in enumerate(items):
+            try:
+                note_data = NoteCreate.model_validate(item)
+            except ValidationError as e:
+                results.append(BulkNoteResult(
+                    index=index,
+                    status="invalid",
+                    error=self._format_validation_error(e)
+                ))
+                continue
+            
+            note = Note(
+                note_id=generate_id(),
+                user_id=current_user.user_id,
+                note_title=note_data.note_title,
+                note_content=note_data.note_content,
+                created_on=now,
+                last_update=now
+            )
+            notes.append(note)
+            results.append(BulkNoteResult(
+                index=index,
+                status="created",
+                note=self._convert_to_response(note)
+            ))
+        
+        self.note_repository.create_many(notes)
+        self._invalidate(current_user)
+        for note in notes:
+            self._index(note)
+            self._publish(current_user, "created", note)
+        
+        return BulkNoteResponse(
+            created=len(notes),
+            failed=len(results) - len(notes),
+            results=results
+        )
+    
+    def import_notes(self, lines: List[Tuple[int, bytes]], current_user: User) -> List[NoteImportError]:
+        """
+        Validate one batch of NDJSON lines as NoteCreate and insert the valid ones.
+        
+        lines are (line number, raw JSON) pairs. The valid notes are written
+        with one multi-row INSERT per table and committed together; the
+        invalid lines are returned as errors.
+        """
+        now = datetime.now(timezone.utc)
+        notes = []
+        errors = []
+        for number, line in lines:
+            try:
+                note_data = NoteCreate.model_validate_json(line)
+            except ValidationError as e:
+                errors.append(NoteImportError(line=number, error=self._format_validation_error(e)))
+                continue
+            notes.append(Note(
+                note_id=generate_id(),
+                user_id=current_user.user_id,
+                note_title=note_data.note_title,
+                note_content=note_data.note_content,
+                created_on=now,
+                last_update=now
+            ))
+        
+        if notes:
+            self.note_repository.create_many(notes)
+            self._invalidate(current_user)
+            for note in notes:
+                self._index(note)
+                self._publish(current_user, "created", note)
+        return errors
+    
+    def get_user_notes(self, current_user: User, query: Optional[NoteListQuery] = None) -> List[NoteResponse]:
         """Get all notes for the authenticated user."""
-        notes = self.note_repository.get_by_user_id(current_user.user_id)
+        notes = self.note_repository.get_by_user_id(current_user.user_id, self._normalize_query(query))
         return [self._convert_to_response(note) for note in notes]
     
+    def export_notes(self, current_user: User, gzip: bool = False) -> Iterator[bytes]:
+        """
+        Yield all of the user's notes as NDJSON, oldest first, one chunk per batch.
+        
+        Notes are read EXPORT_BATCH_SIZE at a time from a server-side cursor
+        and serialized as they arrive, so memory does not grow with the
+        number of notes. With gzip the chunks form one gzip stream.
+        """
+        compressor = zlib.compressobj(wbits=31) if gzip else None
+        query = NoteListQuery(sort="created_at", direction="asc")
+        for notes in self.note_repository.stream_by_user_id(
+            current_user.user_id, settings.EXPORT_BATCH_SIZE, query
+        ):
+            chunk = b"".join(
+                NoteResponse.__pydantic_serializer__.to_json(self._convert_to_response(note)) + b"\n"
+                for note in notes
+            )
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+        if compressor is not None:
+            yield compressor.flush()
+    
+    def get_user_note_summaries(
+        self,
+        current_user: User,
+        query: Optional[NoteListQuery] = None
+    ) -> List[NoteSummary]:
+        """Get all notes for the authenticated user as summaries without full content."""
+        return self.note_repository.get_summaries_by_user_id(
+            current_user.user_id, settings.NOTE_SNIPPET_LENGTH, query=self._normalize_query(query)
+        )
+    
+    def get_user_notes_page(
+        self,
+        current_user: User,
+        limit: int,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        query: Optional[NoteListQuery] = None
+    ) -> NotePage:
+        """
+        Get one page of the user's notes with a cursor for the next page.
+        
+        Notes are newest first unless query sets another order or date filters;
+        a cursor is only valid with the sort order it was issued for.
+        With summary=True the page holds NoteSummary items instead of full notes.
+        """
+        query = self._normalize_query(query)
+        after = self._decode_cursor(cursor, query) if cursor else None
+        if summary:
+            notes = self.note_repository.get_summaries_by_user_id(
+                current_user.user_id, settings.NOTE_SNIPPET_LENGTH, limit + 1, after, query
+            )
+        else:
+            notes = self.note_repository.get_page_by_user_id(
+                current_user.user_id, limit + 1, after, query
+            )
+        
+        next_cursor = None
+        if len(notes) > limit:
+            notes = notes[:limit]
+            next_cursor = self._encode_cursor(notes[-1], query)
+        
+        return NotePage(
+            notes=notes if summary else [self._convert_to_response(note) for note in notes],
+            next_cursor=next_cursor
+        )
+    
+    def get_changes(self, current_user: User, since: Optional[str] = None, limit: Optional[int] = None) -> NoteChanges:
+        """
+        Get notes created, updated or deleted since a sync token.
+        
+        Without a token every live note is returned. Pass next_token back on
+        the following call; while has_more is true, call again straight away.
+        Each change is delivered once per token chain, oldest first.
+        
+        Raises:
+            HTTPException: 400 for a malformed token, 410 when the token is older
+                than the tombstone retention period and a full resync is needed
+        """
+        limit = min(limit or settings.SYNC_MAX_CHANGES, settings.SYNC_MAX_CHANGES)
+        now = time.time()
+        if since:
+            token = self._decode_sync_token(since)
+            if now - token['t'] > settings.SYNC_TOMBSTONE_RETENTION_DAYS * 86400:
+                raise HTTPException(
+                    status_code=410,
+                    detail="Sync token has expired, fetch all notes again without a token"
+                )
+        else:
+            token = {'n': (_SYNC_ORIGIN, ''), 'd': (_SYNC_ORIGIN, ''), 't': now}
+        
+        settle_seconds = settings.SYNC_SETTLE_MS / 1000
+        changed = self.note_repository.get_changes_since(
+            current_user.user_id, token['n'], settle_seconds, limit + 1
+        )
+        deleted = self.note_repository.get_deletions_since(
+            current_user.user_id, token['d'], settle_seconds, limit + 1
+        )
+        has_more = len(changed) > limit or len(deleted) > limit
+        changed, deleted = changed[:limit], deleted[:limit]
+        
+        next_position = (changed[-1].last_update, changed[-1].note_id) if changed else token['n']
+        deleted_position = deleted[-1] if deleted else token['d']
+        next_token = self._encode_token({
+            'n': [next_position[0].isoformat(), next_position[1]],
+            'd': [deleted_position[0].isoformat(), deleted_position[1]],
+            # Only a fully drained feed proves the client has seen every tombstone up to now
+            't': token['t'] if has_more else now,
+        })
+        
+        return NoteChanges(
+            changed=[self._convert_to_response(note) for note in changed],
+            deleted=[note_id for _, note_id in deleted],
+            next_token=next_token,
+            has_more=has_more
+        )
+    
+    def search_notes(
+        self,
+        current_user: User,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> NoteSearchPage:
+        """
+        Search the user's notes by title and content, best match first.
+        
+        Each hit carries a snippet of the content around the first matching term.
+        Paging stops after SEARCH_MAX_RESULTS hits.
+        """
+        if self.search_repository is None:
+            raise HTTPException(status_code=501, detail="Search is not enabled")
+        
+        offset = self._decode_search_cursor(cursor) if cursor else 0
+        limit = max(0, min(limit, settings.SEARCH_MAX_RESULTS - offset))
+        hits = self.search_repository.search(current_user.user_id, query, limit + 1, offset) if limit else []
+        
+        next_cursor = None
+        if len(hits) > limit:
+            hits = hits[:limit]
+            next_cursor = self._encode_token({'o': offset + limit})
+        
+        terms = tokenize(query)
+        return NoteSearchPage(
+            results=[
+                NoteSearchHit(
+                    note_id=note.note_id,
+                    note_title=note.note_title,
+                    note_snippet=extract_snippet(note.note_content, terms, settings.NOTE_SNIPPET_LENGTH),
+                    score=round(score, 6),
+                    user_id=note.user_id,
+                    created_on=note.created_on,
+                    last_update=note.last_update
+                )
+                for note, score in hits
+            ],
+            next_cursor=next_cursor
+        )
+    
+    def prune_tombstones(self) -> int:
+        """Forget deletions older than the sync retention period."""
+        return self.note_repository.prune_tombstones(settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    
     def get_note_by_id(self, note_id: str, current_user: User) -> NoteResponse:
         """Get a specific note by ID, ensuring user ownership."""
         note = self.note_repository.get_by_id(note_id)
@@ -50,50 +342,517 @@ class NoteService:
         
         return self._convert_to_response(note)
     
-    def update_note(self, note_id: str, note_data: NoteUpdate, current_user: User) -> NoteResponse:
-        """Update an existing note, ensuring user ownership."""
-        note = self.note_repository.get_by_id(note_id)
+    def get_notes_by_ids(self, note_ids: List[str], current_user: User) -> BatchNoteResponse:
+        """Get several notes by ID in one query, reporting missing or foreign IDs per ID."""
+        note_ids = self._unique_batch_ids(note_ids)
+        notes = {
+            note.note_id: note
+            for note in self.note_repository.get_many_for_user(note_ids, current_user.user_id)
+        }
+        missing = self._classify_missing(note_ids, notes.keys())
         
-        if not note:
-            raise HTTPException(status_code=404, detail="Note not found")
+        return BatchNoteResponse(results=[
+            BatchNoteResult(note_id=note_id, status="found", note=self._convert_to_response(notes[note_id]))
+            if note_id in notes else
+            BatchNoteResult(note_id=note_id, status=missing[note_id])
+            for note_id in note_ids
+        ])
+    
+    def delete_notes_by_ids(self, note_ids: List[str], current_user: User) -> BatchNoteResponse:
+        """Delete several notes with one ownership-scoped statement, reporting status per ID."""
+        note_ids = self._unique_batch_ids(note_ids)
+        deleted = self.note_repository.delete_many_for_user(note_ids, current_user.user_id)
+        missing = self._classify_missing(note_ids, deleted)
+        self._invalidate(current_user, list(deleted))
+        self._unindex(current_user, list(deleted))
+        for note_id in note_ids:
+            if note_id in deleted:
+                self._publish_deleted(current_user, note_id)
         
-        if not self._verify_note_ownership(note, current_user):
-            raise HTTPException(
-                status_code=403, 
-                detail="Not authorized to update this note"
+        return BatchNoteResponse(results=[
+            BatchNoteResult(
+                note_id=note_id,
+                status="deleted" if note_id in deleted else missing[note_id]
             )
+            for note_id in note_ids
+        ])
+    
+    def update_note(
+        self,
+        note_id: str,
+        note_data: NoteUpdate,
+        current_user: User,
+        if_match: Optional[str] = None
+    ) -> NoteResponse:
+        """
+        Update an existing note, ensuring user ownership.
         
-        # Update note fields if provided
-        if note_data.note_title is not None:
-            note.note_title = note_data.note_title
-        if note_data.note_content is not None:
-            note.note_content = note_data.note_content
+        When note_data.version is set the update only applies to that version
+        of the note and a conflict raises 409 with the current version. An
+        If-Match header value works the same way with ETags and 412. Both
+        checks are part of the UPDATE, so edits never take a lock.
+        """
+        expected = self._parse_if_match(if_match)
+        if note_data.version is not None:
+            expected = [note_data.version] if expected is None else [
+                version for version in expected if version == note_data.version
+            ]
+        updated_note = None
+        if expected is None or expected:
+            updated_note = self.note_repository.update_for_user(
+                note_id,
+                current_user.user_id,
+                note_data.note_title,
+                note_data.note_content,
+                expected
+            )
         
-        self.note_repository.update(note_id, note.note_title, note.note_content)
+        if updated_note is None:
+            self._raise_write_failure(
+                note_id, current_user, "update", expected is not None, note_data.version
+            )
+        self._invalidate(current_user, [note_id])
+        self._index(updated_note)
+        self._publish(current_user, "updated", updated_note)
         
-        # Get the updated note
-        updated_note = self.note_repository.get_by_id(note_id)
         return self._convert_to_response(updated_note)
     
-    def delete_note(self, note_id: str, current_user: User) -> None:
-        """Delete a note, ensuring user ownership."""
-        note = self.note_repository.get_by_id(note_id)
+    def patch_note(self, note_id: str, patch: NotePatch, current_user: User) -> NoteResponse:
+        """
+        Apply an edit script to a note based on patch.version.
         
-        if not note:
-            raise HTTPException(status_code=404, detail="Note not found")
+        Positions are character offsets into the base version's content and
+        the edits are applied in MySQL, so only the changed text is sent. A
+        stale base version raises 409 with the current version; edits that
+        overlap, are out of order or reach past the end raise 422.
+        """
+        edits = self._normalize_edits(patch)
+        updated_note = self.note_repository.patch_for_user(
+            note_id, current_user.user_id, patch.version, patch.note_title, edits
+        )
+        if updated_note is None:
+            self._raise_write_failure(
+                note_id, current_user, "update", True, patch.version,
+                fallback=HTTPException(status_code=422, detail="Edits reach past the end of the note")
+            )
+        self._invalidate(current_user, [note_id])
+        self._index(updated_note)
+        self._publish(current_user, "updated", updated_note)
         
-        if not self._verify_note_ownership(note, current_user):
+        return self._convert_to_response(updated_note)
+    
+    def delete_note(self, note_id: str, current_user: User, if_match: Optional[str] = None) -> None:
+        """Delete a note, ensuring user ownership and, with If-Match, an unchanged ETag."""
+        expected = self._parse_if_match(if_match)
+        deleted = False
+        if expected is None or expected:
+            deleted = self.note_repository.delete_for_user(note_id, current_user.user_id, expected)
+        if not deleted:
+            self._raise_write_failure(note_id, current_user, "delete", expected is not None)
+        self._invalidate(current_user, [note_id])
+        self._unindex(current_user, [note_id])
+        self._publish_deleted(current_user, note_id)
+    
+    def note_etag(self, version: int) -> str:
+        """Strong ETag of a note version."""
+        return f'"v{version}"'
+    
+    def current_note_etag(self, note_id: str, current_user: User) -> Optional[str]:
+        """Current ETag of a note from a primary-key metadata lookup; None if not the user's."""
+        meta = self.note_repository.get_note_meta(note_id)
+        if meta is None or meta[0] != current_user.user_id:
+            return None
+        return self.note_etag(meta[1])
+    
+    def current_list_etag(
+        self,
+        current_user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        query: Optional[NoteListQuery] = None
+    ) -> str:
+        """Current ETag of a list response from the user's latest update and deletion times."""
+        meta = self.note_repository.get_list_meta(current_user.user_id)
+        return self._list_etag(meta, self._list_key(current_user, limit, cursor, summary, query))
+    
+    @staticmethod
+    def etag_matches(header: str, etag: str) -> bool:
+        """Weak comparison of an If-None-Match header value against an ETag."""
+        candidates = [candidate.strip() for candidate in header.split(",")]
+        return "*" in candidates or etag in (
+            candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates
+        )
+    
+    def get_note_json(self, note_id: str, current_user: User) -> Tuple[str, bytes]:
+        """Get a note's ETag and serialized JSON, served from the cache when possible."""
+        cached = self.peek_note_json(note_id, current_user)
+        if cached is not None:
+            return cached
+        return self.load_note_json(note_id, current_user)
+    
+    def peek_note_json(
+        self,
+        note_id: str,
+        current_user: User,
+        etag: Optional[str] = None
+    ) -> Optional[Tuple[str, bytes]]:
+        """
+        Return a note's cached (ETag, JSON) without touching the database.
+        
+        When the current ETag is known, a cached entry for another version is dropped.
+        """
+        return self._cache_get(self._note_key(current_user, note_id), etag)
+    
+    def load_note_json(self, note_id: str, current_user: User) -> Tuple[str, bytes]:
+        """Load a note from the database, serialize it and cache the bytes with its ETag."""
+        group = ('notes', current_user.user_id)
+        generation = self._cache_generation(group)
+        note = self.get_note_by_id(note_id, current_user)
+        entry = (self.note_etag(note.version), NoteResponse.__pydantic_serializer__.to_json(note))
+        self._cache_set(self._note_key(current_user, note_id), entry, group, generation)
+        return entry
+    
+    def get_notes_json(
+        self,
+        current_user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        query: Optional[NoteListQuery] = None
+    ) -> Tuple[str, bytes]:
+        """
+        Get the ETag and serialized JSON of the user's notes, served from the cache when possible.
+        
+        Without limit and cursor this is the plain list, otherwise one NotePage.
+        """
+        cached = self.peek_notes_json(current_user, limit, cursor, summary, query)
+        if cached is not None:
+            return cached
+        return self.load_notes_json(current_user, limit, cursor, summary, query)
+    
+    def peek_notes_json(
+        self,
+        current_user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        query: Optional[NoteListQuery] = None,
+        etag: Optional[str] = None
+    ) -> Optional[Tuple[str, bytes]]:
+        """Return a cached list response without touching the database."""
+        return self._cache_get(self._list_key(current_user, limit, cursor, summary, query), etag)
+    
+    def load_notes_json(
+        self,
+        current_user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        summary: bool = False,
+        query: Optional[NoteListQuery] = None
+    ) -> Tuple[str, bytes]:
+        """Load a list response from the database, serialize it and cache the bytes with its ETag."""
+        group = ('lists', current_user.user_id)
+        generation = self._cache_generation(group)
+        key = self._list_key(current_user, limit, cursor, summary, query)
+        # Read the version before the rows: a concurrent write can only make the ETag too old
+        etag = self._list_etag(self.note_repository.get_list_meta(current_user.user_id), key)
+        if limit is None and cursor is None:
+            if summary:
+                body = _SUMMARY_LIST.dump_json(self.get_user_note_summaries(current_user, query))
+            else:
+                body = _NOTE_LIST.dump_json(self.get_user_notes(current_user, query))
+        else:
+            page = self.get_user_notes_page(
+                current_user, limit or settings.NOTES_PAGE_DEFAULT_LIMIT, cursor, summary, query
+            )
+            body = page.model_dump_json().encode('utf-8')
+        self._cache_set(key, (etag, body), group, generation)
+        return etag, body
+    
+    def invalidate_user_cache(self, user_id: str) -> None:
+        """Drop every cached note and list response of a user."""
+        if self.cache is not None:
+            self.cache.invalidate_group(('notes', user_id))
+            self.cache.invalidate_group(('lists', user_id))
+    
+    def _note_key(self, user: User, note_id: str) -> tuple:
+        return ('note', user.user_id, note_id)
+    
+    def _list_key(
+        self,
+        user: User,
+        limit: Optional[int],
+        cursor: Optional[str],
+        summary: bool,
+        query: Optional[NoteListQuery]
+    ) -> tuple:
+        query = self._normalize_query(query)
+        return ('list', user.user_id, limit, cursor, summary, query.model_dump_json())
+    
+    def _cacheable(self) -> bool:
+        # Reads inside a shared transaction may see uncommitted rows
+        return self.cache is not None and not self.note_repository.in_shared_transaction()
+    
+    def _cache_get(self, key: tuple, etag: Optional[str] = None) -> Optional[Tuple[str, bytes]]:
+        if not self._cacheable():
+            return None
+        entry = self.cache.get(key)
+        if entry is not None and etag is not None and entry[0] != etag:
+            # Changed by another worker since it was cached
+            self.cache.invalidate(key)
+            return None
+        return entry
+    
+    def _cache_generation(self, group: tuple) -> Optional[int]:
+        return self.cache.generation(group) if self._cacheable() else None
+    
+    def _cache_set(
+        self,
+        key: tuple,
+        entry: Tuple[str, bytes],
+        group: tuple,
+        generation: Optional[int]
+    ) -> None:
+        if generation is not None:
+            self.cache.set(key, entry, group, generation, size=len(entry[0]) + len(entry[1]))
+    
+    def _list_etag(self, meta: Tuple[Optional[datetime], Optional[datetime]], key: tuple) -> str:
+        """Strong ETag of a list response: the user's data version plus the request shape."""
+        state = json.dumps([[value.isoformat() if value else None for value in meta], list(key)])
+        return f'"{hashlib.sha256(state.encode("utf-8")).hexdigest()[:32]}"'
+    
+    def _parse_if_match(self, if_match: Optional[str]) -> Optional[List[int]]:
+        """
+        Turn an If-Match header into the note versions a conditional write accepts.
+        
+        Returns None for no header or "*" (no condition) and an empty list when
+        no given ETag can belong to a note, which can never match.
+        """
+        if if_match is None or if_match.strip() == "*":
+            return None
+        expected = []
+        for candidate in if_match.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                # Weak tags never satisfy If-Match (RFC 9110 13.1.1)
+                continue
+            tag = candidate.strip('"')
+            if tag.startswith("v") and tag[1:].isdigit():
+                expected.append(int(tag[1:]))
+        return expected
+    
+    def _invalidate(self, user: User, note_ids: Optional[List[str]] = None) -> None:
+        """Drop the cached responses a write to these notes makes stale."""
+        if self.cache is None:
+            return
+        for note_id in note_ids or []:
+            self.cache.invalidate(self._note_key(user, note_id), ('notes', user.user_id))
+        self.cache.invalidate_group(('lists', user.user_id))
+    
+    def _index(self, note: Note) -> None:
+        """Keep a self-maintained search index in step with a written note."""
+        if self.search_repository is not None:
+            self.search_repository.index_note(note)
+    
+    def _unindex(self, user: User, note_ids: List[str]) -> None:
+        """Drop deleted notes from a self-maintained search index."""
+        if self.search_repository is not None and note_ids:
+            self.search_repository.remove_notes(user.user_id, note_ids)
+    
+    def _publish(self, user: User, event_type: str, note: Note) -> None:
+        """Notify the user's push connections that a note was created or updated."""
+        if self.notifier is not None:
+            self.notifier.publish(
+                user.user_id, event_type, note.note_id, last_update=note.last_update.isoformat()
+            )
+    
+    def _publish_deleted(self, user: User, note_id: str) -> None:
+        """Notify the user's push connections that a note was deleted."""
+        if self.notifier is not None:
+            self.notifier.publish(user.user_id, "deleted", note_id)
+    
+    def _unique_batch_ids(self, note_ids: List[str]) -> List[str]:
+        """De-duplicate batch IDs (keeping order) and enforce the batch size limit."""
+        note_ids = list(dict.fromkeys(note_ids))
+        if len(note_ids) > settings.BATCH_MAX_IDS:
             raise HTTPException(
-                status_code=403, 
-                detail="Not authorized to delete this note"
+                status_code=413,
+                detail=f"At most {settings.BATCH_MAX_IDS} note IDs can be given per request"
             )
+        return note_ids
+    
+    def _classify_missing(self, note_ids: List[str], matched) -> dict:
+        """Tell not_found from forbidden for IDs the ownership-scoped query did not match."""
+        missing = [note_id for note_id in note_ids if note_id not in matched]
+        existing = self.note_repository.find_existing_ids(missing)
+        return {
+            note_id: "forbidden" if note_id in existing else "not_found"
+            for note_id in missing
+        }
+    
+    def _normalize_edits(self, patch: NotePatch) -> List[Tuple[int, int, str]]:
+        """Turn a patch's edits into (position, delete_length, insert_text) triples."""
+        if len(patch.edits) > settings.PATCH_MAX_EDITS:
+            raise HTTPException(
+                status_code=422,
+                detail=f"At most {settings.PATCH_MAX_EDITS} edits can be applied per request"
+            )
+        edits = []
+        end = 0
+        for index, edit in enumerate(patch.edits):
+            if edit.pos < end:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Edit {index} overlaps or precedes the previous edit; sort edits by pos"
+                )
+            if edit.op == "insert":
+                edits.append((edit.pos, 0, edit.text))
+            else:
+                edits.append((edit.pos, edit.length, ""))
+            end = edit.pos + edits[-1][1]
+        return edits
+    
+    def _raise_write_failure(
+        self,
+        note_id: str,
+        user: User,
+        action: str,
+        conditional: bool,
+        base_version: Optional[int] = None,
+        fallback: Optional[HTTPException] = None
+    ) -> None:
+        """
+        Explain why a possibly version-conditioned write matched no row.
         
-        self.note_repository.delete(note_id)
+        A stale base_version from the request body is a 409 conflict carrying
+        the current version; a failed If-Match is a 412. When the versions
+        match, fallback is raised instead, for writes with further conditions.
+        """
+        if not conditional:
+            self._raise_not_found_or_forbidden(note_id, action)
+        meta = self.note_repository.get_note_meta(note_id)
+        if meta is None:
+            raise HTTPException(status_code=404, detail="Note not found")
+        if meta[0] != user.user_id:
+            raise HTTPException(status_code=403, detail=f"Not authorized to {action} this note")
+        if base_version is not None and base_version != meta[1]:
+            raise HTTPException(
+                status_code=409,
+                detail={
+                    "message": "Note was modified by another request",
+                    "current_version": meta[1],
+                },
+                headers={"ETag": self.note_etag(meta[1])}
+            )
+        if fallback is not None:
+            raise fallback
+        raise HTTPException(
+            status_code=412,
+            detail="Note has changed since it was read",
+            headers={"ETag": self.note_etag(meta[1])}
+        )
+    
+    def _raise_not_found_or_forbidden(self, note_id: str, action: str) -> None:
+        """
+        Explain why an ownership-scoped write matched no row.
+        
+        Only runs on the failure path, so successful writes stay a single
+        statement.
+        """
+        if not self.note_repository.exists(note_id):
+            raise HTTPException(status_code=404, detail="Note not found")
+        
+        raise HTTPException(
+            status_code=403, 
+            detail=f"Not authorized to {action} this note"
+        )
     
     def _verify_note_ownership(self, note: Note, user: User) -> bool:
         """Verify that a note belongs to the given user."""
         return note.user_id == user.user_id
     
+    def _format_validation_error(self, error: ValidationError) -> str:
+        """Summarize a pydantic validation error as 'field: message' pairs."""
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    
+    def _normalize_query(self, query: Optional[NoteListQuery]) -> NoteListQuery:
+        """Convert date filters to naive UTC, the form timestamps are stored in."""
+        query = query or NoteListQuery()
+        bounds = {
+            field: value.astimezone(timezone.utc).replace(tzinfo=None)
+            for field in ('created_from', 'created_to', 'updated_from', 'updated_to')
+            if (value := getattr(query, field)) is not None and value.tzinfo is not None
+        }
+        return query.model_copy(update=bounds) if bounds else query
+    
+    def _encode_cursor(self, note: Union[Note, NoteSummary], query: NoteListQuery) -> str:
+        """Encode the keyset position of the last note on a page as an opaque URL-safe cursor."""
+        if query.sort == "title":
+            value = note.note_title
+        else:
+            value = (note.created_on if query.sort == "created_at" else note.last_update).isoformat()
+        return self._encode_token([value, note.note_id, query.sort, query.direction])
+    
+    def _decode_cursor(self, cursor: str, query: NoteListQuery) -> Tuple[Any, str]:
+        """Decode a cursor produced by _encode_cursor for the same sort order."""
+        try:
+            position = self._decode_token(cursor)
+            if not isinstance(position, list) or len(position) not in (2, 4):
+                raise ValueError("cursor is not a list position")
+            value, note_id = position[0], position[1]
+            if not isinstance(value, str) or not isinstance(note_id, str):
+                raise ValueError("cursor value and note id must be strings")
+            # Cursors issued before sorting was configurable hold only (created_at, note_id)
+            sort, direction = position[2:4] if len(position) == 4 else ("created_at", "desc")
+            if sort not in _CURSOR_SORTS or direction not in _CURSOR_DIRECTIONS:
+                raise ValueError("cursor has an unknown sort order")
+            if (sort, direction) != (query.sort, query.direction):
+                raise ValueError("cursor was issued for another sort order")
+            if sort != "title":
+                value = datetime.fromisoformat(value)
+            return value, note_id
+        except (binascii.Error, ValueError, TypeError, IndexError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    def _decode_search_cursor(self, cursor: str) -> int:
+        """Decode the result offset from a search cursor."""
+        try:
+            offset = int(self._decode_token(cursor)['o'])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if offset < 0:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return offset
+    
+    def _decode_sync_token(self, since: str) -> dict:
+        """Decode a sync token produced by get_changes."""
+        try:
+            token = self._decode_token(since)
+            decoded = {
+                'n': (datetime.fromisoformat(token['n'][0]), str(token['n'][1])),
+                'd': (datetime.fromisoformat(token['d'][0]), str(token['d'][1])),
+                't': float(token['t']),
+            }
+            if not math.isfinite(decoded['t']):
+                raise ValueError("sync token time is not finite")
+            return decoded
+        except (binascii.Error, ValueError, TypeError, KeyError, IndexError):
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+    
+    def _encode_token(self, payload: Any) -> str:
+        """Encode a JSON payload as an opaque URL-safe token."""
+        raw = json.dumps(payload).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+    
+    def _decode_token(self, token: str) -> Any:
+        """Decode a token produced by _encode_token."""
+        padded = token + '=' * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded))
+    
     def _convert_to_response(self, note: Note) -> NoteResponse:
         """Convert a Note model to NoteResponse."""
         return NoteResponse(
@@ -102,5 +861,6 @@ class NoteService:
             note_content=note.note_content,
             user_id=note.user_id,
             created_on=note.created_on,
-            last_update=note.last_update
+            last_update=note.last_update,
+            version=note.version
         )
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Process-pool backed bcrypt hashing so password work never runs on the event loop."""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import bcrypt
+from fastapi import HTTPException
+
+
+def _hash_password(password: str) -> str:
+    salt = bcrypt.gensalt()
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a pool of worker processes.
+
+    At most max_pending operations may be queued or running at once; any
+    call beyond that fails fast with a 503 so a login storm sheds load
+    instead of building an unbounded backlog.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 64):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn keeps worker processes free of the parent's threads and sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _submit(self, func, *args):
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+            self._completed += 1
+
+    async def hash_password(self, password: str) -> str:
+        """Hash a password using bcrypt with a salt."""
+        return await self._submit(_hash_password, password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a bcrypt hash."""
+        return await self._submit(_verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """Return a snapshot of queue depth and throughput counters."""
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': self._pending,
+            'completed': self._completed,
+            'rejected': self._rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
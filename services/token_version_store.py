@@ -0,0 +1,54 @@
+"""Per-user token version lookups used to revoke stateless JWTs."""
+
+from typing import Optional, Tuple
+
+from repositories.user_repository import UserRepository
+from services.cache import TTLCache
+
+_MISSING = object()
+
+
+class TokenVersionStore:
+    """
+    Caches each user's current token version for a short TTL.
+
+    Stateless tokens carry the version they were issued with; a token is
+    only accepted while that version matches. Revocations made in this
+    process take effect immediately, revocations made by other workers
+    within ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        ttl_seconds: float = 30.0,
+        max_size: int = 100000
+    ):
+        self.user_repository = user_repository
+        self._versions = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def get_cached(self, user_id: str) -> Tuple[bool, Optional[int]]:
+        """Return (found, version) from the cache without touching the database."""
+        version = self._versions.get(user_id, _MISSING)
+        if version is _MISSING:
+            return False, None
+        return True, version
+
+    def set(self, user_id: str, version: Optional[int]) -> None:
+        """Remember a user's token version (None for a deleted user)."""
+        self._versions.set(user_id, version)
+
+    def get(self, user_id: str) -> Optional[int]:
+        """Return a user's token version, loading it from the database on a cache miss."""
+        found, version = self.get_cached(user_id)
+        if found:
+            return version
+        version = self.user_repository.get_token_version(user_id)
+        self.set(user_id, version)
+        return version
+
+    def revoke(self, user_id: str) -> Optional[int]:
+        """Invalidate every token issued to a user so far."""
+        version = self.user_repository.increment_token_version(user_id)
+        self.set(user_id, version)
+        return version
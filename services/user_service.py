@@ -1,22 +1,38 @@
 """User service handling business logic for user operations."""
 
 from datetime import datetime, timezone
+from typing import Optional
 from fastapi import HTTPException
 
 from models import User, UserCreate, UserResponse, generate_id
 from repositories.user_repository import UserRepository
 from services.auth_service import AuthService
+from services.cache import TTLCache
+from services.token_version_store import TokenVersionStore
 
 
 class UserService:
     """Service class handling user-related business logic."""
     
-    def __init__(self, user_repository: UserRepository, auth_service: AuthService):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        auth_service: AuthService,
+        token_versions: Optional[TokenVersionStore] = None,
+        user_cache: Optional[TTLCache] = None
+    ):
         self.user_repository = user_repository
         self.auth_service = auth_service
+        self.token_versions = token_versions or TokenVersionStore(user_repository)
+        self.user_cache = user_cache if user_cache is not None else TTLCache(max_size=0)
     
-    def create_user(self, user_data: UserCreate) -> UserResponse:
-        """Create a new user account."""
+    def create_user(self, user_data: UserCreate, password_hash: Optional[str] = None) -> UserResponse:
+        """
+        Create a new user account.
+        
+        Callers that already hashed the password off-thread pass it as
+        password_hash; otherwise it is hashed inline.
+        """
         # Check if user already exists
         if self.user_repository.exists_by_email(user_data.user_email):
             raise HTTPException(
@@ -30,12 +46,13 @@ class UserService:
             user_id=generate_id(),
             user_name=user_data.user_name,
             user_email=user_data.user_email,
-            password=self.auth_service.hash_password(user_data.password),
+            password=password_hash or self.auth_service.hash_password(user_data.password),
             created_on=now,
             last_update=now
         )
         
         self.user_repository.create(user)
+        self.invalidate_user(user.user_email)
         
         return UserResponse(
             user_id=user.user_id,
@@ -45,6 +62,45 @@ class UserService:
             last_update=user.last_update
         )
     
+    def get_user_by_email(self, email: str) -> Optional[User]:
+        """Look up a user by email address, serving repeat lookups from the user cache."""
+        return self.revalidate_user(email, self.user_cache.get(email))
+    
+    def revalidate_user(self, email: str, cached: Optional[User]) -> Optional[User]:
+        """
+        Return a cached user while their token version is current, else reload them.
+        
+        The version comes from the token version store, so a revocation or
+        deletion made by another worker is seen within its TTL without a
+        database round trip on every hit.
+        """
+        if cached is not None:
+            if self.token_versions.get(cached.user_id) == cached.token_version:
+                return cached
+            self.invalidate_user(email)
+        return self.load_user_by_email(email)
+    
+    def load_user_by_email(self, email: str) -> Optional[User]:
+        """Load a user from the database and refresh the user cache."""
+        user = self.user_repository.get_by_email(email)
+        if user is not None:
+            self.user_cache.set(email, user)
+            self.token_versions.set(user.user_id, user.token_version)
+        return user
+    
+    def invalidate_user(self, email: str) -> None:
+        """Drop a cached user after their account changed."""
+        self.user_cache.invalidate(email)
+    
+    def get_token_version(self, user_id: str) -> Optional[int]:
+        """Get the current token version of a user, or None if the user no longer exists."""
+        return self.token_versions.get(user_id)
+    
+    def revoke_tokens(self, user: User) -> None:
+        """Revoke every access token issued to the user so far."""
+        self.token_versions.revoke(user.user_id)
+        self.invalidate_user(user.user_email)
+    
     def get_user_info(self, user: User) -> UserResponse:
         """Get user information for response."""
         return UserResponse(